@@ -0,0 +1,273 @@
+"""Provides derived series of coin files kept up to date incrementally.
+
+    List of classes:
+        SeriesAnalytics
+    """
+import io
+import json
+import math
+import os
+from collections import deque
+
+import pandas as pd
+
+import application.filemodel_func as backend
+
+
+class SeriesAnalytics:
+    """Keeps returns, VWAP, volatility and rolling extremes of a coin file.
+
+    Each saved candle updates the derived series by streaming algorithms
+    costing O(1) per candle: running sums for VWAP, sums over a ring of
+    the last 'window' returns for volatility and monotonic queues for
+    rolling highs and lows. Their state is kept in a JSON file and the
+    derived series in a CSV file in the '.meta' folder of exchange, so an
+    update never reads the history of coin file again.
+
+    Derived columns are the simple return of close, VWAP of typical price
+    since the first candle, standard deviation of returns and highest
+    high & lowest low of the last 'window' candles. Candles missing high
+    or low prices (e.g. Kraken) use their close instead.
+
+    Attr:
+        file_path (str): path of coin file
+        window (int): number of candles of rolling series
+    """
+
+    columns = ('time', 'return', 'vwap', 'volatility', 'high', 'low')
+
+    def __init__(self, file_path, window=None):
+        """Constructor of SeriesAnalytics class.
+
+        A store of another window has no state, so it has to be rebuilt.
+
+        Args:
+            file_path (str): path of coin file
+            window (int): number of candles of rolling series
+                          (Default to None, window of existing store or 20)
+
+        Attr:
+            state (dict): state of streaming algorithms, None if store
+                          has to be rebuilt from coin file
+        """
+        self.file_path = file_path
+        self.state_path = backend.sidecar_path(file_path, '.analytics.json')
+        self.series_path = backend.sidecar_path(file_path, '.analytics.csv')
+        self.state = self.__read_state()
+        self.window = window or (self.state['window'] if self.state else 20)
+        if self.state and self.state['window'] != self.window:
+            self.state = None
+
+    def __read_state(self):
+        """Reads state of streaming algorithms.
+
+        Returns:
+            (dict): state or None if there is no store yet
+        """
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            # series file must include all committed rows
+            if os.path.getsize(self.series_path) < state['series_size']:
+                return None
+            return state
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __new_state(self):
+        """Provides state of a store without candles.
+
+        Returns:
+            (dict): empty state
+        """
+        return {'window': self.window, 'count': 0, 'last_time': None,
+                'close': None, 'pv': 0.0, 'volume': 0.0,
+                'returns': [], 'position': 0, 'valid': 0, 'sum': 0.0,
+                'squares': 0.0, 'highs': [], 'lows': [], 'latest': None,
+                'series_size': 0}
+
+    def update(self, data):
+        """Adds derived values of newly saved candles.
+
+        Candles not after the last candle of store are skipped.
+
+        Args:
+            data (obj): candle batch of saved candles in time order
+
+        Returns:
+            int: number of candles added
+        """
+        state = dict(self.state if self.state is not None
+                     else self.__new_state())
+        state['returns'] = list(state['returns'])
+        state['highs'] = deque(state['highs'])
+        state['lows'] = deque(state['lows'])
+        rows = []
+        for i in range(len(data)):
+            time = int(data.time[i])
+            if state['last_time'] is not None and time <= state['last_time']:
+                continue
+            rows.append(self.__step(state, time, data.high[i], data.low[i],
+                                    data.open[i], data.close[i],
+                                    data.volume[i]))
+        if rows or self.state is None:
+            self.__commit(state, rows)
+        return len(rows)
+
+    def __step(self, state, time, high, low, open, close, volume):
+        """Updates state by one candle.
+
+        Args:
+            state (dict): state of streaming algorithms
+            time (int): epoch seconds of candle
+            high, low, open, close, volume (float): values of candle
+
+        Returns:
+            list: derived values of candle
+        """
+        index = state['count']
+        previous = state['close']
+        ret = close / previous - 1 \
+            if previous and not math.isnan(previous) else math.nan
+        # VWAP of typical price
+        high = close if math.isnan(high) else high
+        low = close if math.isnan(low) else low
+        if not math.isnan(close) and not math.isnan(volume):
+            state['pv'] += (high + low + close) / 3 * volume
+            state['volume'] += volume
+        vwap = state['pv'] / state['volume'] if state['volume'] else math.nan
+        volatility = self.__add_return(state, ret)
+        rolling_high = self.__push(state['highs'], index, high, max)
+        rolling_low = self.__push(state['lows'], index, low, min)
+        state['count'] = index + 1
+        state['last_time'] = time
+        if not math.isnan(close):
+            state['close'] = close
+        return [time, ret, vwap, volatility, rolling_high, rolling_low]
+
+    def __add_return(self, state, ret):
+        """Adds a return to the ring of last returns.
+
+        Sums are recomputed from the ring each time it wraps, so rounding
+        errors of adding and removing do not build up.
+
+        Args:
+            state (dict): state of streaming algorithms
+            ret (float): return of candle, NaN if unknown
+
+        Returns:
+            float: standard deviation of returns in ring
+        """
+        ring = state['returns']
+        value = None if math.isnan(ret) else ret
+        if len(ring) < self.window:
+            ring.append(value)
+        else:
+            old = ring[state['position']]
+            if old is not None:
+                state['sum'] -= old
+                state['squares'] -= old * old
+                state['valid'] -= 1
+            ring[state['position']] = value
+            state['position'] = (state['position'] + 1) % self.window
+        if value is not None:
+            state['sum'] += value
+            state['squares'] += value * value
+            state['valid'] += 1
+        if state['position'] == 0 and len(ring) == self.window:
+            valid = [x for x in ring if x is not None]
+            state['sum'] = math.fsum(valid)
+            state['squares'] = math.fsum(x * x for x in valid)
+        count = state['valid']
+        if count < 2:
+            return math.nan
+        variance = (state['squares'] - state['sum'] ** 2 / count) / \
+            (count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def __push(self, queue, index, value, better):
+        """Adds a value to a monotonic queue of rolling extremes.
+
+        Args:
+            queue (obj): deque of [index, value] pairs, best value first
+            index (int): position of candle
+            value (float): value of candle
+            better (callable): max for highs, min for lows
+
+        Returns:
+            float: extreme of the last 'window' values
+        """
+        if not math.isnan(value):
+            while queue and better(queue[-1][1], value) == value:
+                queue.pop()
+            queue.append([index, value])
+        while queue and queue[0][0] <= index - self.window:
+            queue.popleft()
+        return queue[0][1] if queue else math.nan
+
+    def __commit(self, state, rows):
+        """Appends derived values and saves state after them.
+
+        Series file is cut to the size recorded in state first, so rows
+        of an update interrupted before its state was saved are dropped.
+
+        Args:
+            state (dict): updated state
+            rows (list): derived values of new candles
+        """
+        if rows:
+            state['latest'] = rows[-1]
+        state['highs'] = list(state['highs'])
+        state['lows'] = list(state['lows'])
+        with open(self.series_path, 'a') as f:
+            f.truncate(state['series_size'])
+            if rows:
+                pd.DataFrame(rows).to_csv(f, header=False, index=False,
+                                          sep=';', na_rep='-')
+            f.flush()
+            os.fsync(f.fileno())
+            state['series_size'] = f.tell()
+        with open(self.state_path + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(self.state_path + '.tmp', self.state_path)
+        self.state = state
+
+    def rebuild(self):
+        """Computes derived series again from all candles of coin file.
+
+        Returns:
+            int: number of candles
+        """
+        self.state = None
+        with open(self.series_path, 'w'):
+            pass
+        return self.update(backend.read_candles(self.file_path))
+
+    def latest(self):
+        """Provides derived values of the last candle from state.
+
+        Returns:
+            (dict): derived values by column, None if store has no candles
+        """
+        if not self.state or self.state['latest'] is None:
+            return None
+        return dict(zip(self.columns, self.state['latest']))
+
+    def frame(self):
+        """Reads derived series of committed candles.
+
+        Returns:
+            (obj): pandas data frame indexed by candle time
+        """
+        size = self.state['series_size'] if self.state else 0
+        data = b''
+        if size:
+            with open(self.series_path, 'rb') as f:
+                data = f.read(size)
+        if not data:
+            return pd.DataFrame(columns=self.columns[1:],
+                                index=pd.DatetimeIndex([], name='time'))
+        df = pd.read_csv(io.BytesIO(data), sep=';', header=None,
+                         names=self.columns, na_values='-')
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        return df.set_index('time')
@@ -0,0 +1,99 @@
+"""Provides a request budget shared by processes of a machine.
+
+    List of classes:
+        SharedTokenBucket
+    """
+import sqlite3
+import time
+
+from application.classes.cancel_cls import CancelToken
+
+
+class SharedTokenBucket:
+    """Token bucket of an exchange kept in a SQLite database.
+
+    Every process sending requests to the exchange takes a token from the
+    same bucket before each request, so the GUI and command line workers
+    running on one machine stay within one request rate together.
+    Tokens are refilled by elapsed wall clock time at each take.
+
+    Attr:
+        db_path (str): path of SQLite database file
+        name (str): name of bucket, e.g. exchange name
+        rate (float): tokens added per second
+        capacity (float): maximum tokens, i.e. allowed burst
+    """
+
+    schema = '''CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL)'''
+
+    def __init__(self, db_path, name, rate, capacity=1, clock=time.time):
+        """Constructor of SharedTokenBucket class.
+
+        Args:
+            db_path (str): path of SQLite database file
+            name (str): name of bucket
+            rate (float): tokens added per second
+            capacity (float): maximum tokens (Default to 1)
+            clock (callable): wall clock shared by processes
+                              (Default to time.time)
+        """
+        self.db_path = db_path
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.__clock = clock
+        db = sqlite3.connect(db_path, timeout=60)
+        try:
+            db.execute(self.schema)
+            db.commit()
+        finally:
+            db.close()
+
+    def try_take(self):
+        """Takes a token if the bucket has one.
+
+        Returns:
+            float: 0 if a token is taken, else seconds until one is
+                   available
+        """
+        db = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            now = self.__clock()
+            row = db.execute('SELECT tokens, updated FROM buckets '
+                             'WHERE name = ?', (self.name,)).fetchone()
+            tokens = self.capacity if row is None else min(
+                self.capacity, row[0] + max(0, now - row[1]) * self.rate)
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            db.execute('INSERT OR REPLACE INTO buckets (name, tokens, '
+                       'updated) VALUES (?, ?, ?)', (self.name, tokens, now))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        finally:
+            db.close()
+        return wait
+
+    def take(self, token=None):
+        """Waits until a token is taken from the bucket.
+
+        Args:
+            token (obj): cancel token of download (Default to None)
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+        """
+        token = token if token is not None else CancelToken()
+        while True:
+            wait = self.try_take()
+            if not wait:
+                return
+            token.sleep(wait)
@@ -0,0 +1,152 @@
+"""Provides an in-memory cache of data read from coin files.
+
+    List of classes:
+        SeriesCache
+    """
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+
+class SeriesCache:
+    """Keeps decoded coin file data in memory within a byte budget.
+
+    Entries are keyed by file path and kind of data (e.g. 'candles' or
+    'last_update'). An entry is valid as long as modification time and
+    size of its file are unchanged. Writers also invalidate the entries of
+    a file when they append candles. Least recently used entries are
+    evicted when the budget is exceeded.
+
+    Cached values are shared by all readers and must not be modified.
+
+    Attr:
+        max_bytes (int): memory budget of cache in bytes
+        hits (int): number of reads served from memory
+        misses (int): number of reads decoding the file
+        evictions (int): number of entries evicted by budget
+    """
+
+    def __init__(self, max_bytes=64 * 2**20):
+        """Constructor of SeriesCache class.
+
+        Args:
+            max_bytes (int): memory budget in bytes (Default to 64 MB)
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__nbytes = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __stamp(file_path):
+        """Provides modification time and size of a file.
+
+        Args:
+            file_path (str): path of file
+
+        Returns:
+            tuple: modification time in ns and size in bytes
+        """
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path, kind, loader, size=sys.getsizeof):
+        """Provides data of a file from memory or by loading it.
+
+        Args:
+            file_path (str): path of file
+            kind (str): kind of data read from file
+            loader (callable): function reading data from file path
+            size (callable): function giving memory size of data in bytes
+                             (Default to sys.getsizeof)
+
+        Returns:
+            (obj): data given by loader
+        """
+        key = (os.path.abspath(file_path), kind)
+        stamp = self.__stamp(file_path)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader(file_path)
+        self.__store(key, stamp, value, size(value))
+        return value
+
+    def __store(self, key, stamp, value, nbytes):
+        """Adds an entry and evicts old entries exceeding the budget.
+
+        Args:
+            key (tuple): file path and kind of data
+            stamp (tuple): modification time and size of file
+            value (obj): data of entry
+            nbytes (int): memory size of data
+        """
+        with self.__lock:
+            self.__remove(key)
+            if nbytes > self.max_bytes:
+                return
+            self.__entries[key] = (stamp, value, nbytes)
+            self.__nbytes += nbytes
+            self.__evict()
+
+    def __remove(self, key):
+        """Removes an entry if it exists.
+
+        Args:
+            key (tuple): file path and kind of data
+        """
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__nbytes -= entry[2]
+
+    def __evict(self):
+        """Evicts least recently used entries until budget is met.
+        """
+        while self.__nbytes > self.max_bytes:
+            _, entry = self.__entries.popitem(last=False)
+            self.__nbytes -= entry[2]
+            self.evictions += 1
+
+    def invalidate(self, file_path):
+        """Removes all entries of a file.
+
+        Args:
+            file_path (str): path of file
+        """
+        file_path = os.path.abspath(file_path)
+        with self.__lock:
+            for key in [key for key in self.__entries
+                        if key[0] == file_path]:
+                self.__remove(key)
+
+    def resize(self, max_bytes):
+        """Changes memory budget of cache.
+
+        Args:
+            max_bytes (int): new memory budget in bytes
+        """
+        with self.__lock:
+            self.max_bytes = max_bytes
+            self.__evict()
+
+    def stats(self):
+        """Provides counters and memory usage of cache.
+
+        Returns:
+            dict: hits, misses, evictions, entries, bytes and max_bytes
+        """
+        with self.__lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self.__entries),
+                    'bytes': self.__nbytes,
+                    'max_bytes': self.max_bytes}
@@ -0,0 +1,102 @@
+"""Provides cooperative cancellation of downloads.
+
+    List of classes:
+        DownloadCancelled
+        CancelToken
+    """
+import threading
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is stopped by its cancel token.
+    """
+
+
+class CancelToken:
+    """Carries cancel request of a download down to every waiting call.
+
+    Long waits use wait() instead of sleep so they return as soon as
+    the download is cancelled. Open resources such as HTTP responses
+    can register a callback to be closed at cancellation.
+    """
+
+    def __init__(self):
+        """Constructor of CancelToken class.
+
+        Attr:
+            __event (obj): event set at cancellation
+            __callbacks (dict): callbacks to run at cancellation
+        """
+        self.__event = threading.Event()
+        self.__callbacks = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        """State of token.
+
+        Returns:
+            bool: True if cancellation is requested
+        """
+        return self.__event.is_set()
+
+    def cancel(self):
+        """Requests cancellation and runs registered callbacks.
+        """
+        with self.__lock:
+            self.__event.set()
+            callbacks = list(self.__callbacks.values())
+            self.__callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+    def wait(self, seconds):
+        """Waits given seconds unless token is cancelled earlier.
+
+        Args:
+            seconds (float): seconds to wait
+
+        Returns:
+            bool: True if token is cancelled
+        """
+        return self.__event.wait(max(0, seconds))
+
+    def raise_if_cancelled(self):
+        """Stops the caller if cancellation is requested.
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+        """
+        if self.__event.is_set():
+            raise DownloadCancelled('Download is cancelled!')
+
+    def sleep(self, seconds):
+        """Waits given seconds and stops the caller if cancelled.
+
+        Args:
+            seconds (float): seconds to wait
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+        """
+        if self.wait(seconds):
+            self.raise_if_cancelled()
+
+    def on_cancel(self, callback):
+        """Registers a callback to run at cancellation.
+
+        Callback runs at once if token is already cancelled.
+
+        Args:
+            callback (callable): function without arguments
+
+        Returns:
+            (callable): function unregistering the callback
+        """
+        with self.__lock:
+            if not self.__event.is_set():
+                key = object()
+                self.__callbacks[key] = callback
+                return lambda: self.__callbacks.pop(key, None)
+        callback()
+        return lambda: None
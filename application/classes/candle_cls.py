@@ -0,0 +1,230 @@
+"""Provides a compact columnar container for candles.
+
+    List of classes:
+        CandleBatch
+    """
+import numpy as np
+import pandas as pd
+
+# Length of one candle in seconds for each supported frequency.
+# A month is taken as 4 weeks like the download time blocks do.
+FREQUENCY_SECONDS = {'minutes': 60,
+                     'hours': 3600,
+                     'days': 86400,
+                     'weeks': 604800,
+                     'months': 2419200}
+
+
+def epoch_seconds(values):
+    """Converts epoch timestamps of any precision to epoch seconds.
+
+    Exchanges give timestamps in seconds, milliseconds or nanoseconds.
+    Precision is detected from the magnitude of the values.
+
+    Args:
+        values (list): epoch timestamps as numbers or numeric strings
+
+    Returns:
+        (obj): numpy int64 array of epoch seconds
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.size and np.nanmax(values) > 1e17:
+        values = values / 1e9
+    elif values.size and np.nanmax(values) > 1e14:
+        values = values / 1e6
+    elif values.size and np.nanmax(values) > 1e11:
+        values = values / 1e3
+    return np.floor(values).astype(np.int64)
+
+
+def iso_seconds(values):
+    """Converts ISO 8601 date strings to epoch seconds.
+
+    Args:
+        values (list): ISO 8601 date strings
+
+    Returns:
+        (obj): numpy int64 array of epoch seconds
+    """
+    times = pd.to_datetime(pd.Series(values, dtype=object), utc=True)
+    return times.values.astype('datetime64[s]').astype(np.int64)
+
+
+class CandleBatch:
+    """A batch of candles stored column by column.
+
+    Times are int64 epoch seconds (UTC) and prices & volumes are float64
+    columns. Missing values (e.g. prices Kraken does not provide) are NaN.
+    The columns follow the order of Exchange.db_columns.
+
+    Attr:
+        time (obj): int64 array of candle times
+        high (obj): float64 array of high prices
+        low (obj): float64 array of low prices
+        open (obj): float64 array of open prices
+        close (obj): float64 array of close prices
+        volume (obj): float64 array of volumes
+    """
+
+    columns = ('time', 'high', 'low', 'open', 'close', 'volume')
+    time_format = '%Y-%m-%d %H:%M:%S'
+
+    def __init__(self, time, high, low, open, close, volume):
+        """Constructor of CandleBatch class.
+
+        Args:
+            time (list): epoch seconds of candles
+            high (list): high prices
+            low (list): low prices
+            open (list): open prices
+            close (list): close prices
+            volume (list): volumes
+        """
+        self.time = np.asarray(time, dtype=np.int64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+
+    def __len__(self):
+        """Provides number of candles in batch.
+
+        Returns:
+            int: number of candles
+        """
+        return len(self.time)
+
+    def __str__(self):
+        """Provides readable representation of batch obj.
+
+        Returns:
+            str: readable representation of batch
+        """
+        return f'CandleBatch of {len(self)} candles'
+
+    @property
+    def nbytes(self):
+        """Memory used by the columns of batch.
+
+        Returns:
+            int: size of all columns in bytes
+        """
+        return sum(getattr(self, col).nbytes for col in self.columns)
+
+    @classmethod
+    def empty(cls):
+        """Creates a batch without candles.
+
+        Returns:
+            (obj): empty batch
+        """
+        return cls(*[[] for _ in cls.columns])
+
+    @classmethod
+    def from_rows(cls, rows, order=(0, 1, 2, 3, 4, 5)):
+        """Creates a batch from a list of candle rows.
+
+        Args:
+            rows (list): rows including epoch time and numeric values
+            order (tuple): row positions of time, high, low, open,
+                           close and volume (Default to (0, 1, 2, 3, 4, 5))
+
+        Returns:
+            (obj): candle batch
+        """
+        if not len(rows):
+            return cls.empty()
+        table = np.asarray(rows, dtype=np.float64)
+        return cls(epoch_seconds(table[:, order[0]]),
+                   *[table[:, i] for i in order[1:]])
+
+    @classmethod
+    def concat(cls, batches):
+        """Joins several batches into one.
+
+        Args:
+            batches (list): candle batches in time order
+
+        Returns:
+            (obj): joined candle batch
+        """
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        return cls(*[np.concatenate([getattr(batch, col)
+                                     for batch in batches])
+                     for col in cls.columns])
+
+    def take(self, index):
+        """Selects candles by position or boolean mask.
+
+        Args:
+            index (obj): numpy index array, mask or slice
+
+        Returns:
+            (obj): candle batch including selected candles
+        """
+        return CandleBatch(*[getattr(self, col)[index]
+                             for col in self.columns])
+
+    def reversed(self):
+        """Provides candles in reversed order.
+
+        Returns:
+            (obj): candle batch in reversed order
+        """
+        return self.take(slice(None, None, -1))
+
+    def to_bytes(self):
+        """Serializes batch to bytes.
+
+        Returns:
+            bytes: columns of batch as float64 values
+        """
+        table = np.column_stack([getattr(self, col).astype(np.float64)
+                                 for col in self.columns])
+        return table.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Creates a batch from bytes given by to_bytes.
+
+        Args:
+            data (bytes): serialized batch
+
+        Returns:
+            (obj): candle batch
+        """
+        table = np.frombuffer(data, dtype=np.float64).reshape(-1, 6)
+        return cls(table[:, 0].astype(np.int64),
+                   *[table[:, i].copy() for i in range(1, 6)])
+
+    @classmethod
+    def from_frame(cls, df):
+        """Creates a batch from a data frame read by read_coin_data.
+
+        Args:
+            df (obj): pandas data frame indexed by candle time
+
+        Returns:
+            (obj): candle batch
+        """
+        time = df.index.values.astype('datetime64[s]').astype(np.int64)
+        return cls(time, *[df.iloc[:, i].values for i in range(5)])
+
+    def to_frame(self, headers=None):
+        """Provides batch as a data frame for CSV output.
+
+        Args:
+            headers (list): column names (Default to batch columns)
+
+        Returns:
+            (obj): pandas data frame with datetime64 time column
+        """
+        if headers is None:
+            headers = self.columns
+        data = {headers[0]: self.time.astype('datetime64[s]')}
+        for header, col in zip(headers[1:], self.columns[1:]):
+            data[header] = getattr(self, col)
+        return pd.DataFrame(data, columns=list(headers))
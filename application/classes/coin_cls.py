@@ -2,6 +2,7 @@
 
     list of classes:
         Coin
+        CoinCollection
     """
 import arrow
 
@@ -27,6 +28,8 @@ class Coin:
             f"{data['EndDate']} {data['EndHour']}",
             'DD-MM-YYYY HH:mm:ss')
         self.frequency = data['Frequency'].replace('\n', '')
+        self.__row = None
+        self.__row_key = None
         self.last_update = data['LastUpdate']
         self.file_name = '{}_{}_{}_{}_{}_{}.csv'.format(
             self.name,
@@ -43,3 +46,75 @@ class Coin:
             str: readable representation of coin
         """
         return f'{self.name} object'
+
+    @property
+    def table_row(self):
+        """Preformatted row of coin for the coins table.
+
+        Row is cached and formatted again only if dates of coin change.
+
+        Returns:
+            list: name, trade pair, last update, start date and frequency
+        """
+        key = (self.last_update, self.start_date)
+        if self.__row is None or self.__row_key != key:
+            last_update = self.last_update.format('DD-MM-YYYY HH:mm:ss') \
+                if self.last_update is not None else '-'
+            self.__row = [self.name,
+                          f'{self.quote}/{self.base}',
+                          last_update,
+                          self.start_date.format('DD-MM-YYYY HH:mm:ss'),
+                          self.frequency]
+            self.__row_key = key
+        return self.__row
+
+
+class CoinCollection:
+    """Keeps coins of an exchange indexed by file name.
+
+    Coins are kept in insertion order. Since a coin file name is unique
+    in an exchange folder, it is used as the identity of a coin, so
+    coins are checked and removed without scanning the collection.
+
+    Attr:
+        version (int): increased at every change of collection
+    """
+
+    def __init__(self, coins=()):
+        """Constructor of CoinCollection class.
+
+        Args:
+            coins (list): initial coins (Default to ())
+        """
+        self.__coins = {}
+        self.version = 0
+        for coin in coins:
+            self.add(coin)
+
+    def __len__(self):
+        return len(self.__coins)
+
+    def __iter__(self):
+        return iter(list(self.__coins.values()))
+
+    def __contains__(self, coin):
+        return coin.file_name in self.__coins
+
+    def add(self, coin):
+        """Adds a coin, replacing a coin with the same file name.
+
+        Args:
+            coin (obj): coin to add
+        """
+        self.remove(coin)
+        self.__coins[coin.file_name] = coin
+        self.version += 1
+
+    def remove(self, coin):
+        """Removes a coin if it exists in collection.
+
+        Args:
+            coin (obj): coin to remove
+        """
+        if self.__coins.pop(coin.file_name, None) is not None:
+            self.version += 1
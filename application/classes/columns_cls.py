@@ -0,0 +1,251 @@
+"""Provides a columnar copy of coin files for local readers.
+
+    List of classes:
+        ColumnStore
+    """
+import json
+import os
+
+import numpy as np
+
+import application.filemodel_func as backend
+from application.classes.candle_cls import CandleBatch
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+class ColumnStore:
+    """Keeps candles of a coin file as binary column files.
+
+    Each column of CandleBatch is stored in its own file of raw int64 or
+    float64 values in the '.meta' folder of exchange. If pyarrow is
+    installed, candles are also stored as an Arrow IPC stream. Both are
+    appended as candles are saved, so readers on the same host can map
+    the files into memory instead of parsing the CSV file.
+
+    A JSON manifest keeps the number of committed rows and the state of
+    coin file they belong to. Readers must only use committed rows since
+    a write may be in progress. If coin file was changed by other means
+    (e.g. compaction), the store is rebuilt from the coin file.
+
+    Like reading the coin file, the store keeps candles in time order and
+    the latest written candle of a time. The last row is kept in its own
+    Arrow record batch, so the candle downloaded again by every update
+    replaces it.
+    """
+
+    version = 2
+
+    def __init__(self, file_path):
+        """Constructor of ColumnStore class.
+
+        Args:
+            file_path (str): path of coin file
+        """
+        self.file_path = file_path
+        self.manifest_path = backend.sidecar_path(file_path, '.cols.json')
+        self.arrow_path = backend.sidecar_path(file_path, '.arrows')
+        self.column_paths = {col: backend.sidecar_path(file_path,
+                                                       f'.{col}.bin')
+                             for col in CandleBatch.columns}
+
+    @staticmethod
+    def dtype(column):
+        """Provides numpy type of a column.
+
+        Args:
+            column (str): column name of CandleBatch
+
+        Returns:
+            (obj): numpy int64 for times, float64 otherwise
+        """
+        return np.int64 if column == 'time' else np.float64
+
+    @staticmethod
+    def schema():
+        """Provides Arrow schema of stored candles.
+
+        Raises:
+            ImportError: occurs if pyarrow is not installed
+
+        Returns:
+            (obj): pyarrow schema
+        """
+        if pa is None:
+            raise ImportError('pyarrow is required for Arrow export!')
+        return pa.schema([('time', pa.timestamp('s', tz='UTC'))] +
+                         [(col, pa.float64())
+                          for col in CandleBatch.columns[1:]])
+
+    @property
+    def manifest(self):
+        """Provides the manifest of store.
+
+        Returns:
+            (dict): manifest or None if store does not exist
+        """
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('version') == self.version else None
+
+    def __write_manifest(self, manifest):
+        """Writes manifest atomically.
+
+        Args:
+            manifest (dict): manifest of store
+        """
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, self.manifest_path)
+
+    def __append(self, data, manifest, replace_last=False):
+        """Appends candles after the committed rows of store.
+
+        Args:
+            data (obj): candle batch to append in time order
+            manifest (dict): manifest of committed rows
+            replace_last (bool): whether first candle replaces the last
+                                 committed row (Default to False)
+        """
+        rows = manifest['rows'] - (1 if replace_last else 0)
+        for col, path in self.column_paths.items():
+            with open(path, 'ab') as f:
+                # drops rows of an interrupted write
+                f.truncate(rows * np.dtype(self.dtype(col)).itemsize)
+                f.write(getattr(data, col).astype(self.dtype(col)).tobytes())
+        if pa is not None:
+            with open(self.arrow_path, 'ab') as f:
+                if manifest['arrow_size'] is None:
+                    f.truncate(0)
+                    f.write(self.schema().serialize().to_pybytes())
+                elif replace_last:
+                    f.truncate(manifest['arrow_last'])
+                else:
+                    f.truncate(manifest['arrow_size'])
+                if len(data) > 1:
+                    f.write(self.__record_batch(data.take(slice(0, -1)))
+                            .serialize().to_pybytes())
+                if len(data):
+                    manifest['arrow_last'] = f.tell()
+                    f.write(self.__record_batch(data.take(slice(-1, None)))
+                            .serialize().to_pybytes())
+                manifest['arrow_size'] = f.tell()
+        manifest['rows'] = rows + len(data)
+
+    def __last_time(self, manifest):
+        """Reads time of the last committed row.
+
+        Args:
+            manifest (dict): manifest of committed rows
+
+        Returns:
+            int: epoch seconds or None if store has no rows
+        """
+        if not manifest['rows']:
+            return None
+        with open(self.column_paths['time'], 'rb') as f:
+            f.seek((manifest['rows'] - 1) * np.dtype(np.int64).itemsize)
+            return int(np.frombuffer(f.read(8), np.int64)[0])
+
+    def __record_batch(self, data):
+        """Converts candles to an Arrow record batch.
+
+        Args:
+            data (obj): candle batch
+
+        Returns:
+            (obj): pyarrow record batch
+        """
+        schema = self.schema()
+        arrays = [pa.array(data.time.astype('datetime64[s]'),
+                           type=schema.field('time').type)]
+        arrays += [pa.array(getattr(data, col))
+                   for col in CandleBatch.columns[1:]]
+        return pa.record_batch(arrays, schema=schema)
+
+    def rebuild(self):
+        """Writes the store again from candles of coin file.
+        """
+        stat = os.stat(self.file_path)
+        manifest = {'version': self.version, 'rows': 0, 'arrow_size': None,
+                    'arrow_last': None, 'inode': stat.st_ino,
+                    'size': stat.st_size}
+        self.__append(backend.read_candles(self.file_path), manifest)
+        self.__write_manifest(manifest)
+
+    def append(self, data, size_before):
+        """Adds candles just appended to coin file.
+
+        Store is rebuilt if it does not match the coin file state before
+        the candles were appended. Candles before the last committed row
+        are skipped and a candle of its time replaces it, as reading the
+        coin file keeps the latest written candle of a time.
+
+        Args:
+            data (obj): candle batch appended to coin file
+            size_before (int): size of coin file before appending
+        """
+        stat = os.stat(self.file_path)
+        manifest = self.manifest
+        if manifest is None or manifest['inode'] != stat.st_ino or \
+                manifest['size'] != size_before:
+            return self.rebuild()
+        if pa is not None and manifest['arrow_size'] is None:
+            return self.rebuild()
+        last = self.__last_time(manifest)
+        if last is not None:
+            data = data.take(data.time >= last)
+        # latest written candle of a time is kept
+        order = np.argsort(data.time, kind='stable')
+        time = data.time[order]
+        data = data.take(order[np.r_[time[1:] != time[:-1], True]])
+        replace_last = last is not None and len(data) and \
+            int(data.time[0]) == last
+        self.__append(data, manifest, replace_last)
+        manifest['size'] = stat.st_size
+        self.__write_manifest(manifest)
+
+    def columns(self):
+        """Maps committed rows of column files into memory.
+
+        Returns:
+            dict: read-only numpy arrays of each column
+        """
+        rows = self.manifest['rows']
+        if not rows:
+            return {col: np.empty(0, self.dtype(col))
+                    for col in CandleBatch.columns}
+        return {col: np.memmap(path, self.dtype(col), mode='r',
+                               shape=(rows,))
+                for col, path in self.column_paths.items()}
+
+    def candles(self):
+        """Provides committed rows as a candle batch without copying.
+
+        Returns:
+            (obj): candle batch backed by mapped column files
+        """
+        columns = self.columns()
+        return CandleBatch(*[columns[col] for col in CandleBatch.columns])
+
+    def arrow_table(self):
+        """Maps committed rows of Arrow stream into memory.
+
+        Raises:
+            ImportError: occurs if pyarrow is not installed
+
+        Returns:
+            (obj): pyarrow table backed by mapped stream file
+        """
+        size = self.manifest['arrow_size']
+        if pa is None or size is None:
+            raise ImportError('pyarrow is required for Arrow export!')
+        source = pa.memory_map(self.arrow_path)
+        return pa.ipc.open_stream(source.read_buffer(size)).read_all()
@@ -4,6 +4,7 @@
         Config
     """
 import os
+import tempfile
 from sys import platform
 import configparser
 
@@ -60,6 +61,98 @@ class Config:
         """
         return cls.__config['SYSTEM']['StartHour']
 
+    @property
+    def parse_workers(cls):
+        """Provides number of processes parsing downloaded data.
+
+        Returns:
+            [int]: number of parser processes, 0 to parse in threads
+        """
+        return int(cls.__config['SYSTEM'].get('ParseWorkers', '0'))
+
+    @property
+    def cache_bytes(cls):
+        """Provides memory budget of the coin data cache.
+
+        Returns:
+            [int]: cache budget in bytes
+        """
+        return int(cls.__config['SYSTEM'].get('CacheMegabytes', '64')) * 2**20
+
+    @property
+    def column_export(cls):
+        """Provides if saved candles are also kept in column files.
+
+        Returns:
+            [bool]: True if column export is enabled
+        """
+        return cls.__config['SYSTEM'].getboolean('ColumnExport',
+                                                 fallback=False)
+
+    @property
+    def validation(cls):
+        """Provides how bad candles found in downloads are handled.
+
+        Returns:
+            [str]: 'off', 'flag' or 'quarantine'
+        """
+        return cls.__config['SYSTEM'].get('Validation', 'flag')
+
+    @property
+    def fill_policy(cls):
+        """Provides how empty periods between saved candles are filled.
+
+        Returns:
+            [str]: 'off', 'ffill', 'zero' or 'nan'
+        """
+        return cls.__config['SYSTEM'].get('FillPolicy', 'off')
+
+    @property
+    def analytics_window(cls):
+        """Provides candles of rolling analytics kept for coin files.
+
+        Returns:
+            [int]: window of rolling series, 0 if analytics are disabled
+        """
+        return int(cls.__config['SYSTEM'].get('AnalyticsWindow', '0'))
+
+    @property
+    def rate_limit_file(cls):
+        """Provides the database of request budgets shared by processes.
+
+        Returns:
+            [str]: path of database, empty if budgets are not shared
+        """
+        return cls.__config['SYSTEM'].get(
+            'RateLimitFile',
+            os.path.join(tempfile.gettempdir(), 'cryptoasset_rate_limits.db'))
+
+    def throttle_limit(cls, exc_name):
+        """Provides the request limit learned for an exchange.
+
+        Args:
+            exc_name (str): name of exchange
+
+        Returns:
+            [float]: requests in flight or None if nothing is learned yet
+        """
+        if not cls.__config.has_option('THROTTLE', exc_name):
+            return None
+        return cls.__config['THROTTLE'].getfloat(exc_name)
+
+    @classmethod
+    def change_throttle_limits(cls, limits):
+        """Saves request limits learned for exchanges into config.ini file.
+
+        Args:
+            limits (dict): names of exchanges and their limits
+        """
+        if not cls.__config.has_section('THROTTLE'):
+            cls.__config['THROTTLE'] = {}
+        for exc_name, limit in limits.items():
+            cls.__config['THROTTLE'][exc_name] = f'{limit:.2f}'
+        cls.__write_config_file()
+
     @classmethod
     def __check_config_file(cls):
         """Checks and creates if config.ini file does not exist.
@@ -76,7 +169,13 @@ class Config:
         cls.__config['SYSTEM'] = {'Platform': platform,
                                   'SaveFolder': os.getcwd(),
                                   'StartDate': '01-01-2020',
-                                  'StartHour': '00:00:00'}
+                                  'StartHour': '00:00:00',
+                                  'ParseWorkers': '0',
+                                  'CacheMegabytes': '64',
+                                  'ColumnExport': 'no',
+                                  'Validation': 'flag',
+                                  'FillPolicy': 'off',
+                                  'AnalyticsWindow': '0'}
         cls.__write_config_file()
 
     @classmethod
@@ -5,6 +5,14 @@
     """
 from abc import ABC, abstractmethod
 
+import arrow
+import numpy as np
+
+from application.classes.candle_cls import FREQUENCY_SECONDS
+from application.classes.coin_cls import CoinCollection
+from application.classes.flight_cls import SingleFlight
+from application.classes.session_cls import ApiSession
+
 
 class Exchange(ABC):
     """An abstract base class to create crypto-exchange classes.
@@ -14,26 +22,52 @@ class Exchange(ABC):
         """Constructor of Exchange class.
 
         Attr:
-            __coins (list): list of coins belongs to the exchange
-                            (Default to [])
+            __coins (obj): collection of coins belongs to the exchange
+                           (Default to empty CoinCollection)
             __save_folder_path (str): Exchange's OS path to
                                       save coin files.
+            __session (obj): HTTP session of exchange API
+                             (Default to None, created when first used)
+            flights (obj): coalesces identical downloads in progress
         """
-        self.__coins = []
+        self.__coins = CoinCollection()
+        self.__session = None
+        self.flights = SingleFlight()
+
+    # minimum seconds between two requests not to be banned by API
+    request_interval = 0.5
+    # whether find_listing_date gives the first candle for certain
+    exact_listing_date = False
+    # 'ohlc' or 'mean' if candles have only the mean trade price as close
+    candle_prices = 'ohlc'
+
+    @property
+    def session(self):
+        """HTTP session used for all API calls of exchange.
+
+        Returns:
+            (obj): ApiSession with timeouts, retries and circuit breaker
+        """
+        if self.__session is None:
+            self.__session = ApiSession(self.name,
+                                        min_interval=self.request_interval)
+        return self.__session
 
     @property
     def coins(self):
         """Possessed coins by exchange.
 
         Returns:
-            list: cin object in exchange's coin list
+            (obj): collection of coin objects in exchange
         """
         return self.__coins
 
     @coins.setter
     def coins(self, data):
-        if isinstance(data, list):
+        if isinstance(data, CoinCollection):
             self.__coins = data
+        elif isinstance(data, list):
+            self.__coins = CoinCollection(data)
 
     def possess_coin(self, coin):
         """Adds a coin obj to target exchange's coin list
@@ -41,7 +75,7 @@ class Exchange(ABC):
         Args:
             coin (obj): new coin to posses
         """
-        self.__coins.append(coin)
+        self.__coins.add(coin)
 
     def abandon_coin(self, coin):
         """Removes a coin from target exchange's coin list
@@ -49,9 +83,7 @@ class Exchange(ABC):
         Args:
             coin (obj): coin to remove from stock
         """
-        for i in self.__coins:
-            if coin.name == i.name:
-                self.__coins.remove(i)
+        self.__coins.remove(coin)
 
     @ property
     @ abstractmethod
@@ -88,6 +120,8 @@ class Exchange(ABC):
     @ property
     def db_columns(self) -> list:
         """Provides database table columns and data types.
+
+        Columns are in the same order as CandleBatch columns.
         """
         return [{'Column Name': 'Time',
                  'Data Type': 'DATETIME'},
@@ -166,29 +200,200 @@ class Exchange(ABC):
         """
         raise NotImplementedError
 
+    def __init_subclass__(cls, **kwargs):
+        """Completes download methods of an exchange class.
+
+        Exchanges implementing fetch_hist_data & parse_hist_data are given
+        a download_hist_data joining them. Other exchanges must implement
+        download_hist_data, otherwise they can not be instantiated.
+        """
+        super().__init_subclass__(**kwargs)
+        if getattr(cls.download_hist_data, '__isabstractmethod__', False) \
+                and cls.fetch_hist_data is not Exchange.fetch_hist_data \
+                and cls.parse_hist_data is not Exchange.parse_hist_data:
+            cls.download_hist_data = Exchange._download_in_steps
+
     @ abstractmethod
-    def download_hist_data(self, symbol, start_date, end_date) -> list:
-        """download_hist_data [summary]
+    def download_hist_data(self, coin, time, token=None):
+        """Downloads historical data of selected crypto asset.
+
+        Exchanges either implement fetch_hist_data & parse_hist_data or
+        override this method.
+
+        Args:
+            coin (obj): given coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token passed to every API call
+                         (Default to None)
+
+        Returns:
+            (obj): candle batch of downloaded historical data
+        """
+        raise NotImplementedError
+
+    def _download_in_steps(self, coin, time, token=None):
+        """Downloads historical data by fetch_hist_data & parse_hist_data.
+
+        Identical downloads running at the same time (e.g. of coins
+        tracking the same pair) share one download.
+
+        Args:
+            coin (obj): given coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token passed to every API call
+                         (Default to None)
+
+        Returns:
+            (obj): candle batch of downloaded historical data
+        """
+        return self.flights.do(
+            self.download_key(coin, time),
+            lambda: self.parse_hist_data(
+                self.fetch_hist_data(coin, time, token)),
+            token)
+
+    def download_latest(self, coin, count, token=None):
+        """Downloads the newest candles of a coin by one request.
+
+        The time block ending now is requested directly. Exchanges whose
+        API can sort candles newest first may override this method.
+
+        Args:
+            coin (obj): given coin
+            count (int): number of candles, at most max_API_requests
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            (obj): candle batch of newest candles in time order
+        """
+        count = min(count, self.max_API_requests)
+        end = arrow.utcnow()
+        start = end.shift(seconds=-FREQUENCY_SECONDS[coin.frequency] * count)
+        data = self.download_hist_data(coin, [start, end], token)
+        data = data.take(np.argsort(data.time, kind='stable'))
+        return data.take(slice(-count, None))
+
+    def probe_window(self, coin):
+        """Provides the time span downloaded by one request.
+
+        Args:
+            coin (obj): given coin
+
+        Returns:
+            int: seconds of candles in one time block
+        """
+        return FREQUENCY_SECONDS[coin.frequency] * self.max_API_requests
+
+    def find_listing_date(self, coin, start, end, token=None):
+        """Finds the first candle of a coin's pair in a date range.
+
+        The first and the last time block of range are probed. If only
+        the last one has candles, the gap between them is narrowed by
+        binary search, so only a few requests are needed even if the pair
+        was listed years after start.
+
+        The result is not exact: if a probe lands in a time block
+        without trades after the listing, the search skips past the
+        real listing. Exchanges which can find the first candle for
+        certain override this and set 'exact_listing_date'.
 
         Args:
-            symbol (str): Symbol of crypto asset
-            start_date (str): start date of download request
-            end_date (str): end date of download request
+            coin (obj): given coin
+            start (obj): start date of search
+            end (obj): end date of search
+            token (obj): cancel token of download (Default to None)
 
         Returns:
-            list: downloaded historical data
+            (obj): date of first candle or None if there is no candle
         """
+        window = self.probe_window(coin)
+        first, last = int(start.float_timestamp), int(end.float_timestamp)
+
+        def probe(time):
+            data = self.download_hist_data(
+                coin, [arrow.get(time), arrow.get(min(time + window, last))],
+                token)
+            return int(data.time.min()) if len(data) else None
+
+        found = probe(first)
+        if found is not None:
+            return arrow.get(found)
+        time = max(first, last - window)
+        found = probe(time) if time > first else None
+        if found is None:
+            return None  # pair has no candles in range
+        empty = first  # block starting at 'empty' has no candles
+        while time - empty > window:
+            middle = (empty + time) // 2
+            candle = probe(middle)
+            if candle is None:
+                empty = middle
+            else:
+                time, found = middle, candle
+        return arrow.get(found)
+
+    def download_key(self, coin, time):
+        """Provides a key identifying the download of a time block.
+
+        Args:
+            coin (obj): given coin
+            time (list): [start date obj,end date obj]
+
+        Returns:
+            tuple: pair, frequency and epoch seconds of time block
+        """
+        return (coin.quote.upper(), coin.base.upper(), coin.frequency,
+                int(time[0].float_timestamp), int(time[1].float_timestamp))
+
+    @property
+    def splits_download(self):
+        """Whether download is split into fetch and parse steps.
+
+        Parse step of such exchanges can run in other processes.
 
+        Returns:
+            bool: True if fetch_hist_data & parse_hist_data are provided
+        """
+        cls = type(self)
+        return (cls.fetch_hist_data is not Exchange.fetch_hist_data and
+                cls.parse_hist_data is not Exchange.parse_hist_data)
+
+    def fetch_hist_data(self, coin, time, token=None):
+        """Downloads raw historical data without decoding it.
+
+        Args:
+            coin (obj): given coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token passed to every API call
+                         (Default to None)
+
+        Returns:
+            (obj): picklable raw payload for parse_hist_data
+        """
+        raise NotImplementedError
+
+    def parse_hist_data(self, payload):
+        """Decodes raw payload of fetch_hist_data into a candle batch.
+
+        It must not depend on the state of exchange object, since it can
+        run on a new exchange object in another process.
+
+        Args:
+            payload (obj): raw payload given by fetch_hist_data
+
+        Returns:
+            (obj): candle batch of downloaded historical data
+        """
         raise NotImplementedError
 
     @ abstractmethod
-    def correct_downloaded_data(self, downloaded_data) -> list:
-        """Corrects & modifies downloaded data for SQL upload
+    def correct_downloaded_data(self, downloaded_data):
+        """Converts downloaded data into a candle batch.
 
         Args:
             downloaded_data (list): downloaded historical data
 
         Returns:
-            list: corrected downloaded data for SQL upload
+            (obj): candle batch with the columns of db_columns
         """
         raise NotImplementedError
@@ -7,13 +7,17 @@ List of Classes:
     Bitfinex
     Kraken
 """
-from time import sleep
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 
 import arrow
+import numpy as np
 import pandas as pd
-import requests
 
+from application.classes.cancel_cls import CancelToken, DownloadCancelled
+from application.classes.candle_cls import (CandleBatch, epoch_seconds,
+                                            iso_seconds)
 from application.classes.exchange_base_cls import Exchange
+from application.decode_func import kraken_cursor, loads
 
 
 class Bitpanda(Exchange):
@@ -35,33 +39,50 @@ class Bitpanda(Exchange):
         """
         headers = {'Accept': 'application/json'}
         try:
-            data = requests.get(
+            data = self.session.get(
                 'https://api.exchange.bitpanda.com/public/v1/currencies',
                 headers=headers)
-            return str([coin['code'] for coin in data.json()]).strip('[]')
+            return str([coin['code'] for coin in loads(data.content)]) \
+                .strip('[]')
         except (ConnectionError, Exception) as err:
             return f'''\nProblem occurred while connecting to API of {self.name.upper()}
             \n{err}'''
 
-    def download_hist_data(self, coin, time):
+    def fetch_hist_data(self, coin, time, token=None):
         """Downloads historical data of selected crypto asset.
 
         Args:
             coin (obj): given coin
             time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            bytes: response body
         """
         link = f'https://api.exchange.bitpanda.com/' \
                f'public/v1/candlesticks/{coin.quote}_{coin.base}'
         headers = {'Accept': 'application/json'}
-        data = requests.get(link,
-                            params={'unit': coin.frequency.upper(),
-                                    'period': '1',
-                                    'from': time[0],
-                                    'to': time[1]},
-                            headers=headers)
+        data = self.session.get(link,
+                                params={'unit': coin.frequency.upper(),
+                                        'period': '1',
+                                        'from': time[0],
+                                        'to': time[1]},
+                                headers=headers,
+                                token=token)
         if not data.status_code == 200:
             raise ConnectionError(self.err_msg(data.text))
-        return self.correct_downloaded_data(data.json())
+        return data.content
+
+    def parse_hist_data(self, payload):
+        """Decodes downloaded response into a candle batch.
+
+        Args:
+            payload (bytes): response body given by fetch_hist_data
+
+        Returns:
+            (obj): candle batch of downloaded data
+        """
+        return self.correct_downloaded_data(loads(payload))
 
     def correct_downloaded_data(self, downloaded_data):
         """Corrects & modifies downloaded data for cvs file.
@@ -70,14 +91,12 @@ class Bitpanda(Exchange):
             downloaded_data (list): downloaded historical data
 
         Returns:
-            list: data for csv file save
+            (obj): candle batch of downloaded data
         """
-        return [[arrow.get(data['time']).format('YYYY-MM-DD HH:mm:ss'),
-                 data['high'],
-                 data['low'],
-                 data['open'],
-                 data['close'],
-                 data['volume']] for data in downloaded_data]
+        time = iso_seconds([data['time'] for data in downloaded_data])
+        return CandleBatch(time, *[[data[key] for data in downloaded_data]
+                                   for key in ('high', 'low', 'open',
+                                               'close', 'volume')])
 
 
 class Exmo(Exchange):
@@ -98,29 +117,50 @@ class Exmo(Exchange):
             str: all available coins in the exchange
         """
         try:
-            data = requests.get('https://api.exmo.com/v1.1/currency')
-            return str(data.json()).strip('[]')
+            data = self.session.get('https://api.exmo.com/v1.1/currency')
+            return str(loads(data.content)).strip('[]')
         except (ConnectionError, Exception) as err:
             return f'''\nProblem occurred while connecting to API of {self.name.upper()}
             \n{err}'''
 
-    def download_hist_data(self, coin, time):
+    def fetch_hist_data(self, coin, time, token=None):
         """Downloads historical data of selected crypto asset.
 
         Args:
             coin (obj): given coin
             time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            bytes: response body
+        """
+        data = self.session.get(
+            'https://api.exmo.com/v1.1/candles_history',
+            params={'symbol': f'{coin.quote}_{coin.base}',
+                    'resolution': self.__resolution(coin.frequency),
+                    'from': time[0].timestamp,
+                    'to': time[1].timestamp},
+            token=token)
+        return data.content
+
+    def parse_hist_data(self, payload):
+        """Decodes downloaded response into a candle batch.
+
+        Args:
+            payload (bytes): response body given by fetch_hist_data
+
+        Raises:
+            ConnectionError: occurs if response includes no candles
+
+        Returns:
+            (obj): candle batch of downloaded data
         """
-        data = requests.get('https://api.exmo.com/v1.1/candles_history', {
-            'symbol': f'{coin.quote}_{coin.base}',
-            'resolution': self.__resolution(coin.frequency),
-            'from': time[0].timestamp,
-            'to': time[1].timestamp
-        })
         try:
-            return self.correct_downloaded_data(data.json()['candles'])
-        except:
-            raise ConnectionError(self.err_msg(data.text))
+            return self.correct_downloaded_data(
+                loads(payload)['candles'])
+        except (ValueError, KeyError, TypeError):
+            raise ConnectionError(self.err_msg(
+                payload.decode(errors='replace')))
 
     @ staticmethod
     def __resolution(freq):
@@ -150,15 +190,11 @@ class Exmo(Exchange):
             downloaded_data (list): downloaded historical data
 
         Returns:
-            list: data for csv file save
+            (obj): candle batch of downloaded data
         """
-        return [[arrow.get(int(data['t'])).format('YYYY-MM-DD HH:mm:ss'),
-                 data['h'],
-                 data['l'],
-                 data['o'],
-                 data['c'],
-                 data['v']]
-                for data in downloaded_data]
+        time = epoch_seconds([data['t'] for data in downloaded_data])
+        return CandleBatch(time, *[[data[key] for data in downloaded_data]
+                                   for key in ('h', 'l', 'o', 'c', 'v')])
 
 
 class Coinbasepro(Exchange):
@@ -190,31 +226,47 @@ class Coinbasepro(Exchange):
             str: all available coins in the exchange
         """
         try:
-            data = requests.get(
+            data = self.session.get(
                 'https://api.pro.coinbase.com/products')
-            return str([coin['id'] for coin in data.json()]).strip('[]')
+            return str([coin['id'] for coin in loads(data.content)]) \
+                .strip('[]')
         except (ConnectionError, Exception) as err:
             return f'\nProblem occurred while connecting to API of '  \
                 '{self.name.upper()}\n\n{err}'
 
-    def download_hist_data(self, coin, time):
+    def fetch_hist_data(self, coin, time, token=None):
         """Downloads historical data of selected crypto asset.
 
         Args:
             coin (obj): given coin
             time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            bytes: response body
         """
 
         link = f'https://api.pro.coinbase.com/products/' \
             f'{coin.quote}-{coin.base}/candles'
-        data = requests.get(link, {
+        data = self.session.get(link, params={
             'start': time[0].shift(seconds=int(self.__gran(coin.frequency))),
             'end': time[1],
             'granularity': self.__gran(coin.frequency),
-        })
+        }, token=token)
         if not data.status_code == 200:
             raise ConnectionError(self.err_msg(data.text))
-        return self.correct_downloaded_data(data.json())
+        return data.content
+
+    def parse_hist_data(self, payload):
+        """Decodes downloaded response into a candle batch.
+
+        Args:
+            payload (bytes): response body given by fetch_hist_data
+
+        Returns:
+            (obj): candle batch of downloaded data
+        """
+        return self.correct_downloaded_data(loads(payload))
 
     @ staticmethod
     def __gran(freq):
@@ -244,14 +296,11 @@ class Coinbasepro(Exchange):
             downloaded_data (list): downloaded historical data
 
         Returns:
-            list: data for csv file save
+            (obj): candle batch of downloaded data
         """
-        return [[arrow.get(data[0]).format('YYYY-MM-DD HH:mm:ss'),
-                 data[2],
-                 data[1],
-                 data[3],
-                 data[4],
-                 data[5]] for data in reversed(downloaded_data)]
+        # API provides candles from newest to oldest
+        return CandleBatch.from_rows(downloaded_data,
+                                     order=(0, 2, 1, 3, 4, 5)).reversed()
 
 
 class Bitfinex(Exchange):
@@ -272,31 +321,75 @@ class Bitfinex(Exchange):
             str: all available coins in the exchange
         """
         try:
-            data = requests.get(
+            data = self.session.get(
                 'https://api-pub.bitfinex.com/v2/tickers?symbols=ALL')
-            return str([coin[0] for coin in data.json()]).strip('[]')
+            return str([coin[0] for coin in loads(data.content)]) \
+                .strip('[]')
         except (ConnectionError, Exception) as err:
             return f'\nProblem occurred while connecting to API of ' \
                 '{self.name.upper()}\n\n{err}'
 
-    def download_hist_data(self, coin, time):
+    def fetch_hist_data(self, coin, time, token=None):
         """Downloads historical data of selected crypto asset.
 
         Args:
             coin (obj): given coin
             time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            bytes: response body
         """
         link = f'https://api-pub.bitfinex.com/v2/candles/trade' \
             f':{self.__gran(coin.frequency)}'\
             f':t{coin.quote}{coin.base}/hist'
-        data = requests.get(link, params={
+        data = self.session.get(link, params={
             'limit': 10,
             'start': time[0].format("x")[:13],  # convert to ms
             'end': time[1].format("x")[:13],  # convert to ms
-            'sort': '1'})
+            'sort': '1'}, token=token)
         if not data.status_code == 200:
             raise ConnectionError(self.err_msg(data.text))
-        return self.correct_downloaded_data(data.json())
+        return data.content
+
+    def parse_hist_data(self, payload):
+        """Decodes downloaded response into a candle batch.
+
+        Args:
+            payload (bytes): response body given by fetch_hist_data
+
+        Returns:
+            (obj): candle batch of downloaded data
+        """
+        return self.correct_downloaded_data(loads(payload))
+
+    def download_latest(self, coin, count, token=None):
+        """Downloads the newest candles of a coin by one request.
+
+        Bitfinex sorts candles newest first if asked, so no time block is
+        needed.
+
+        Args:
+            coin (obj): given coin
+            count (int): number of candles, at most max_API_requests
+            token (obj): cancel token of download (Default to None)
+
+        Raises:
+            ConnectionError: occurs if the request fails
+
+        Returns:
+            (obj): candle batch of newest candles in time order
+        """
+        link = f'https://api-pub.bitfinex.com/v2/candles/trade' \
+            f':{self.__gran(coin.frequency)}'\
+            f':t{coin.quote}{coin.base}/hist'
+        data = self.session.get(link, params={
+            'limit': min(count, self.max_API_requests),
+            'sort': '-1'}, token=token)
+        if not data.status_code == 200:
+            raise ConnectionError(self.err_msg(data.text))
+        data = self.parse_hist_data(data.content)
+        return data.take(np.argsort(data.time, kind='stable'))
 
     @ staticmethod
     def __gran(freq):
@@ -326,14 +419,10 @@ class Bitfinex(Exchange):
             downloaded_data (list): downloaded historical data
 
         Returns:
-            list: data for csv file save
+            (obj): candle batch of downloaded data
         """
-        return [[arrow.get(data[0]).format('YYYY-MM-DD HH:mm:ss'),
-                 data[3],
-                 data[4],
-                 data[1],
-                 data[2],
-                 data[5]] for data in downloaded_data]
+        return CandleBatch.from_rows(downloaded_data,
+                                     order=(0, 3, 4, 1, 2, 5))
 
 
 class Kraken(Exchange):
@@ -344,6 +433,11 @@ class Kraken(Exchange):
     website = 'https://www.kraken.com'
     api_website = 'https://support.kraken.com/hc/en-us/articles/360001491786-API-error-messages'
     max_API_requests = 120
+    request_interval = 2
+    range_splits = 4
+    min_split_seconds = 1800
+    exact_listing_date = True
+    candle_prices = 'mean'
     api_key = None
     secret_key = None
 
@@ -363,81 +457,211 @@ class Kraken(Exchange):
             str: all available coins in the exchange
         """
         try:
-            data = requests.get(
+            data = self.session.get(
                 'https://api.kraken.com/0/public/AssetPairs')
-            return str([coin for coin in data.json()['result']]).strip('[]')
+            return str([coin for coin in loads(data.content)['result']]) \
+                .strip('[]')
         except Exception as err:
             return f'''\nProblem occurred while connecting to API of {self.name.upper()}
             \n{err}'''
 
-    def download_hist_data(self, coin, time):
+    def fetch_hist_data(self, coin, time, token=None):
         """Downloads historical data of selected crypto asset.
 
         Kraken has a different API than others. User gives a start date and
-        API provides all trades with resolution in seconds up 720 data
-        points! Than app should select the last date of result and start
-        requesting next query by using the last date of previous query.
-        That is why this method has additional data process method.
+        API provides all trades with resolution in seconds up to 1000
+        trades! Than app should request the next page by using the 'last'
+        cursor of previous page. Time block is split into sub-ranges which
+        are paged in parallel threads, each with its own cursor.
         for more info:
         https://support.kraken.com/hc/en-us/articles/218198197
 
         Args:
             coin (obj): given coin
             time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Raises:
+            ConnectionError: occurs if a page can not be downloaded
+
+        Returns:
+            list: [response body, start, end] of all pages, where start
+                  and end are epoch seconds of the page's sub-range
+        """
+        start = int(time[0].float_timestamp)
+        end = int(time[1].float_timestamp)
+        if start >= end:
+            return []
+        splits = max(1, min(self.range_splits,
+                            (end - start) // self.min_split_seconds))
+        step = -(-(end - start) // splits)
+        ranges = [(lo, min(lo + step, end)) for lo in range(start, end, step)]
+        # stops all sub-ranges if one of them fails
+        range_token = CancelToken()
+        unregister = token.on_cancel(range_token.cancel) \
+            if token is not None else None
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(self.__fetch_range, coin, lo, hi,
+                                           range_token)
+                           for lo, hi in ranges]
+                wait(futures, return_when=FIRST_EXCEPTION)
+                errors = [future.exception() for future in futures
+                          if future.done() and future.exception()]
+                if errors:
+                    range_token.cancel()
+                    wait(futures)
+                    raise next((err for err in errors
+                                if not isinstance(err, DownloadCancelled)),
+                               errors[0])
+                return [page for future in futures
+                        for page in future.result()]
+        finally:
+            if unregister is not None:
+                unregister()
+
+    def find_listing_date(self, coin, start, end, token=None):
+        """Finds the first trade of a coin's pair in a date range.
+
+        Trades endpoint gives the trades after a cursor, so the first
+        trade is found by one request.
+
+        Args:
+            coin (obj): given coin
+            start (obj): start date of search
+            end (obj): end date of search
+            token (obj): cancel token of download (Default to None)
+
+        Raises:
+            ConnectionError: occurs if the request fails
+
+        Returns:
+            (obj): date of first trade or None if there is no trade
+        """
+        start = int(start.float_timestamp)
+        data = self.session.get('https://api.kraken.com/0/public/Trades',
+                                params={'pair': f'{coin.quote}{coin.base}',
+                                        'since': str(start * 10**9 - 1)},
+                                token=token)
+        decoded = loads(data.content) if data.status_code == 200 else {}
+        if decoded.get('error') != []:
+            raise ConnectionError(self.err_msg(data.text))
+        trades = self.__page_trades(decoded, start,
+                                    int(end.float_timestamp))
+        return arrow.get(int(trades[0, 2])) if len(trades) else None
+
+    def __fetch_range(self, coin, start, end, token):
+        """Pages trades of a sub-range by full precision cursors.
+
+        Args:
+            coin (obj): given coin
+            start (int): epoch seconds of sub-range start
+            end (int): epoch seconds of sub-range end
+            token (obj): cancel token of download
+
+        Raises:
+            ConnectionError: occurs if a page can not be downloaded
+
+        Returns:
+            list: [response body, start, end] of pages in time order
         """
-        link = f'https://api.kraken.com/0/public/Trades'
-        final_data = []
-        while time[0] < time[1]:
-            data = requests.get(link, params={
+        link = 'https://api.kraken.com/0/public/Trades'
+        # cursors are in nanoseconds and exclusive
+        since = str(start * 10**9 - 1)
+        pages = []
+        while True:
+            data = self.session.get(link, params={
                 'pair': f'{coin.quote}{coin.base}',
-                'since': time[0].format('X')})
-            if not data.status_code == 200 or data.json()['error'] != []:
-                raise ConnectionError(self.err_msg(data.json()['error']))
-            processed_data = self.__process_data(data)
-            for item in processed_data:
-                final_data.append(item)
-            time[0] = arrow.get(int(data.json()['result']['last'][:10]))
-            sleep(2)
+                'since': since}, token=token)
+            # only the cursor is read here, pages are decoded once by
+            # parse_hist_data
+            last = kraken_cursor(data.content) \
+                if data.status_code == 200 else None
+            if last is None:
+                raise ConnectionError(self.err_msg(data.text))
+            pages.append([data.content, start, end])
+            if int(last) >= end * 10**9 or last == since:
+                return pages
+            since = last
+
+    def parse_hist_data(self, payload):
+        """Decodes downloaded pages into a candle batch.
+
+        Trades outside the sub-range of their page are dropped, so trades
+        are not duplicated where sub-ranges meet.
+
+        Args:
+            payload (list): pages given by fetch_hist_data
+
+        Returns:
+            (obj): candle batch of downloaded data
+        """
+        trades = [self.__page_trades(loads(page), start, end)
+                  for page, start, end in payload]
+        trades = np.concatenate(trades) if trades else np.empty((0, 3))
+        if not len(trades):
+            return self.correct_downloaded_data([])
+        return self.correct_downloaded_data([self.__process_data(trades)])
+
+    @staticmethod
+    def __page_trades(downloaded_data, start, end):
+        """Selects trades of a page within its sub-range.
+
+        Arg:
+            downloaded_data (dict): decoded response of a page
+            start (int): epoch seconds of sub-range start
+            end (int): epoch seconds of sub-range end
 
-        return self.correct_downloaded_data(final_data)
+        Return:
+            (obj): numpy array of price, volume and time of trades
+        """
+        for name, data in downloaded_data['result'].items():
+            if name == 'last':
+                continue
+            trades = np.asarray([row[:3] for row in data],
+                                dtype=np.float64).reshape(-1, 3)
+            return trades[(trades[:, 2] >= start) & (trades[:, 2] < end)]
+        return np.empty((0, 3))
 
     @staticmethod
-    def __process_data(downloaded_data):
+    def __process_data(trades):
         """Granulate the data from seconds to minutes
 
         Arg:
-            downloaded_data (list): downloaded data
+            trades (obj): numpy array of price, volume and time of trades
 
         Return:
-            (list): list of granulated data
+            (obj): data frame of granulated data
         """
-        for data in downloaded_data.json()['result'].values():
-            result = [[float(i[0]),
-                       float(i[1]),
-                       arrow.get(i[2]).format()]
-                      for i in data]
-            break
-        df = pd.DataFrame(result, columns=['price', 'vol', 'time'])
-        df['time'] = pd.to_datetime(df['time'])
-        df2 = df.resample('1min', on='time').mean()  # granulates data
-        df2['price'] = df2['price'].fillna(method='ffill')  # fill empty prices
-        df2['vol'] = df2['vol'].fillna(0)  # fill empty vol
-        df2.reset_index(inplace=True)
-        return df2.values.tolist()
+        trades = trades[np.argsort(trades[:, 2], kind='stable')]
+        df = pd.DataFrame({'price': trades[:, 0],
+                           'vol': trades[:, 1]},
+                          index=pd.to_datetime(trades[:, 2], unit='s'))
+        # granulates data, volumes of a minute's trades add up
+        df2 = df.resample('1min').agg({'price': 'mean', 'vol': 'sum'})
+        df2['price'] = df2['price'].ffill()  # fill empty prices
+        return df2
 
-    @ staticmethod
     def correct_downloaded_data(self, downloaded_data):
         """Corrects & modifies downloaded data for cvs file.
 
+        Kraken provides only trade prices, so high, low and open prices
+        of candles are left missing.
+
         Args:
-            downloaded_data (list): downloaded historical data
+            downloaded_data (list): granulated data frames of each page
 
         Returns:
-            list: data for csv file save
+            (obj): candle batch of downloaded data
         """
-        return [[arrow.get(data[0]).format('YYYY-MM-DD HH:mm:ss'),
-                 '-',
-                 '-',
-                 '-',
-                 round(data[1], 2),
-                 data[2]] for data in downloaded_data]
+        if not downloaded_data:
+            return CandleBatch.empty()
+        df = pd.concat(downloaded_data)
+        time = df.index.values.astype('datetime64[s]').astype(np.int64)
+        missing = np.full(len(df), np.nan)
+        return CandleBatch(time,
+                           missing,
+                           missing,
+                           missing,
+                           np.round(df['price'].values, 2),
+                           df['vol'].values)
@@ -0,0 +1,94 @@
+"""Provides coalescing of identical calls running at the same time.
+
+    List of classes:
+        SingleFlight
+    """
+import threading
+
+from application.classes.cancel_cls import DownloadCancelled
+
+
+class _Call:
+    """A call in progress and its outcome.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs only one call of the same key at a time.
+
+    Callers asking for a key while a call of it is in progress wait for
+    that call and share its result or error instead of calling again.
+    If the running call is cancelled by its own caller's token, waiting
+    callers which are not cancelled make the call again.
+
+    Attr:
+        shared (int): number of calls served by another caller's call
+    """
+
+    def __init__(self):
+        """Constructor of SingleFlight class.
+        """
+        self.shared = 0
+        self.__calls = {}
+        self.__lock = threading.Lock()
+
+    def do(self, key, fn, token=None):
+        """Calls fn unless a call of the same key is in progress.
+
+        Args:
+            key (obj): hashable key of identical calls
+            fn (callable): function to call without arguments
+            token (obj): cancel token of caller (Default to None)
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+
+        Returns:
+            (obj): result of fn, possibly shared with other callers
+        """
+        while True:
+            with self.__lock:
+                call = self.__calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self.__calls[key] = _Call()
+                else:
+                    self.shared += 1
+            if leader:
+                return self.__run(key, call, fn)
+            while not call.done.wait(0.1):
+                if token is not None:
+                    token.raise_if_cancelled()
+            if isinstance(call.error, DownloadCancelled) and \
+                    (token is None or not token.cancelled):
+                continue  # call was cancelled by its own caller
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def __run(self, key, call, fn):
+        """Runs a call and hands its outcome over to waiting callers.
+
+        Args:
+            key (obj): key of call
+            call (obj): call in progress
+            fn (callable): function to call
+
+        Returns:
+            (obj): result of fn
+        """
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
@@ -0,0 +1,149 @@
+"""Provides a sparse time index of coin files.
+
+    List of classes:
+        SeriesIndex
+    """
+import bisect
+import json
+import os
+import threading
+
+
+class SeriesIndex:
+    """Keeps byte offsets of every 'step'th candle row of a coin file.
+
+    Candle times in coin files are 'YYYY-MM-DD HH:mm:ss' strings, which
+    sort in time order as text. A range read seeks to the closest indexed
+    row before the range and scans only from there. Index is saved to a
+    JSON file and extended incrementally as candles are appended.
+
+    If rows are found out of time order, the index is marked unsorted
+    and range reads scan the whole file.
+    """
+
+    version = 1
+
+    def __init__(self, file_path, index_path, step=1000):
+        """Constructor of SeriesIndex class.
+
+        Args:
+            file_path (str): path of coin file
+            index_path (str): path of index file
+            step (int): number of rows between indexed rows
+                        (Default to 1000)
+        """
+        self.file_path = file_path
+        self.index_path = index_path
+        self.step = step
+        self.__lock = threading.Lock()
+        self.__state = self.__load()
+
+    def __empty_state(self):
+        """Provides state of an index without rows.
+
+        Returns:
+            dict: index state
+        """
+        return {'version': self.version, 'step': self.step, 'inode': None,
+                'size': 0, 'rows': 0, 'last_time': '', 'sorted': True,
+                'times': [], 'offsets': []}
+
+    def __load(self):
+        """Reads saved index state if it exists.
+
+        Returns:
+            dict: index state
+        """
+        try:
+            with open(self.index_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return self.__empty_state()
+        if state.get('version') != self.version or \
+                state.get('step') != self.step:
+            return self.__empty_state()
+        return state
+
+    def __save(self):
+        """Writes index state to index file.
+        """
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.__state, f)
+        os.replace(temp_path, self.index_path)
+
+    def refresh(self):
+        """Indexes rows appended since the last refresh.
+
+        Index is rebuilt if the coin file was replaced or truncated.
+        """
+        with self.__lock:
+            stat = os.stat(self.file_path)
+            state = self.__state
+            if state['inode'] != stat.st_ino or state['size'] > stat.st_size:
+                state = self.__state = self.__empty_state()
+                state['inode'] = stat.st_ino
+            if state['size'] == stat.st_size:
+                return
+            with open(self.file_path, 'rb') as f:
+                f.seek(state['size'])
+                offset = state['size']
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # row is being written
+                    start, offset = offset, offset + len(line)
+                    if not line[:1].isdigit():
+                        continue  # comment or header line
+                    time = line.split(b';', 1)[0].decode()
+                    if time < state['last_time']:
+                        state['sorted'] = False
+                    if state['rows'] % self.step == 0:
+                        state['times'].append(time)
+                        state['offsets'].append(start)
+                    state['rows'] += 1
+                    state['last_time'] = max(time, state['last_time'])
+            state['size'] = offset
+            self.__save()
+
+    @property
+    def rows(self):
+        """Number of indexed candle rows.
+
+        Returns:
+            int: number of rows
+        """
+        return self.__state['rows']
+
+    def read_range(self, start=None, end=None):
+        """Reads candle rows in a time range.
+
+        Args:
+            start (str): first time to include (Default to None)
+            end (str): last time to include (Default to None)
+
+        Yields:
+            (str): candle rows in file order
+        """
+        self.refresh()
+        with self.__lock:
+            state = self.__state
+            size = state['size']
+            offset = 0
+            if state['sorted'] and start is not None and state['times']:
+                i = bisect.bisect_left(state['times'], start) - 1
+                offset = state['offsets'][max(i, 0)]
+        with open(self.file_path, 'rb') as f:
+            f.seek(offset)
+            while f.tell() < size:
+                line = f.readline()
+                if not line[:1].isdigit():
+                    continue
+                row = line.decode().rstrip('\r\n')
+                time = row.split(';', 1)[0]
+                if start is not None and time < start:
+                    continue
+                if end is not None and time > end:
+                    if state['sorted']:
+                        break
+                    continue
+                yield row
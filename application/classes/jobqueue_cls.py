@@ -0,0 +1,303 @@
+"""Provides a shared queue of download jobs for distributed workers.
+
+    List of classes:
+        JobQueue
+    """
+import sqlite3
+import time
+from contextlib import contextmanager
+
+
+class JobQueue:
+    """Keeps time block jobs of coin downloads in a SQLite database.
+
+    Database file can be put on a volume shared by several machines.
+    A worker leases a job for a limited time and extends the lease by
+    heartbeats while working on it. Jobs of workers which stopped sending
+    heartbeats become available again when their lease expires.
+
+    Downloaded candles of a job are kept in the database until all
+    previous jobs of the same coin are finished. Then they are merged
+    into the coin file in time order. A job failed 'max_attempts' times
+    holds back later jobs of its coin until it is requeued.
+    """
+
+    schema = '''CREATE TABLE IF NOT EXISTS jobs (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     exchange TEXT NOT NULL,
+                     coin_file TEXT NOT NULL,
+                     seq INTEGER NOT NULL,
+                     start_time INTEGER NOT NULL,
+                     end_time INTEGER NOT NULL,
+                     status TEXT NOT NULL DEFAULT 'pending',
+                     worker TEXT,
+                     lease_until REAL,
+                     attempts INTEGER NOT NULL DEFAULT 0,
+                     error TEXT,
+                     result BLOB);
+                 CREATE INDEX IF NOT EXISTS jobs_status
+                     ON jobs (status, lease_until);
+                 CREATE INDEX IF NOT EXISTS jobs_coin
+                     ON jobs (coin_file, seq);'''
+
+    def __init__(self, db_path, max_attempts=5, clock=time.time):
+        """Constructor of JobQueue class.
+
+        Args:
+            db_path (str): path of SQLite database file
+            max_attempts (int): leases of a job before it is marked failed
+                                (Default to 5)
+            clock (callable): wall clock shared by machines
+                              (Default to time.time)
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.__clock = clock
+        db = sqlite3.connect(db_path, timeout=60)
+        try:
+            db.executescript(self.schema)
+        finally:
+            db.close()
+
+    @contextmanager
+    def __transaction(self):
+        """Opens a connection holding the write lock of database.
+
+        Yields:
+            (obj): sqlite3 connection
+        """
+        db = sqlite3.connect(self.db_path, timeout=60,
+                             isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            yield db
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        finally:
+            db.close()
+
+    def enqueue(self, exchange, coin_file, blocks):
+        """Adds time block jobs of a coin download.
+
+        Args:
+            exchange (str): name of exchange
+            coin_file (str): file name of coin
+            blocks (list): [start, end] epoch seconds of each time block
+
+        Returns:
+            int: number of jobs added
+        """
+        with self.__transaction() as db:
+            row = db.execute('SELECT MAX(seq) FROM jobs WHERE coin_file = ?',
+                             (coin_file,)).fetchone()
+            first = row[0] + 1 if row[0] is not None else 0
+            db.executemany(
+                'INSERT INTO jobs (exchange, coin_file, seq, start_time, '
+                'end_time) VALUES (?, ?, ?, ?, ?)',
+                [(exchange, coin_file, first + i, start, end)
+                 for i, (start, end) in enumerate(blocks)])
+        return len(blocks)
+
+    def lease(self, worker, lease_seconds=120):
+        """Leases the next available job to a worker.
+
+        Args:
+            worker (str): id of worker
+            lease_seconds (float): duration of lease (Default to 120)
+
+        Returns:
+            (dict): leased job or None if no job is available
+        """
+        now = self.__clock()
+        with self.__transaction() as db:
+            db.execute("UPDATE jobs SET status = 'failed', worker = NULL, "
+                       "error = 'lease expired' WHERE status = 'leased' "
+                       "AND lease_until < ? AND attempts >= ?",
+                       (now, self.max_attempts))
+            job = db.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' OR "
+                "(status = 'leased' AND lease_until < ?) "
+                "ORDER BY coin_file, seq LIMIT 1", (now,)).fetchone()
+            if job is None:
+                return None
+            db.execute("UPDATE jobs SET status = 'leased', worker = ?, "
+                       "lease_until = ?, attempts = attempts + 1 "
+                       "WHERE id = ?",
+                       (worker, now + lease_seconds, job['id']))
+        job = dict(job)
+        job.pop('result')
+        job['attempts'] += 1
+        return job
+
+    def heartbeat(self, job_id, worker, lease_seconds=120):
+        """Extends the lease of a job.
+
+        Args:
+            job_id (int): id of job
+            worker (str): id of worker holding the lease
+            lease_seconds (float): new duration of lease (Default to 120)
+
+        Returns:
+            bool: False if worker does not hold the lease anymore
+        """
+        with self.__transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND "
+                "worker = ? AND status = 'leased'",
+                (self.__clock() + lease_seconds, job_id, worker))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker, result):
+        """Stores downloaded candles of a leased job.
+
+        Args:
+            job_id (int): id of job
+            worker (str): id of worker holding the lease
+            result (bytes): serialized candles of job
+
+        Returns:
+            bool: False if worker does not hold the lease anymore
+        """
+        with self.__transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, "
+                "lease_until = NULL, error = NULL WHERE id = ? AND "
+                "worker = ? AND status = 'leased'",
+                (sqlite3.Binary(result), job_id, worker))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        """Releases a leased job after an error to be retried.
+
+        Args:
+            job_id (int): id of job
+            worker (str): id of worker holding the lease
+            error (str): error message
+        """
+        with self.__transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? "
+                "THEN 'failed' ELSE 'pending' END, worker = NULL, "
+                "lease_until = NULL, error = ? WHERE id = ? AND "
+                "worker = ? AND status = 'leased'",
+                (self.max_attempts, str(error), job_id, worker))
+
+    def merge(self, coin_file, writer):
+        """Writes finished jobs of a coin which are next in time order.
+
+        Jobs are handed over to writer only if all previous jobs of coin
+        are already merged, so the coin file stays in time order. Database
+        is locked while writing, so only one worker merges at a time.
+
+        Writer must leave coin file unchanged if it raises. It may return
+        a function undoing its write, which is called if merged jobs can
+        not be recorded, so the same jobs are never written twice.
+
+        Args:
+            coin_file (str): file name of coin
+            writer (callable): function taking exchange name, coin file
+                               and the list of results in time order
+
+        Returns:
+            int: number of merged jobs
+        """
+        undo = None
+        try:
+            with self.__transaction() as db:
+                jobs = db.execute(
+                    "SELECT id, exchange, status, result FROM jobs "
+                    "WHERE coin_file = ? AND status != 'merged' "
+                    "ORDER BY seq", (coin_file,)).fetchall()
+                ready = []
+                for job in jobs:
+                    if job['status'] != 'done':
+                        break
+                    ready.append(job)
+                if not ready:
+                    return 0
+                undo = writer(ready[0]['exchange'], coin_file,
+                              [bytes(job['result']) for job in ready])
+                db.executemany(
+                    "UPDATE jobs SET status = 'merged', result = NULL "
+                    "WHERE id = ?", [(job['id'],) for job in ready])
+        except BaseException:
+            if undo is not None:
+                undo()
+            raise
+        return len(ready)
+
+    def requeue(self, coin_file=None):
+        """Makes failed jobs pending again with new attempts.
+
+        Args:
+            coin_file (str): file name of coin
+                             (Default to None, failed jobs of all coins)
+
+        Returns:
+            int: number of requeued jobs
+        """
+        with self.__transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, "
+                "worker = NULL, lease_until = NULL, error = NULL "
+                "WHERE status = 'failed' AND coin_file = "
+                "COALESCE(?, coin_file)", (coin_file,))
+        return cursor.rowcount
+
+    def stalled(self):
+        """Provides coins whose merge waits for a failed job.
+
+        Returns:
+            dict: coin file names and numbers of finished jobs waiting
+                  behind their first failed job
+        """
+        with self.__transaction() as db:
+            rows = db.execute(
+                "SELECT coin_file, (SELECT COUNT(*) FROM jobs AS done "
+                "WHERE done.coin_file = failed.coin_file AND "
+                "done.status = 'done') FROM jobs AS failed "
+                "WHERE status = 'failed' AND NOT EXISTS (SELECT 1 FROM "
+                "jobs AS previous WHERE previous.coin_file = "
+                "failed.coin_file AND previous.seq < failed.seq AND "
+                "previous.status != 'merged')").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def coin_files(self, status='done'):
+        """Provides coin files having jobs of a given status.
+
+        Args:
+            status (str): job status (Default to 'done')
+
+        Returns:
+            list: coin file names
+        """
+        with self.__transaction() as db:
+            rows = db.execute('SELECT DISTINCT coin_file FROM jobs '
+                              'WHERE status = ?', (status,)).fetchall()
+        return [row[0] for row in rows]
+
+    def unmerged_coins(self):
+        """Provides coins having jobs which are not merged yet.
+
+        Returns:
+            list: (exchange, coin file name) of each coin
+        """
+        with self.__transaction() as db:
+            rows = db.execute("SELECT DISTINCT exchange, coin_file FROM jobs "
+                              "WHERE status != 'merged' "
+                              "ORDER BY coin_file").fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def counts(self):
+        """Provides number of jobs in each status.
+
+        Returns:
+            dict: job statuses and counts
+        """
+        with self.__transaction() as db:
+            rows = db.execute('SELECT status, COUNT(*) FROM jobs '
+                              'GROUP BY status').fetchall()
+        return {row[0]: row[1] for row in rows}
@@ -0,0 +1,233 @@
+"""Provides a pipeline of worker stages joined by bounded queues.
+
+    List of classes:
+        Pipeline
+    """
+import heapq
+import queue
+import threading
+
+from application.classes.cancel_cls import CancelToken
+
+
+class Pipeline:
+    """Runs items through stages of worker threads in parallel.
+
+    Each stage hands its results to the next one through a queue holding
+    at most 'capacity' results, so a stage falling behind blocks the
+    stages before it instead of piling up results in memory. Results of
+    the last stage are given to the caller in item order, and at most
+    'window' items are in the pipeline until the caller took them, so a
+    slow caller (e.g. writing to disk) holds back the first stage too.
+
+    The first stage is called with an item and the number of its failed
+    attempts, other stages with the result of the previous stage. All of
+    them get the cancel token of the run as last argument, which is
+    cancelled when the run ends early. An item failed by one of
+    'retry_errors' goes through the stages again until it failed
+    'max_attempts' times.
+
+    Attr:
+        stages (list): (name, function, number of workers) of stages
+        window (int): maximum items in pipeline
+        capacity (int): maximum results waiting between two stages
+    """
+
+    def __init__(self, stages, window=8, capacity=2, retry_errors=(),
+                 max_attempts=1, on_retry=None):
+        """Constructor of Pipeline class.
+
+        Args:
+            stages (list): (name, function, number of workers) of stages
+            window (int): maximum items in pipeline (Default to 8)
+            capacity (int): maximum results waiting between two stages
+                            (Default to 2)
+            retry_errors (tuple): exceptions retried (Default to ())
+            max_attempts (int): attempts of an item (Default to 1)
+            on_retry (callable): called with item index, failed attempts
+                                 and error before a retry (Default to None)
+        """
+        self.stages = stages
+        self.window = window
+        self.capacity = capacity
+        self.retry_errors = retry_errors
+        self.max_attempts = max_attempts
+        self.__on_retry = on_retry
+        self.__busy = [0] * len(stages)
+        self.__pending = []
+        self.__queues = []
+        self.__writing = 0
+        self.__in_flight = 0
+        self.__lock = threading.Lock()
+
+    def occupancy(self):
+        """Provides how busy stages of pipeline are.
+
+        Returns:
+            dict: 'busy' workers and 'workers' of each stage by name,
+                  'queued' results waiting for it, and items 'in_flight'
+        """
+        with self.__lock:
+            queued = [len(self.__pending)] + \
+                [source.qsize() for source in self.__queues[:-1]]
+            stats = {name: {'busy': self.__busy[i], 'workers': workers,
+                            'queued': queued[i] if i < len(queued) else 0}
+                     for i, (name, _, workers) in enumerate(self.stages)}
+            stats['write'] = {'busy': self.__writing, 'workers': 1,
+                              'queued': self.__queues[-1].qsize()
+                              if self.__queues else 0}
+            stats['in_flight'] = self.__in_flight
+        return stats
+
+    def run(self, items, token=None):
+        """Runs items through the stages.
+
+        Args:
+            items (list): items given to the first stage
+            token (obj): cancel token (Default to None)
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+            Exception: error of an item which can not be retried
+
+        Yields:
+            (int, obj): index of item and result of the last stage,
+                        in item order
+        """
+        # stops workers if the run ends before all items are done
+        run_token = CancelToken()
+        unregister = token.on_cancel(run_token.cancel) \
+            if token is not None else None
+        pending = self.__pending = []  # heap of (index, attempts)
+        pending_ready = threading.Condition()
+        slots = threading.Semaphore(self.window)
+        failure = []
+        self.__queues = [queue.Queue(self.capacity)
+                         for _ in self.stages[1:]] + [queue.Queue()]
+        threads = []
+
+        def fail(err):
+            failure.append(err)
+            run_token.cancel()
+
+        def feed():
+            for index in range(len(items)):
+                while not slots.acquire(timeout=0.1):
+                    if run_token.cancelled:
+                        return
+                with self.__lock:
+                    self.__in_flight += 1
+                with pending_ready:
+                    heapq.heappush(pending, (index, 0))
+                    pending_ready.notify()
+
+        def next_pending():
+            with pending_ready:
+                while not pending:
+                    pending_ready.wait(0.1)
+                    run_token.raise_if_cancelled()
+                return heapq.heappop(pending)
+
+        def work(stage):
+            _, fn, _ = self.stages[stage]
+            source = self.__queues[stage - 1] if stage else None
+            target = self.__queues[stage]
+            try:
+                while True:
+                    if stage:
+                        job = self.__get(source, run_token)
+                        index, attempts, value = job
+                    else:
+                        index, attempts = next_pending()
+                        value = items[index]
+                    with self.__lock:
+                        self.__busy[stage] += 1
+                    try:
+                        result = fn(value, attempts, run_token) \
+                            if not stage else fn(value, run_token)
+                    except self.retry_errors as err:
+                        if attempts + 1 >= self.max_attempts:
+                            raise
+                        if self.__on_retry is not None:
+                            self.__on_retry(index, attempts + 1, err)
+                        with pending_ready:
+                            heapq.heappush(pending, (index, attempts + 1))
+                            pending_ready.notify()
+                        continue
+                    finally:
+                        with self.__lock:
+                            self.__busy[stage] -= 1
+                    self.__put(target, (index, attempts, result), run_token)
+            except BaseException as err:
+                if not run_token.cancelled:
+                    fail(err)
+
+        threads.append(threading.Thread(target=feed, daemon=True))
+        for stage, (_, _, workers) in enumerate(self.stages):
+            threads += [threading.Thread(target=work, args=(stage,),
+                                         daemon=True)
+                        for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        done = {}
+        try:
+            for index in range(len(items)):
+                while index not in done:
+                    try:
+                        job = self.__get(self.__queues[-1], run_token)
+                    except BaseException:
+                        if failure:
+                            raise failure[0]
+                        raise
+                    done[job[0]] = job[2]
+                with self.__lock:
+                    self.__writing = 1
+                yield index, done.pop(index)
+                with self.__lock:
+                    self.__writing = 0
+                    self.__in_flight -= 1
+                slots.release()
+        finally:
+            run_token.cancel()
+            for thread in threads:
+                thread.join()
+            if unregister is not None:
+                unregister()
+
+    @staticmethod
+    def __get(source, token):
+        """Takes a result from a queue unless token is cancelled.
+
+        Args:
+            source (obj): queue to take from
+            token (obj): cancel token
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+
+        Returns:
+            (obj): taken result
+        """
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                token.raise_if_cancelled()
+
+    @staticmethod
+    def __put(target, job, token):
+        """Puts a result into a queue, waiting while it is full.
+
+        Args:
+            target (obj): queue to put into
+            job (obj): result to put
+            token (obj): cancel token
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+        """
+        while True:
+            try:
+                return target.put(job, timeout=0.1)
+            except queue.Full:
+                token.raise_if_cancelled()
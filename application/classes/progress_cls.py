@@ -0,0 +1,89 @@
+"""Provides a class for coalescing download progress events.
+
+    List of classes:
+        ProgressReporter
+    """
+import threading
+import time
+
+
+class ProgressReporter:
+    """Collects progress of a download and posts it in limited rate.
+
+    Workers call update() as often as they like. Progress is posted to
+    the GUI at most once per 'interval' seconds, so fast downloads do
+    not flood the event queue of the window.
+    """
+
+    def __init__(self, post, total, interval=0.25, clock=time.monotonic,
+                 stages=None):
+        """Constructor of ProgressReporter class.
+
+        Args:
+            post (callable): function posting progress info to GUI
+            total (int): total number of parts to download
+            interval (float): minimum seconds between two posts
+                              (Default to 0.25)
+            clock (callable): monotonic clock (Default to time.monotonic)
+            stages (callable): function providing occupancy of download
+                               stages, posted with progress
+                               (Default to None)
+
+        Attr:
+            parts (int): number of finished parts
+            rows (int): number of saved rows
+        """
+        self.total = total
+        self.interval = interval
+        self.parts = 0
+        self.rows = 0
+        self.__post = post
+        self.__clock = clock
+        self.__stages = stages
+        self.__started = clock()
+        self.__last_post = None
+        self.__lock = threading.Lock()
+
+    @property
+    def info(self):
+        """Current progress of download.
+
+        Returns:
+            dict: finished parts, total parts, saved rows, saved rows per
+                  second and occupancy of stages if it is provided
+        """
+        elapsed = self.__clock() - self.__started
+        info = {'part': self.parts,
+                'total': self.total,
+                'rows': self.rows,
+                'rows_per_sec': self.rows / elapsed if elapsed > 0 else 0}
+        if self.__stages is not None:
+            info['stages'] = self.__stages()
+        return info
+
+    def update(self, parts=1, rows=0):
+        """Adds finished parts and posts progress if it is time to.
+
+        Args:
+            parts (int): number of newly finished parts (Default to 1)
+            rows (int): number of newly saved rows (Default to 0)
+        """
+        with self.__lock:
+            self.parts += parts
+            self.rows += rows
+            now = self.__clock()
+            if (self.__last_post is not None and
+                    now - self.__last_post < self.interval and
+                    self.parts < self.total):
+                return
+            self.__last_post = now
+            info = self.info
+        self.__post(info)
+
+    def flush(self):
+        """Posts current progress immediately.
+        """
+        with self.__lock:
+            self.__last_post = self.__clock()
+            info = self.info
+        self.__post(info)
@@ -0,0 +1,122 @@
+"""Provides a registry of exchange plugins.
+
+    List of classes:
+        ExchangeRegistry
+    """
+import importlib
+
+from application.classes.exchange_base_cls import Exchange
+
+# Entry point group third-party packages use to provide exchanges
+ENTRY_POINT_GROUP = 'cryptoasset_data_downloader.exchanges'
+
+# Exchanges shipped with application as 'module:class' references
+BUILTIN_EXCHANGES = {
+    'Bitpanda': 'application.classes.exchange_classes:Bitpanda',
+    'Exmo': 'application.classes.exchange_classes:Exmo',
+    'CoinbasePro': 'application.classes.exchange_classes:Coinbasepro',
+    'Bitfinex': 'application.classes.exchange_classes:Bitfinex',
+    'Kraken': 'application.classes.exchange_classes:Kraken'}
+
+
+def find_entry_points(group):
+    """Finds entry points of installed packages without importing them.
+
+    Args:
+        group (str): entry point group
+
+    Returns:
+        (dict): entry point names and entry point objects
+    """
+    try:
+        from importlib import metadata
+    except ImportError:  # Python < 3.8
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            return {}
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        found = entry_points.select(group=group)
+    else:
+        found = entry_points.get(group, [])
+    return {ep.name: ep for ep in found}
+
+
+class ExchangeRegistry:
+    """Keeps exchange declarations and creates exchanges on demand.
+
+    An exchange is declared by its name and a 'module:class' reference
+    (or an entry point). Its module is imported and the exchange object
+    is created only when it is requested for the first time.
+    """
+
+    def __init__(self, group=ENTRY_POINT_GROUP):
+        """Constructor of ExchangeRegistry class.
+
+        Args:
+            group (str): entry point group of exchange plugins
+                         (Default to ENTRY_POINT_GROUP)
+
+        Attr:
+            __declarations (dict): exchange names and their references
+            __exchanges (dict): already created exchange objects
+        """
+        self.__declarations = dict(BUILTIN_EXCHANGES)
+        for name, entry_point in find_entry_points(group).items():
+            self.__declarations.setdefault(name, entry_point)
+        self.__exchanges = {}
+
+    @property
+    def names(self):
+        """Names of declared exchanges.
+
+        Returns:
+            list: exchange names in declaration order
+        """
+        return list(self.__declarations)
+
+    def register(self, name, reference):
+        """Declares an exchange.
+
+        Args:
+            name (str): name of exchange
+            reference (str): 'module:class' reference of exchange class
+        """
+        self.__declarations[name] = reference
+        self.__exchanges.pop(name, None)
+
+    def get(self, name):
+        """Provides exchange object, creating it at first request.
+
+        Args:
+            name (str): name of exchange
+
+        Raises:
+            KeyError: occurs if exchange is not declared
+            TypeError: occurs if reference is not an Exchange class
+
+        Returns:
+            (obj): exchange object
+        """
+        if name not in self.__exchanges:
+            cls = self.__load(self.__declarations[name])
+            if not (isinstance(cls, type) and issubclass(cls, Exchange)):
+                raise TypeError(f'{name} is not an Exchange class!')
+            self.__exchanges[name] = cls()
+        return self.__exchanges[name]
+
+    @staticmethod
+    def __load(reference):
+        """Imports exchange class of a reference.
+
+        Args:
+            reference (obj): 'module:class' string or entry point
+
+        Returns:
+            (obj): referenced class
+        """
+        if not isinstance(reference, str):
+            return reference.load()
+        module_name, cls_name = reference.split(':')
+        return getattr(importlib.import_module(module_name), cls_name)
@@ -0,0 +1,297 @@
+"""Provides a local HTTP server reading stored candles.
+
+    List of classes:
+        SeriesServer
+        SeriesRequestHandler
+    """
+import heapq
+import itertools
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+import application.filemodel_func as backend
+from application.classes.index_cls import SeriesIndex
+
+COLUMNS = ['Time', 'HighPrice', 'LowPrice',
+           'OpenPrice', 'ClosePrice', 'Volume']
+
+
+def normalize_time(value):
+    """Converts a query time into the time format of coin files.
+
+    Args:
+        value (str): epoch seconds, 'YYYY-MM-DD' or
+                     'YYYY-MM-DD HH:mm:ss' (a 'T' separator is allowed)
+
+    Raises:
+        ValueError: occurs if time is in an unknown format
+
+    Returns:
+        (str): time as 'YYYY-MM-DD HH:mm:ss'
+    """
+    value = value.strip().replace('T', ' ').rstrip('Z')
+    if value.isdigit():
+        time = datetime.fromtimestamp(int(value), timezone.utc)
+    elif len(value) == 10:
+        time = datetime.strptime(value, '%Y-%m-%d')
+    else:
+        time = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class SeriesServer(ThreadingMixIn, HTTPServer):
+    """Serves range queries over coin files of a save folder.
+
+    Each request runs in its own thread. Sparse indexes of coin files are
+    shared by all requests, so reads seek close to the requested range
+    instead of scanning whole files.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, save_path):
+        """Constructor of SeriesServer class.
+
+        Args:
+            address (tuple): host and port to listen
+            save_path (str): main save path in OS
+        """
+        super().__init__(address, SeriesRequestHandler)
+        self.save_path = save_path
+        self.__indexes = {}
+        self.__lock = threading.Lock()
+
+    def index(self, file_path):
+        """Provides the index of a coin file.
+
+        Args:
+            file_path (str): path of coin file
+
+        Returns:
+            (obj): series index of coin file
+        """
+        with self.__lock:
+            if file_path not in self.__indexes:
+                self.__indexes[file_path] = SeriesIndex(
+                    file_path, backend.sidecar_path(file_path, '.idx'))
+            return self.__indexes[file_path]
+
+    def coin_files(self, exchange=None):
+        """Provides coin files of the save folder.
+
+        Args:
+            exchange (str): exchange folder to list
+                            (Default to all exchange folders)
+
+        Raises:
+            ValueError: occurs if exchange is not a folder name of the
+                        save folder
+
+        Returns:
+            list: file name parts and path of each coin file
+        """
+        if exchange:
+            # paths and hidden folders would escape the exchange folders
+            if (os.path.basename(exchange) != exchange or
+                    exchange.startswith('.') or
+                    not os.path.isdir(os.path.join(self.save_path,
+                                                   exchange))):
+                raise ValueError(f'Unknown exchange {exchange}')
+            exc_names = [exchange]
+        else:
+            exc_names = sorted(os.listdir(self.save_path))
+        files = []
+        for exc_name in exc_names:
+            exc_path = os.path.join(self.save_path, exc_name)
+            if not os.path.isdir(exc_path):
+                continue
+            for file_name in sorted(os.listdir(exc_path)):
+                try:
+                    info = backend.parse_coin_file_name(file_name)
+                except ValueError:
+                    continue
+                info['Path'] = os.path.join(exc_path, file_name)
+                files.append(info)
+        return files
+
+
+class SeriesRequestHandler(BaseHTTPRequestHandler):
+    """Handles requests of SeriesServer.
+
+    Endpoints:
+        /coins?exchange=: lists stored coin files
+        /series?exchange=&quote=&base=&frequency=&start=&end=
+               &columns=&format=: streams candles of a trade pair in
+                                  'csv' (default) or 'ndjson' format
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        """Routes GET requests to endpoints.
+        """
+        url = urlparse(self.path)
+        query = {key: values[-1]
+                 for key, values in parse_qs(url.query).items()}
+        self.__headers_sent = False
+        try:
+            if url.path == '/coins':
+                self.__send_coins(query)
+            elif url.path == '/series':
+                self.__send_series(query)
+            else:
+                self.__send_error(404, f'Unknown endpoint {url.path}')
+        except KeyError as err:
+            self.__send_error(400, f'Missing query parameter {err}')
+        except ValueError as err:
+            self.__send_error(400, str(err))
+        except FileNotFoundError as err:
+            self.__send_error(404, str(err))
+        except OSError as err:
+            self.__send_error(500, str(err))
+
+    def __send_error(self, status, msg):
+        """Sends an error response.
+
+        If headers of a response were already sent, the error is only
+        logged and the connection is closed, so clients see an incomplete
+        response instead of an error body inside it.
+
+        Args:
+            status (int): HTTP status code
+            msg (str): error message
+        """
+        if self.__headers_sent:
+            self.log_error('Response interrupted: %s', msg)
+            self.close_connection = True
+            return
+        body = json.dumps({'error': msg}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def __send_coins(self, query):
+        """Sends list of stored coin files.
+
+        Args:
+            query (dict): query parameters
+        """
+        files = self.server.coin_files(query.get('exchange'))
+        for info in files:
+            info.pop('Path')
+        body = json.dumps(files).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def __send_series(self, query):
+        """Streams candles of a trade pair in a time range.
+
+        If several coin files store the pair (e.g. with different start
+        dates), their rows are merged in time order. Like reading a coin
+        file, the latest written row of a time is kept.
+
+        Args:
+            query (dict): query parameters
+        """
+        start = normalize_time(query['start']) if 'start' in query else None
+        end = normalize_time(query['end']) if 'end' in query else None
+        columns = query.get('columns', ','.join(COLUMNS)).split(',')
+        positions = [COLUMNS.index(col) for col in columns]
+        out_format = query.get('format', 'csv')
+        if out_format not in ('csv', 'ndjson'):
+            raise ValueError(f'Unknown format {out_format}')
+        files = [info['Path'] for info in
+                 self.server.coin_files(query['exchange'])
+                 if info['Quote'].upper() == query['quote'].upper() and
+                 info['Base'].upper() == query['base'].upper() and
+                 info['Frequency'] == query['frequency']]
+        if not files:
+            raise FileNotFoundError('No coin file found for the pair')
+
+        streams = []
+        for path in files:
+            # first row is read before headers are sent, so file errors
+            # are still answered with an error status
+            stream = self.server.index(path).read_range(start, end)
+            first = next(stream, None)
+            if first is not None:
+                streams.append(itertools.chain([first], stream))
+        rows = heapq.merge(*streams, key=lambda row: row.split(';', 1)[0])
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv' if out_format == 'csv'
+                         else 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.__headers_sent = True
+        buffer = []
+        if out_format == 'csv':
+            buffer.append(';'.join(columns) + '\n')
+        for values in self.__latest_rows(rows):
+            values = [values[i] for i in positions]
+            if out_format == 'csv':
+                buffer.append(';'.join(values) + '\n')
+            else:
+                buffer.append(json.dumps(dict(zip(
+                    columns, [self.__number(value, col)
+                              for value, col in zip(values, columns)])))
+                    + '\n')
+            if len(buffer) >= 1000:
+                self.__write_chunk(''.join(buffer))
+                buffer = []
+        if buffer:
+            self.__write_chunk(''.join(buffer))
+        self.wfile.write(b'0\r\n\r\n')
+
+    @staticmethod
+    def __latest_rows(rows):
+        """Drops rows repeating a time, keeping the last one.
+
+        Args:
+            rows (iter): candle rows in time order
+
+        Yields:
+            (list): values of the latest row of each time
+        """
+        last = None
+        for row in rows:
+            values = row.split(';')
+            if last is not None and values[0] != last[0]:
+                yield last
+            last = values
+        if last is not None:
+            yield last
+
+    @staticmethod
+    def __number(value, column):
+        """Converts a stored value for JSON output.
+
+        Args:
+            value (str): stored value
+            column (str): column name of value
+
+        Returns:
+            (obj): time string, float or None for missing values
+        """
+        if column == 'Time':
+            return value
+        return None if value == '-' else float(value)
+
+    def __write_chunk(self, text):
+        """Writes a chunk of a chunked response.
+
+        Args:
+            text (str): chunk content
+        """
+        data = text.encode()
+        self.wfile.write(b'%X\r\n%s\r\n' % (len(data), data))
@@ -0,0 +1,337 @@
+"""Provides a resilient HTTP session for exchange API calls.
+
+    List of classes:
+        CircuitOpenError
+        CircuitBreaker
+        ApiResponse
+        ApiSession
+    """
+import random
+import threading
+import time
+
+import requests
+
+from application.classes.cancel_cls import CancelToken
+from application.classes.throttle_cls import AdaptiveLimiter
+from application.decode_func import loads
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when requests are refused by an open circuit breaker.
+
+    Attr:
+        retry_after (float): seconds until breaker allows a trial request
+    """
+
+    def __init__(self, msg, retry_after):
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Stops calling an exchange after consecutive failures.
+
+    Breaker opens after 'threshold' failures in a row and refuses calls
+    for 'reset_timeout' seconds. Then a trial call is let through and
+    its result closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold=5, reset_timeout=60, clock=time.monotonic):
+        """Constructor of CircuitBreaker class.
+
+        Args:
+            threshold (int): consecutive failures to open breaker
+                             (Default to 5)
+            reset_timeout (float): seconds breaker stays open
+                                   (Default to 60)
+            clock (callable): monotonic clock (Default to time.monotonic)
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.__failures = 0
+        self.__opened_at = None
+        self.__clock = clock
+        self.__lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """State of breaker.
+
+        Returns:
+            bool: True if calls are currently refused
+        """
+        return self.retry_after() > 0
+
+    def retry_after(self):
+        """Provides remaining seconds until breaker lets a call through.
+
+        Returns:
+            float: 0 if calls are allowed
+        """
+        with self.__lock:
+            if self.__opened_at is None:
+                return 0
+            elapsed = self.__clock() - self.__opened_at
+            return max(0, self.reset_timeout - elapsed)
+
+    def record_success(self):
+        """Closes breaker after a successful call.
+        """
+        with self.__lock:
+            self.__failures = 0
+            self.__opened_at = None
+
+    def record_failure(self):
+        """Counts a failed call and opens breaker if threshold is reached.
+        """
+        with self.__lock:
+            self.__failures += 1
+            if self.__failures >= self.threshold:
+                self.__opened_at = self.__clock()
+
+
+class ApiResponse:
+    """Response of an API call with its whole body read.
+
+    Attr:
+        status_code (int): HTTP status code
+        headers (obj): case-insensitive dict of response headers
+        url (str): final url of request
+        content (bytes): decompressed response body
+    """
+
+    def __init__(self, response, content):
+        """Constructor of ApiResponse class.
+
+        Args:
+            response (obj): requests response the body is read from
+            content (bytes): response body
+        """
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = response.url
+        self.content = content
+        self.__encoding = response.encoding
+
+    @property
+    def text(self):
+        """Response body as text.
+
+        Returns:
+            str: decoded body
+        """
+        return self.content.decode(self.__encoding or 'utf-8', 'replace')
+
+    def json(self):
+        """Decodes JSON response body.
+
+        Raises:
+            ValueError: occurs if body is not valid JSON
+
+        Returns:
+            (obj): decoded lists, dicts and values
+        """
+        return loads(self.content)
+
+
+class ApiSession:
+    """Wraps requests with timeouts, retries, pacing and circuit breaking.
+
+    Connection errors, timeouts and responses with a status code in
+    'retry_statuses' are retried with exponential backoff and full
+    jitter. 'Retry-After' headers of exchanges are respected.
+
+    Failed attempts and responses with a status code in 'ban_statuses'
+    count as failures of the circuit breaker. Other client errors (e.g.
+    400 of an unknown pair) reject a request, not the exchange, so they
+    are returned without counting as a failure or a success.
+
+    Requests in flight are limited by an adaptive limiter, which is cut
+    when responses have a status code in 'throttle_statuses'. Compressed
+    responses are always asked for.
+
+    Attr:
+        name (str): name of exchange using the session
+        breaker (obj): circuit breaker of exchange
+        limiter (obj): adaptive limit of requests in flight
+        bucket (obj): request budget shared with other processes
+                      (Default to None, paced by 'min_interval' only)
+    """
+
+    retry_statuses = (429, 500, 502, 503, 504)
+    throttle_statuses = (418, 429, 503)
+    ban_statuses = (403, 418)
+
+    def __init__(self, name, timeout=(5, 30), retries=4, backoff=1,
+                 max_backoff=60, min_interval=0, breaker=None,
+                 limiter=None, transport=None):
+        """Constructor of ApiSession class.
+
+        Args:
+            name (str): name of exchange
+            timeout (tuple): connect and read timeouts in seconds
+                             (Default to (5, 30))
+            retries (int): retries after a failed attempt (Default to 4)
+            backoff (float): base backoff delay in seconds (Default to 1)
+            max_backoff (float): maximum backoff delay (Default to 60)
+            min_interval (float): minimum seconds between requests
+                                  (Default to 0)
+            breaker (obj): circuit breaker (Default to CircuitBreaker())
+            limiter (obj): limit of requests in flight
+                           (Default to AdaptiveLimiter())
+            transport (obj): requests session sending requests
+                             (Default to requests.Session())
+        """
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.min_interval = min_interval
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.limiter = limiter if limiter is not None else AdaptiveLimiter()
+        self.bucket = None
+        self.__session = transport if transport is not None \
+            else requests.Session()
+        # responses are decompressed while their body is read
+        self.__session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.__last_request = 0
+        self.__lock = threading.Lock()
+
+    def __pace(self, token):
+        """Waits until 'min_interval' passed since the previous request.
+
+        Each request reserves its send time under the lock and waits
+        outside it, so requests of several threads are spaced by
+        'min_interval' without waiting for each other's pacing.
+
+        If the session has a shared bucket, waits for a token of the
+        bucket instead, so other processes are taken into account.
+
+        Args:
+            token (obj): cancel token of download
+        """
+        if self.bucket is not None:
+            self.bucket.take(token)
+            return
+        with self.__lock:
+            now = time.monotonic()
+            send_at = max(now, self.__last_request + self.min_interval)
+            self.__last_request = send_at
+        token.sleep(send_at - now)
+
+    def __delay(self, attempt, response=None):
+        """Provides waiting time before the next attempt.
+
+        Args:
+            attempt (int): number of failed attempts so far
+            response (obj): failed response if there is any
+
+        Returns:
+            float: seconds to wait
+        """
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        cap = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    def get(self, url, params=None, headers=None, token=None):
+        """Sends a GET request with retries.
+
+        Waits of pacing and backoff end as soon as the token is cancelled.
+        Response body is read in chunks and the connection is closed when
+        the token is cancelled, so a cancel takes effect at the latest
+        after the read timeout.
+
+        Args:
+            url (str): request url
+            params (dict): query parameters (Default to None)
+            headers (dict): request headers (Default to None)
+            token (obj): cancel token of download (Default to None)
+
+        Raises:
+            CircuitOpenError: occurs if breaker of exchange is open
+            ConnectionError: occurs if all attempts failed to connect
+            DownloadCancelled: occurs if token is cancelled
+
+        Returns:
+            (obj): ApiResponse of the last attempt
+        """
+        token = token if token is not None else CancelToken()
+        for attempt in range(self.retries + 1):
+            retry_after = self.breaker.retry_after()
+            if retry_after:
+                raise CircuitOpenError(
+                    f'API of {self.name.upper()} is failing, requests '
+                    f'are paused for {retry_after:.0f} seconds.',
+                    retry_after)
+            self.limiter.acquire(token)
+            try:
+                self.__pace(token)
+                started = time.monotonic()
+                response = self.__fetch(url, params, headers, token)
+            except (requests.ConnectionError, requests.Timeout) as err:
+                self.limiter.release(throttled=not token.cancelled)
+                token.raise_if_cancelled()
+                self.breaker.record_failure()
+                if attempt == self.retries:
+                    raise ConnectionError(
+                        f'Problem occurred while connecting to API of '
+                        f'{self.name.upper()}:\n\n{err}') from err
+                token.sleep(self.__delay(attempt))
+                continue
+            except BaseException:
+                self.limiter.release()
+                raise
+            self.limiter.release(
+                time.monotonic() - started,
+                throttled=response.status_code in self.throttle_statuses)
+            status = response.status_code
+            if status in self.ban_statuses:
+                self.breaker.record_failure()
+                return response
+            if status not in self.retry_statuses:
+                if status < 400:
+                    self.breaker.record_success()
+                return response
+            self.breaker.record_failure()
+            if attempt == self.retries:
+                return response
+            token.sleep(self.__delay(attempt, response))
+
+    def __fetch(self, url, params, headers, token):
+        """Sends one request and reads its body unless cancelled.
+
+        Args:
+            url (str): request url
+            params (dict): query parameters
+            headers (dict): request headers
+            token (obj): cancel token of download
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+
+        Returns:
+            (obj): ApiResponse with its body read
+        """
+        token.raise_if_cancelled()
+        response = self.__session.get(url, params=params, headers=headers,
+                                      timeout=self.timeout, stream=True)
+        unregister = token.on_cancel(response.close)
+        try:
+            chunks = []
+            for chunk in response.iter_content(chunk_size=65536):
+                token.raise_if_cancelled()
+                chunks.append(chunk)
+            token.raise_if_cancelled()
+        except Exception:
+            # reading fails when connection is closed by cancellation
+            token.raise_if_cancelled()
+            raise
+        finally:
+            unregister()
+            response.close()
+        return ApiResponse(response, b''.join(chunks))
@@ -0,0 +1,143 @@
+"""Provides an adaptive limit of concurrent requests.
+
+    List of classes:
+        AdaptiveLimiter
+    """
+import threading
+import time
+
+
+class AdaptiveLimiter:
+    """Limits requests in flight to an exchange by AIMD feedback.
+
+    The limit grows additively by about one request per round trip while
+    responses are healthy and is cut multiplicatively when the exchange
+    throttles (e.g. 429 responses, bans, timeouts) or latency rises far
+    above its usual level. At most one cut is made per round trip, since
+    requests in flight at that moment see the same congestion.
+
+    Attr:
+        minimum (int): lowest limit
+        maximum (int): highest limit
+        decrease (float): factor of limit cuts
+        latency_factor (float): latency above this multiple of usual
+                                latency counts as congestion
+        cuts (int): number of limit cuts so far
+    """
+
+    def __init__(self, limit=1, minimum=1, maximum=8, decrease=0.5,
+                 latency_factor=3, clock=time.monotonic):
+        """Constructor of AdaptiveLimiter class.
+
+        Args:
+            limit (float): initial limit (Default to 1)
+            minimum (int): lowest limit (Default to 1)
+            maximum (int): highest limit (Default to 8)
+            decrease (float): factor of limit cuts (Default to 0.5)
+            latency_factor (float): latency multiple taken as congestion
+                                    (Default to 3)
+            clock (callable): monotonic clock (Default to time.monotonic)
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cuts = 0
+        self.__limit = float(min(max(limit, minimum), maximum))
+        self.__in_flight = 0
+        self.__latency = None
+        self.__last_cut = None
+        self.__clock = clock
+        self.__condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """Current limit of requests in flight.
+
+        Returns:
+            float: limit, whole part of which is used
+        """
+        return self.__limit
+
+    @limit.setter
+    def limit(self, limit):
+        """Sets limit, e.g. to a value learned in a previous run.
+
+        Args:
+            limit (float): new limit
+        """
+        with self.__condition:
+            self.__limit = float(min(max(limit, self.minimum),
+                                     self.maximum))
+            self.__condition.notify_all()
+
+    @property
+    def window(self):
+        """Number of requests allowed in flight.
+
+        Returns:
+            int: whole part of limit
+        """
+        return int(self.__limit)
+
+    def acquire(self, token=None):
+        """Waits until a request is allowed to be sent.
+
+        Args:
+            token (obj): cancel token of download (Default to None)
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+        """
+        with self.__condition:
+            while self.__in_flight >= int(self.__limit):
+                self.__condition.wait(0.1)
+                if token is not None:
+                    token.raise_if_cancelled()
+            self.__in_flight += 1
+
+    def release(self, latency=None, throttled=False):
+        """Records the result of a request and adapts the limit.
+
+        Args:
+            latency (float): seconds the request took, None if the result
+                             says nothing about congestion (Default to None)
+            throttled (bool): True if exchange throttled the request
+                              (Default to False)
+        """
+        with self.__condition:
+            self.__in_flight -= 1
+            usual = self.__latency
+            if throttled or (latency is not None and usual is not None and
+                             latency > self.latency_factor * usual):
+                self.__cut()
+            elif latency is not None:
+                self.__latency = latency if usual is None else \
+                    0.8 * usual + 0.2 * latency
+                self.__limit = min(self.maximum,
+                                   self.__limit + 1 / self.__limit)
+            self.__condition.notify_all()
+
+    def __cut(self):
+        """Cuts limit unless it was already cut in this round trip.
+        """
+        now = self.__clock()
+        round_trip = self.__latency if self.__latency is not None else 1
+        if self.__last_cut is not None and \
+                now - self.__last_cut < round_trip:
+            return
+        self.__last_cut = now
+        self.__limit = max(self.minimum, self.__limit * self.decrease)
+        self.cuts += 1
+
+    def stats(self):
+        """Provides state of limiter.
+
+        Returns:
+            dict: limit, requests in flight, usual latency and cuts
+        """
+        with self.__condition:
+            return {'limit': self.__limit,
+                    'in_flight': self.__in_flight,
+                    'latency': self.__latency,
+                    'cuts': self.cuts}
@@ -0,0 +1,134 @@
+"""Provides a process pool for CPU-bound parsing of downloaded data.
+
+    List of classes:
+        TransformPool
+    """
+import importlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# exchange objects created in a worker process, one per exchange class
+_exchanges = {}
+
+
+def parse_in_process(module_name, cls_name, payload):
+    """Parses a raw payload with an exchange class in a worker process.
+
+    Args:
+        module_name (str): module of exchange class
+        cls_name (str): name of exchange class
+        payload (obj): raw payload given by fetch_hist_data
+
+    Returns:
+        (obj): candle batch of downloaded historical data
+    """
+    key = (module_name, cls_name)
+    if key not in _exchanges:
+        module = importlib.import_module(module_name)
+        _exchanges[key] = getattr(module, cls_name)()
+    return _exchanges[key].parse_hist_data(payload)
+
+
+class TransformPool:
+    """Downloads data on the calling thread and parses it in processes.
+
+    JSON decoding, time conversions and resampling of responses run in a
+    pool of worker processes, so they do not hold the GIL of threads
+    doing network I/O. With no workers, data is parsed on the calling
+    thread.
+    """
+
+    def __init__(self, workers=0):
+        """Constructor of TransformPool class.
+
+        Args:
+            workers (int): number of worker processes (Default to 0)
+
+        Attr:
+            __executor (obj): process pool, created when first used
+        """
+        self.workers = workers
+        self.__executor = None
+        self.__lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """Process pool of parsers.
+
+        Returns:
+            (obj): ProcessPoolExecutor
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(self.workers)
+            return self.__executor
+
+    def fetch(self, exc, coin, time, token=None):
+        """Downloads raw payload of a time block without parsing it.
+
+        Exchanges which do not split download into fetch and parse steps
+        give the candle batch as payload.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): given coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            (obj): raw payload for parse
+        """
+        if not exc.splits_download:
+            return exc.download_hist_data(coin, time, token)
+        return exc.flights.do(exc.download_key(coin, time) + ('payload',),
+                              lambda: exc.fetch_hist_data(coin, time, token),
+                              token)
+
+    def parse(self, exc, payload):
+        """Parses a raw payload of exchange into a candle batch.
+
+        Args:
+            exc (obj): exchange which downloaded payload
+            payload (obj): raw payload given by fetch or fetch_hist_data
+
+        Returns:
+            (obj): candle batch of downloaded historical data
+        """
+        if not exc.splits_download:
+            return payload  # already parsed by download_hist_data
+        if self.workers <= 0:
+            return exc.parse_hist_data(payload)
+        cls = type(exc)
+        return self.executor.submit(parse_in_process, cls.__module__,
+                                    cls.__qualname__, payload).result()
+
+    def download(self, exc, coin, time, token=None):
+        """Downloads historical data and parses it in the pool.
+
+        Exchanges which do not split download into fetch and parse steps
+        download and parse on the calling thread. Identical downloads
+        running at the same time share one download.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): given coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            (obj): candle batch of downloaded historical data
+        """
+        if not exc.splits_download:
+            return exc.download_hist_data(coin, time, token)
+        return exc.flights.do(
+            exc.download_key(coin, time),
+            lambda: self.parse(exc, exc.fetch_hist_data(coin, time, token)),
+            token)
+
+    def shutdown(self):
+        """Stops worker processes of pool.
+        """
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown()
+                self.__executor = None
@@ -0,0 +1,251 @@
+"""Provides functions compacting coin files.
+
+Appends of overlapping or repeated downloads leave coin files with
+duplicated and unsorted candles. Compaction sorts candles by time and
+keeps the latest written candle of each time, using an external merge
+sort so memory use does not depend on file size.
+
+"""
+import heapq
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+
+import application.filemodel_func as backend
+from application.classes.analytics_cls import SeriesAnalytics
+from application.classes.columns_cls import ColumnStore
+
+
+def _time_key(line):
+    """Provides the time of a candle row.
+
+    Args:
+        line (bytes): candle row of coin file
+
+    Returns:
+        bytes: time column of row
+    """
+    return line.split(b';', 1)[0]
+
+
+def _split_lines(file_path):
+    """Splits a coin file into its header and candle rows.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        tuple: header lines and open file positioned at the first row
+    """
+    f = open(file_path, 'rb')
+    header = []
+    while True:
+        offset = f.tell()
+        line = f.readline()
+        if not line.startswith(b'#'):
+            f.seek(offset)
+            break
+        header.append(line if line.endswith(b'\n') else line + b'\n')
+    return header, f
+
+
+def _rows(f):
+    """Reads candle rows of an open coin file.
+
+    Args:
+        f (obj): file opened in binary mode
+
+    Yields:
+        bytes: candle rows ending with a newline
+    """
+    for line in f:
+        if not line[:1].isdigit():
+            continue
+        yield line if line.endswith(b'\n') else line + b'\n'
+
+
+def _unique_last(rows):
+    """Keeps the last row of each time in rows sorted by time.
+
+    Args:
+        rows (iterable): candle rows sorted by time, in write order for
+                         equal times
+
+    Yields:
+        bytes: candle rows with unique times
+    """
+    for _, group in groupby(rows, key=_time_key):
+        for row in group:
+            pass
+        yield row
+
+
+def is_compact(file_path):
+    """Checks if candles of a coin file are sorted and unique.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        bool: True if every candle is later than the previous one
+    """
+    _, f = _split_lines(file_path)
+    with f:
+        last = None
+        for row in _rows(f):
+            time = _time_key(row)
+            if last is not None and time <= last:
+                return False
+            last = time
+    return True
+
+
+def _write_runs(f, run_dir, chunk_rows):
+    """Writes sorted runs of candle rows to temporary files.
+
+    Args:
+        f (obj): coin file positioned at the first row
+        run_dir (str): folder of run files
+        chunk_rows (int): maximum number of rows held in memory
+
+    Returns:
+        tuple: paths of run files and number of rows read
+    """
+    paths = []
+    count = 0
+    rows = _rows(f)
+    while True:
+        chunk = [row for _, row in zip(range(chunk_rows), rows)]
+        if not chunk:
+            break
+        count += len(chunk)
+        # sort is stable, so equal times stay in write order
+        chunk.sort(key=_time_key)
+        path = os.path.join(run_dir, f'run{len(paths)}')
+        with open(path, 'wb') as run:
+            run.writelines(_unique_last(chunk))
+        paths.append(path)
+    return paths, count
+
+
+def _tagged(run, index):
+    """Tags rows of a run file with their merge order.
+
+    Args:
+        run (obj): run file opened in binary mode
+        index (int): position of run in write order
+
+    Yields:
+        tuple: time and run index as merge key, and row
+    """
+    for row in run:
+        yield (_time_key(row), index), row
+
+
+def compact_coin_file(file_path, chunk_rows=500000, force=False):
+    """Sorts and deduplicates candles of a coin file.
+
+    The info comment at the top of coin file is kept. Compacted file is
+    written next to the coin file and swapped in atomically, so readers
+    see either the old or the new file. Downloads must not append to
+    the coin file meanwhile.
+
+    Args:
+        file_path (str): path of coin file
+        chunk_rows (int): maximum number of rows held in memory
+                          (Default to 500000)
+        force (bool): rewrites file even if it is already compact
+                      (Default to False)
+
+    Raises:
+        RuntimeError: occurs if coin file changes during compaction
+
+    Returns:
+        dict: number of rows read and written
+    """
+    if not force and is_compact(file_path):
+        return {'rows': None, 'written': None}
+    stat = os.stat(file_path)
+    temp_path = backend.sidecar_path(file_path, '.compact')
+    header, f = _split_lines(file_path)
+    with f, tempfile.TemporaryDirectory(
+            dir=os.path.dirname(temp_path)) as run_dir:
+        run_paths, count = _write_runs(f, run_dir, chunk_rows)
+        runs = [open(path, 'rb') for path in run_paths]
+        try:
+            # run index breaks ties, so the latest written row comes last
+            merged = heapq.merge(*[_tagged(run, i)
+                                   for i, run in enumerate(runs)])
+            written = 0
+            with open(temp_path, 'wb') as out:
+                out.writelines(header)
+                for row in _unique_last(row for _, row in merged):
+                    out.write(row)
+                    written += 1
+                out.flush()
+                os.fsync(out.fileno())
+        finally:
+            for run in runs:
+                run.close()
+    new_stat = os.stat(file_path)
+    if (new_stat.st_size, new_stat.st_mtime_ns) != \
+            (stat.st_size, stat.st_mtime_ns):
+        os.remove(temp_path)
+        raise RuntimeError(f'{file_path} changed during compaction!')
+    os.replace(temp_path, file_path)
+    backend.series_cache.invalidate(file_path)
+    store = ColumnStore(file_path)
+    if store.manifest is not None:
+        store.rebuild()
+    analytics = SeriesAnalytics(file_path)
+    if os.path.isfile(analytics.state_path):
+        analytics.rebuild()
+    return {'rows': count, 'written': written}
+
+
+def find_coin_files(save_path):
+    """Provides paths of coin files in all exchange folders.
+
+    Args:
+        save_path (str): main save path in OS
+
+    Returns:
+        list: paths of coin files
+    """
+    paths = []
+    for exc_name in sorted(os.listdir(save_path)):
+        exc_path = os.path.join(save_path, exc_name)
+        if not os.path.isdir(exc_path):
+            continue
+        for file_name in sorted(os.listdir(exc_path)):
+            try:
+                backend.parse_coin_file_name(file_name)
+            except ValueError:
+                continue
+            paths.append(os.path.join(exc_path, file_name))
+    return paths
+
+
+def compact_files(file_paths, workers=None, chunk_rows=500000):
+    """Compacts several coin files in parallel processes.
+
+    Args:
+        file_paths (list): paths of coin files
+        workers (int): number of processes (Default to number of CPUs)
+        chunk_rows (int): maximum number of rows held in memory by each
+                          process (Default to 500000)
+
+    Returns:
+        dict: result or error of each coin file
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {path: executor.submit(compact_coin_file, path, chunk_rows)
+                   for path in file_paths}
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except (OSError, RuntimeError) as err:
+                results[path] = {'error': str(err)}
+    return results
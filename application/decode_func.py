@@ -0,0 +1,50 @@
+"""Provides functions decoding exchange API responses.
+
+Responses are decoded by orjson if it is installed, which is several
+times faster than the json module of the standard library.
+
+"""
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Kraken trades pages end with the cursor of the next page
+_KRAKEN_LAST = re.compile(rb'"last"\s*:\s*"?(\d+)"?')
+_KRAKEN_NO_ERROR = re.compile(rb'"error"\s*:\s*\[\s*\]')
+
+
+def loads(payload):
+    """Decodes a JSON response body.
+
+    Args:
+        payload (bytes): response body
+
+    Raises:
+        ValueError: occurs if body is not valid JSON
+
+    Returns:
+        (obj): decoded lists, dicts and values
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def kraken_cursor(payload):
+    """Reads the next page cursor of a Kraken response without decoding it.
+
+    Args:
+        payload (bytes): response body of Trades endpoint
+
+    Returns:
+        str: 'last' cursor in nanoseconds or None if response has errors
+             or no cursor
+    """
+    match = _KRAKEN_LAST.search(payload)
+    if match is None or not _KRAKEN_NO_ERROR.search(payload):
+        return None
+    return match.group(1).decode()
@@ -0,0 +1,179 @@
+"""Provides functions aligning candles to the time grid of their frequency.
+
+Exchanges give no candle for periods without trades, so coin files have
+gaps. Densified candles are spaced exactly one period apart, so the
+candle of a time is found by its offset from the first candle instead
+of searching times. Periods start at multiples of their length since
+the epoch. Candles of empty periods are filled by a policy:
+
+- 'ffill': prices take the last close, volume is zero. Price columns
+  the last traded candle misses (e.g. Kraken gives only close prices)
+  stay missing
+- 'zero': prices are missing, volume is zero
+- 'nan': prices and volume are missing
+
+Months differ in length, so monthly candles are not densified.
+
+"""
+import os
+
+import numpy as np
+
+import application.filemodel_func as backend
+from application.classes.candle_cls import FREQUENCY_SECONDS, CandleBatch
+from application.classes.analytics_cls import SeriesAnalytics
+from application.classes.columns_cls import ColumnStore
+
+FILL_POLICIES = ('off', 'ffill', 'zero', 'nan')
+
+
+def densify(data, frequency, policy='ffill', last=None):
+    """Aligns candles to the time grid and fills empty periods.
+
+    The grid continues after the period of the last stored candle if it
+    is given, so blocks and pages densified one after another join
+    without gaps. Otherwise it starts at the period of the first candle.
+    Candles are moved to the start of their period and the latest candle
+    of a period is kept.
+    Candles in or before the period of the last stored candle are kept
+    unchanged.
+
+    Args:
+        data (obj): candle batch
+        frequency (str): frequency of candles
+        policy (str): one of FILL_POLICIES (Default to 'ffill')
+        last (obj): candle batch of the last stored candle
+                    (Default to None)
+
+    Raises:
+        ValueError: occurs if policy is not supported
+
+    Returns:
+        (obj): candle batch without gaps
+    """
+    if policy not in FILL_POLICIES:
+        raise ValueError(f'{policy} is not a supported fill policy!')
+    if policy == 'off' or frequency == 'months' or not len(data):
+        return data
+    step = FREQUENCY_SECONDS[frequency]
+    older = None
+    if last is not None and len(last):
+        start = (int(last.time[-1]) // step + 1) * step
+        # candles in or before the period of the last stored candle
+        older = data.take((data.time - start) // step < 0)
+        data = data.take((data.time - start) // step >= 0)
+        if not len(data):
+            return older
+    else:
+        start = int(data.time.min())
+        start -= start % step
+    slot = (data.time - start) // step
+    # stable sort keeps written order of candles in one period
+    order = np.argsort(slot, kind='stable')
+    slot = slot[order]
+    latest = order[np.r_[slot[1:] != slot[:-1], True]]
+    slot = slot[np.r_[slot[1:] != slot[:-1], True]]
+    size = int(slot[-1]) + 1
+    traded = np.zeros(size, dtype=bool)
+    traded[slot] = True
+    columns = {}
+    for col in CandleBatch.columns[1:]:
+        column = np.full(size, np.nan)
+        column[slot] = getattr(data, col)[latest]
+        columns[col] = column
+    if policy in ('ffill', 'zero'):
+        columns['volume'][~traded] = 0.0
+    if policy == 'ffill':
+        stored = last is not None and len(last)
+        position = np.where(traded, np.arange(size), -1)
+        position = np.maximum.accumulate(position)
+        previous = {col: np.where(
+            position >= 0, columns[col][position.clip(0)],
+            float(getattr(last, col)[-1]) if stored else np.nan)
+            for col in ('high', 'low', 'open', 'close')}
+        close = previous.pop('close')
+        for col, values in previous.items():
+            columns[col] = np.where(traded, columns[col],
+                                    np.where(np.isnan(values), np.nan, close))
+        columns['close'] = np.where(traded, columns['close'], close)
+    dense = CandleBatch(start + np.arange(size, dtype=np.int64) * step,
+                        *[columns[col] for col in CandleBatch.columns[1:]])
+    return dense if older is None else CandleBatch.concat([older, dense])
+
+
+def is_dense(data, frequency):
+    """Checks if candles are spaced exactly one period apart.
+
+    Args:
+        data (obj): candle batch
+        frequency (str): frequency of candles
+
+    Returns:
+        bool: True if candles can be found by offset
+    """
+    return bool((np.diff(data.time) == FREQUENCY_SECONDS[frequency]).all())
+
+
+def offset(data, time, frequency):
+    """Provides position of the candle of a time in densified candles.
+
+    Args:
+        data (obj): densified candle batch
+        time (int): epoch seconds of candle
+        frequency (str): frequency of candles
+
+    Returns:
+        int: position of candle, may be out of batch
+    """
+    return (time - int(data.time[0])) // FREQUENCY_SECONDS[frequency]
+
+
+def densify_coin_file(file_path, policy='ffill'):
+    """Densifies stored candles of a coin file.
+
+    Candles are sorted and deduplicated like compaction does, then
+    written next to the coin file and swapped in atomically. Downloads
+    must not append to the coin file meanwhile.
+
+    Args:
+        file_path (str): path of coin file
+        policy (str): one of FILL_POLICIES (Default to 'ffill')
+
+    Raises:
+        RuntimeError: occurs if coin file changes meanwhile
+
+    Returns:
+        dict: number of candles read and written
+    """
+    frequency = backend.parse_coin_file_name(file_path)['Frequency']
+    stat = os.stat(file_path)
+    data = backend.read_candles(file_path)
+    dense = densify(data, frequency, policy)
+    header = []
+    with open(file_path) as f:
+        for line in f:
+            if not line.startswith('#'):
+                break
+            header.append(line)
+    temp_path = backend.sidecar_path(file_path, '.dense')
+    with open(temp_path, 'w') as out:
+        out.writelines(header)
+        dense.to_frame().to_csv(out, header=False, index=False, sep=';',
+                                na_rep='-',
+                                date_format=CandleBatch.time_format)
+        out.flush()
+        os.fsync(out.fileno())
+    new_stat = os.stat(file_path)
+    if (new_stat.st_size, new_stat.st_mtime_ns) != \
+            (stat.st_size, stat.st_mtime_ns):
+        os.remove(temp_path)
+        raise RuntimeError(f'{file_path} changed during densifying!')
+    os.replace(temp_path, file_path)
+    backend.series_cache.invalidate(file_path)
+    store = ColumnStore(file_path)
+    if store.manifest is not None:
+        store.rebuild()
+    analytics = SeriesAnalytics(file_path)
+    if os.path.isfile(analytics.state_path):
+        analytics.rebuild()
+    return {'rows': len(data), 'written': len(dense)}
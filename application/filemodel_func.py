@@ -1,10 +1,20 @@
 """Provides backend functions for the model of MVC design.
 
 """
+import json
 import os
+import shutil
+
 import arrow
+import numpy as np
 import pandas as pd
 
+from application.classes.cache_cls import SeriesCache
+from application.classes.candle_cls import CandleBatch
+
+# decoded coin file data shared by all readers of the process
+series_cache = SeriesCache()
+
 
 def get_coin_files(exc, save_path):
     """Provides all coin file paths in a given exchange's folder.
@@ -24,10 +34,85 @@ def get_coin_files(exc, save_path):
     coin_files = list(filter(lambda x:
                              x.count('_') == 5 and
                              x.count('-') == 2 and
-                             x.find('.csv'), all_files))
+                             x.endswith('.csv'), all_files))
     return [os.path.join(exc_path, file) for file in coin_files]
 
 
+def get_coin_file(exc, file_name, save_path):
+    """Provides path of a coin file in exchange's folder.
+
+    Args:
+        exc (obj): exchange possessing coin
+        file_name (str): name of coin file
+        save_path (str): main save path in OS
+
+    Raises:
+        FileNotFoundError: occurs if coin file does not exist
+
+    Returns:
+        (str): path of coin file
+    """
+    file_path = os.path.join(save_path, exc.name, file_name)
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f'{file_path} does not exist!')
+    return file_path
+
+
+def sidecar_path(file_path, suffix):
+    """Provides path of a file kept next to a coin file.
+
+    Sidecar files such as indexes are kept in a hidden '.meta' folder of
+    exchange folder, so they are never taken as coin files.
+
+    Args:
+        file_path (str): path of coin file
+        suffix (str): suffix added to coin file name, e.g. '.idx'
+
+    Returns:
+        (str): path of sidecar file
+    """
+    meta_path = os.path.join(os.path.dirname(file_path), '.meta')
+    os.makedirs(meta_path, exist_ok=True)
+    return os.path.join(meta_path, os.path.basename(file_path) + suffix)
+
+
+def read_listing_dates(exc, save_path):
+    """Reads dates of first candles of pairs found in an exchange.
+
+    Args:
+        exc (obj): target exchange
+        save_path (str): main save path in OS
+
+    Returns:
+        (dict): 'QUOTE_BASE' pairs and epoch seconds of first candles
+    """
+    file_path = sidecar_path(os.path.join(save_path, exc.name, 'listings'),
+                             '.json')
+    try:
+        with open(file_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_listing_date(exc, pair, listing_date, save_path):
+    """Saves date of first candle of a pair in an exchange.
+
+    Args:
+        exc (obj): target exchange
+        pair (str): pair as 'QUOTE_BASE'
+        listing_date (obj): date of first candle
+        save_path (str): main save path in OS
+    """
+    listings = read_listing_dates(exc, save_path)
+    listings[pair] = int(listing_date.float_timestamp)
+    file_path = sidecar_path(os.path.join(save_path, exc.name, 'listings'),
+                             '.json')
+    with open(file_path + '.tmp', 'w') as f:
+        json.dump(listings, f)
+    os.replace(file_path + '.tmp', file_path)
+
+
 def create_exc_folder(exc, save_path):
     """Creates a directory of exchange in the OS.
 
@@ -49,10 +134,61 @@ def read_last_update_from_file(file_path):
     Returns:
         (obj): last date of coin data
     """
-    with open(file_path) as f:
-        data = f.readlines()
-        if len(data) > 4:
-            return arrow.get(data[-1].split(';')[0])
+    return series_cache.get(file_path, 'last_update', _read_last_update)
+
+
+def _read_last_update(file_path):
+    """Reads the last date of coin file without using the cache.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (obj): last date of coin data
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        # only the end of file is read since candles are appended
+        f.seek(max(0, f.tell() - 4096))
+        lines = [line for line in f.read().decode().splitlines()
+                 if line.strip()]
+    if lines and not lines[-1].startswith('#'):
+        return arrow.get(lines[-1].split(';')[0])
+
+
+def read_last_candle(file_path):
+    """Reads the last candle saved in coin file.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (obj): candle batch of the last candle, empty if file has none
+    """
+    return series_cache.get(file_path, 'last_candle', _read_last_candle,
+                            size=lambda data: data.nbytes)
+
+
+def _read_last_candle(file_path):
+    """Reads the last candle of coin file without using the cache.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (obj): candle batch of the last candle
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 4096))
+        lines = [line for line in f.read().decode().splitlines()
+                 if line.strip()]
+    if not lines or lines[-1].startswith('#'):
+        return CandleBatch.empty()
+    values = lines[-1].split(';')
+    time = int(arrow.get(values[0]).float_timestamp)
+    return CandleBatch([time], *[[np.nan if value == '-' else float(value)]
+                                 for value in values[1:6]])
 
 
 def form_new_coin_data(comment, last_update):
@@ -99,6 +235,22 @@ def read_file_comment(file_path):
     Returns:
         comment (str): info comment in the coin file 
     """
+    return series_cache.get(file_path, 'comment', _read_file_comment)
+
+
+def _read_file_comment(file_path):
+    """Reads info comment of coin file without using the cache.
+
+    Args:
+        file_path (str): given coin file path
+
+    Raises:
+        ValueError: occurs if no comment exist at the top
+                    of coin file
+
+    Returns:
+        comment (str): info comment in the coin file
+    """
     with open(file_path, 'r') as f:
         line = f.readline()
         if not line.startswith('#'):
@@ -156,6 +308,9 @@ def delete_exc_folder(exc, save_path):
         save_path (str): main save path in OS
     """
     exc_path = os.path.join(save_path, exc.name)
+    meta_path = os.path.join(exc_path, '.meta')
+    if os.path.isdir(meta_path):
+        shutil.rmtree(meta_path)
     os.rmdir(exc_path)
 
 
@@ -170,6 +325,12 @@ def delete_coin_file(exc, coin, save_path):
     exc_path = os.path.join(save_path, exc.name)
     file_path = os.path.join(exc_path, coin.file_name)
     os.remove(file_path)
+    series_cache.invalidate(file_path)
+    meta_path = os.path.join(exc_path, '.meta')
+    if os.path.isdir(meta_path):
+        for file_name in os.listdir(meta_path):
+            if file_name.startswith(coin.file_name):
+                os.remove(os.path.join(meta_path, file_name))
 
 
 def save_data(exc, coin, data, save_path):
@@ -178,10 +339,106 @@ def save_data(exc, coin, data, save_path):
     Args:
         exc (obj): exchange possessing coin
         coin (obj) : target coin
-        data (list): downloaded coin data
+        data (obj): candle batch of downloaded coin data
         save_path (str): main save path
     """
     exc_path = os.path.join(save_path, exc.name)
     file_path = os.path.join(exc_path, coin.file_name)
-    df = pd.DataFrame(data)
-    df.to_csv(file_path, header=False, index=False, sep=';', mode='a')
+    df = data.to_frame()
+    df.to_csv(file_path, header=False, index=False, sep=';', mode='a',
+              na_rep='-', date_format=CandleBatch.time_format)
+    series_cache.invalidate(file_path)
+
+
+def truncate_coin_file(file_path, size):
+    """Cuts a coin file back to a size, dropping rows appended after it.
+
+    Args:
+        file_path (str): path of coin file
+        size (int): size of coin file before rows were appended
+    """
+    with open(file_path, 'r+b') as f:
+        f.truncate(size)
+    series_cache.invalidate(file_path)
+
+
+def parse_coin_file_name(file_path):
+    """Splits a coin file name into its descriptive parts.
+
+    Coin files are named as 'Name_Quote_Base_Frequency_Exchange_Date.csv'
+    (see Coin.file_name).
+
+    Args:
+        file_path (str): path or name of a coin file
+
+    Raises:
+        ValueError: occurs if file name is not in coin file format
+
+    Returns:
+        (dict): name, quote, base, frequency, exchange and start date
+    """
+    file_name = os.path.basename(file_path)
+    parts = file_name[:-len('.csv')].split('_')
+    if not file_name.endswith('.csv') or not len(parts) == 6:
+        raise ValueError(f'{file_name} is not a coin file name!')
+    return {'Name': parts[0],
+            'Quote': parts[1],
+            'Base': parts[2],
+            'Frequency': parts[3],
+            'Exchange': parts[4],
+            'StartDate': parts[5]}
+
+
+def read_coin_data(file_path, columns=None):
+    """Reads stored candles of a coin CSV file into a data frame.
+
+    Info comment lines starting with '#' are skipped and '-' placeholders
+    are read as missing values. Rows are sorted by time and duplicated
+    timestamps are dropped by keeping the latest written row.
+
+    Args:
+        file_path (str): path of coin file
+        columns (list): column names of coin file
+                        (Default to Exchange.db_columns names)
+
+    Returns:
+        (obj): pandas data frame indexed by candle time
+    """
+    if columns is None:
+        columns = ['Time', 'HighPrice', 'LowPrice',
+                   'OpenPrice', 'ClosePrice', 'Volume']
+    df = pd.read_csv(file_path, sep=';', comment='#', header=None,
+                     names=columns, na_values='-', parse_dates=[0])
+    df = df.drop_duplicates(subset=columns[0], keep='last')
+    return df.set_index(columns[0]).sort_index()
+
+
+def read_candles(file_path):
+    """Reads stored candles of a coin CSV file into a candle batch.
+
+    Candles are served from the series cache while coin file is
+    unchanged. Columns of the returned batch are read-only.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (obj): candle batch sorted by time
+    """
+    return series_cache.get(file_path, 'candles', _read_candles,
+                            size=lambda data: data.nbytes)
+
+
+def _read_candles(file_path):
+    """Reads candles of coin file without using the cache.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (obj): candle batch with read-only columns
+    """
+    data = CandleBatch.from_frame(read_coin_data(file_path))
+    for col in data.columns:
+        getattr(data, col).flags.writeable = False
+    return data
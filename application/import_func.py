@@ -0,0 +1,207 @@
+"""Provides functions importing bulk trade history files.
+
+Kraken publishes full trade histories of its pairs as CSV files with
+'timestamp,price,volume' rows in time order. Downloading the same
+history by the Trades endpoint takes weeks for popular pairs, so these
+files are aggregated into candles locally and only the recent tail is
+downloaded by the API.
+
+Candles take one of two price formats:
+
+- 'ohlc': high, low, open and close prices of trades
+- 'mean': like candles downloaded by the Kraken API, close is the mean
+  trade price rounded to 2 decimals and the other prices are missing
+
+To merge periods split between chunks, 'mean' candles of a chunk keep
+the trade count in open and the sum of trade prices in close until the
+chunks are merged.
+
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from application.classes.candle_cls import FREQUENCY_SECONDS, CandleBatch
+from application.densify_func import densify
+
+
+def chunk_offsets(file_path, chunk_bytes):
+    """Splits a file into byte ranges ending at line boundaries.
+
+    Args:
+        file_path (str): path of trades file
+        chunk_bytes (int): approximate size of each range
+
+    Returns:
+        list: (start, end) byte offsets of ranges in file order
+    """
+    size = os.path.getsize(file_path)
+    offsets = [0]
+    with open(file_path, 'rb') as f:
+        while offsets[-1] < size:
+            f.seek(offsets[-1] + chunk_bytes)
+            f.readline()  # moves to the start of the next line
+            offsets.append(min(f.tell(), size))
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def _aggregate(time, price, volume, prices='ohlc'):
+    """Aggregates trades in time order into candles.
+
+    Args:
+        time (obj): numpy array of candle start times of trades
+        price (obj): numpy array of trade prices
+        volume (obj): numpy array of trade volumes
+        prices (str): price format of candles (Default to 'ohlc')
+
+    Returns:
+        (obj): candle batch of periods having trades
+    """
+    if not len(time):
+        return CandleBatch.empty()
+    starts = np.flatnonzero(np.r_[True, time[1:] != time[:-1]])
+    ends = np.r_[starts[1:], len(time)] - 1
+    if prices == 'mean':
+        missing = np.full(len(starts), np.nan)
+        return CandleBatch(time[starts], missing, missing,
+                           (ends - starts + 1).astype(np.float64),
+                           np.add.reduceat(price, starts),
+                           np.add.reduceat(volume, starts))
+    return CandleBatch(time[starts],
+                       np.maximum.reduceat(price, starts),
+                       np.minimum.reduceat(price, starts),
+                       price[starts],
+                       price[ends],
+                       np.add.reduceat(volume, starts))
+
+
+def aggregate_chunk(file_path, start, end, frequency, prices='ohlc'):
+    """Aggregates trades in a byte range of a trades file.
+
+    Candles of the first and last period may be partial if the period
+    continues in a neighbouring range.
+
+    Args:
+        file_path (str): path of trades file
+        start (int): first byte of range
+        end (int): byte after range
+        frequency (str): frequency of candles
+        prices (str): price format of candles (Default to 'ohlc')
+
+    Returns:
+        bytes: serialized candle batch
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if not data.strip():
+        return CandleBatch.empty().to_bytes()
+    df = pd.read_csv(io.BytesIO(data), header=None, usecols=[0, 1, 2],
+                     names=['time', 'price', 'volume'])
+    seconds = FREQUENCY_SECONDS[frequency]
+    time = df['time'].values.astype(np.int64) // seconds * seconds
+    return _aggregate(time, df['price'].values.astype(np.float64),
+                      df['volume'].values.astype(np.float64),
+                      prices).to_bytes()
+
+
+def merge_chunks(batches, prices='ohlc'):
+    """Joins candles of consecutive ranges, merging periods at seams.
+
+    Args:
+        batches (list): candle batches of ranges in file order
+        prices (str): price format of candles (Default to 'ohlc')
+
+    Returns:
+        (obj): candle batch with one candle per period
+    """
+    data = CandleBatch.concat(batches)
+    if not len(data):
+        return data
+    starts = np.flatnonzero(np.r_[True, data.time[1:] != data.time[:-1]])
+    ends = np.r_[starts[1:], len(data)] - 1
+    if prices == 'mean':
+        missing = np.full(len(starts), np.nan)
+        count = np.add.reduceat(data.open, starts)
+        return CandleBatch(data.time[starts], missing, missing, missing,
+                           np.round(np.add.reduceat(data.close, starts)
+                                    / count, 2),
+                           np.add.reduceat(data.volume, starts))
+    return CandleBatch(data.time[starts],
+                       np.maximum.reduceat(data.high, starts),
+                       np.minimum.reduceat(data.low, starts),
+                       data.open[starts],
+                       data.close[ends],
+                       np.add.reduceat(data.volume, starts))
+
+
+def fill_periods(data, frequency):
+    """Adds candles of periods without trades.
+
+    Like candles downloaded from Kraken, empty periods take the last
+    price and zero volume. Missing prices of 'mean' candles stay
+    missing.
+
+    Args:
+        data (obj): candle batch in time order
+        frequency (str): frequency of candles
+
+    Returns:
+        (obj): candle batch without gaps
+    """
+    return densify(data, frequency, 'ffill')
+
+
+def clip_to_coin(data, coin):
+    """Selects candles a coin file does not have yet.
+
+    Args:
+        data (obj): candle batch in time order
+        coin (obj): target coin
+
+    Returns:
+        (obj): candles between start date (or last update) and end date
+    """
+    start = int(coin.start_date.float_timestamp)
+    if coin.last_update is not None:
+        start = int(coin.last_update.float_timestamp) + 1
+    return data.take((data.time >= start) &
+                     (data.time < int(coin.end_date.float_timestamp)))
+
+
+def import_trades(file_path, frequency, workers=None,
+                  chunk_bytes=64 * 2**20, prices='ohlc'):
+    """Aggregates a trades file into candles by parallel processes.
+
+    Args:
+        file_path (str): path of trades file with
+                         'timestamp,price,volume' rows in time order
+        frequency (str): frequency of candles
+        workers (int): number of processes (Default to number of CPUs)
+        chunk_bytes (int): bytes read by a process at once
+                           (Default to 64 MB)
+        prices (str): price format of candles, 'ohlc' or 'mean'
+                      (Default to 'ohlc')
+
+    Raises:
+        ValueError: occurs if frequency or price format is not supported
+
+    Returns:
+        (obj): candle batch without gaps
+    """
+    if frequency not in FREQUENCY_SECONDS:
+        raise ValueError(f'{frequency} is not a supported frequency!')
+    if prices not in ('ohlc', 'mean'):
+        raise ValueError(f'{prices} is not a supported price format!')
+    ranges = chunk_offsets(file_path, chunk_bytes)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(aggregate_chunk, repeat(file_path),
+                               [start for start, _ in ranges],
+                               [end for _, end in ranges],
+                               repeat(frequency), repeat(prices))
+        batches = [CandleBatch.from_bytes(result) for result in results]
+    return fill_periods(merge_chunks(batches, prices), frequency)
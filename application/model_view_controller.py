@@ -6,19 +6,28 @@ List of Classes:
     View
 '''
 
+import os
 import re  # regular expression
 import threading
-from datetime import timedelta
-from time import sleep
 
 import arrow  # datetime management
 import PySimpleGUI as sg  # GUI framework library
 
 import application.filemodel_func as backend
+import application.densify_func as densify
+import application.planner_func as planner
+import application.tail_func as tail
+import application.validation_func as validation
+from application.classes.analytics_cls import SeriesAnalytics
+from application.classes.bucket_cls import SharedTokenBucket
+from application.classes.cancel_cls import CancelToken, DownloadCancelled
 from application.classes.coin_cls import Coin
+from application.classes.pipeline_cls import Pipeline
+from application.classes.columns_cls import ColumnStore
 from application.classes.config_cls import Config
-from application.classes.exchange_base_cls import Exchange
-from application.classes.exchange_classes import *
+from application.classes.progress_cls import ProgressReporter
+from application.classes.registry_cls import ExchangeRegistry
+from application.classes.transform_cls import TransformPool
 from application.predefined_messages import PredefinedMessages
 from application.screen_layout import Layout
 
@@ -39,13 +48,25 @@ class Controller():
                                (Default to None)
             __clicked_coin (obj): stores user selected coin at run-time
                                 (Default to None)
-            cancel (bool): stores state of cancel button
+            tokens (set): cancel tokens of running downloads
+            max_block_attempts (int): attempts to download a time block
+                                      before download is given up
+            retry_delay (float): base delay in seconds before a failed
+                                 time block is tried again
+            pipeline_window (int): time blocks downloaded ahead of the
+                                   block being saved
+            queue_capacity (int): blocks waiting between two stages of
+                                  download pipeline
         """
         self.model = model
         self.view = view
         self.__clicked_exc = None
         self.__clicked_coin = None
-        self.cancel = False
+        self.tokens = set()
+        self.max_block_attempts = 5
+        self.retry_delay = 5
+        self.pipeline_window = 16
+        self.queue_capacity = 4
 
     def start_app(self):
         """Starts application
@@ -54,7 +75,7 @@ class Controller():
         # Creates screen layout
         end_date = arrow.utcnow().format('DD-MM-YYYY')
         end_hour = arrow.utcnow().format('HH:mm:ss')
-        layout = Layout.create(self.model.exc_list,
+        layout = Layout.create(self.model.exc_names,
                                self.model.sys.save_path,
                                self.model.sys.start_date,
                                self.model.sys.start_hour,
@@ -100,6 +121,20 @@ class Controller():
                 else:
                     self.set_clicked_coin(values)
 
+            # Filters, sorts and pages coins table
+            if event in ('-coin_filter-', '-coin_sort-',
+                         '-prev_page-', '-next_page-'):
+                if event == '-coin_filter-':
+                    self.view.filter_coin_tbl(values['-coin_filter-'])
+                if event == '-coin_sort-':
+                    self.view.sort_coin_tbl(values['-coin_sort-'])
+                if event == '-prev_page-':
+                    self.view.turn_coin_page(-1)
+                if event == '-next_page-':
+                    self.view.turn_coin_page(1)
+                if self.__clicked_exc is not None:
+                    self.view.update_coin_tbl(self.__clicked_exc)
+
             # Adds a new coin to selected exchange
             if event == '-add_coin-':
                 if self.__clicked_exc is None:
@@ -112,9 +147,10 @@ class Controller():
                             self.__date_error(coin_data) is False):
                         self.add_new_coin_to_exchange(coin_data)
 
-            # Changes cancel attr. to stop data download
+            # Cancels running downloads
             if event == '-cancel-':
-                self.cancel = True
+                for token in self.tokens:
+                    token.cancel()
 
             # Downloads coins data starts to download
             if event == '-download_coin-':
@@ -156,27 +192,52 @@ class Controller():
 
             # Displays progress of data download
             if event == '-PROGRESS-':
-                msg = "Part {} of {}: downloaded & saved!\n".format(
-                    values['-PROGRESS-'][0], values['-PROGRESS-'][1])
+                info = values['-PROGRESS-']
+                msg = "Part {part} of {total}: downloaded & saved! " \
+                    "({rows} rows, {rows_per_sec:.0f} rows/s)".format(**info)
+                if 'stages' in info:
+                    msg += ' [{}]'.format(', '.join(
+                        f"{name} {stage['busy']}/{stage['workers']}"
+                        f"+{stage['queued']}"
+                        for name, stage in info['stages'].items()
+                        if name != 'in_flight'))
+                msg += '\n'
+                self.view.display_msg(msg, 'orange', True)
+
+            # Sets coins of exchange after its folder is scanned
+            if event == '-COINS_SCANNED-':
+                self.set_coins_of_exchange(*values['-COINS_SCANNED-'])
+
+            # Displays failed parts of data download which will be retried
+            if event == '-RETRY-':
+                msg = "Part {} failed (attempt {}), retrying...\n{}\n".format(
+                    *values['-RETRY-'])
                 self.view.display_msg(msg, 'orange', True)
 
             # Displays errors of data download
             if event == '-ERROR-':
                 self.view.display_err(values['-ERROR-'])
 
+            # Displays parts skipped before the pair was listed
+            if event == '-SKIPPED-':
+                listing, count = values['-SKIPPED-']
+                self.view.display_msg(
+                    f'\nNo data before {listing}, {count} parts skipped!...',
+                    'green', True)
+
             # Displays info if data download is cancelled
             if event == '-CANCELLED-':
                 self.view.display_defined_msg('*Cancelled', 'red')
 
             # Displays success message after data download finished
             if event == '-FINISHED-':
-                if self.cancel is not False:
-                    self.cancel = False
-                else:
+                token, status = values['-FINISHED-']
+                self.tokens.discard(token)
+                self.model.save_throttle_limits()
+                if status == 'completed':
                     self.view.display_msg(
                         '\nDownload completed!...', 'green', True)
-                self.set_coins_of_exchange(self.__clicked_exc)
-                self.view.update_coin_tbl(self.__clicked_exc)
+                self.scan_coins_of_exchange(self.__clicked_exc)
 
         self.view.window.close()
 
@@ -252,17 +313,19 @@ class Controller():
             coin (obj) given coin
         """
         try:
-            blocks = self.__time_blocks(exc.max_API_requests,
-                                        coin.start_date,
-                                        coin.end_date,
-                                        coin.frequency)
+            blocks = planner.time_blocks(exc.max_API_requests,
+                                         coin.start_date,
+                                         coin.end_date,
+                                         coin.frequency)
             self.view.display_defined_msg(
                 '*Down Start',
                 'green',
                 f'-----{len(blocks)} PARTS-----\n',
                 False)
+            token = CancelToken()
+            self.tokens.add(token)
             threading.Thread(target=self.__download,
-                             args=(exc, coin, blocks),
+                             args=(exc, coin, blocks, token),
                              daemon=True).start()
         except (ValueError, OSError) as err:
             self.view.display_err(err)
@@ -339,8 +402,11 @@ class Controller():
         Args:
             values (dict): values collected from app window
         """
+        if not values['-coins_table-']:
+            return
         col_num = values['-coins_table-'][0]
-        self.__clicked_coin = self.__clicked_exc.coins[col_num]
+        if col_num < len(self.view.visible_coins):
+            self.__clicked_coin = self.view.visible_coins[col_num]
 
     def set_clicked_exchange(self, values):
         """Stores user selected exchange in __clicked_exc attr.
@@ -349,7 +415,8 @@ class Controller():
             values (dict): values collected from app window
         """
         col_num = values['-exchanges_table-'][0]
-        self.__clicked_exc = self.model.exc_list[col_num]
+        exc_name = self.model.exc_names[col_num]
+        self.__clicked_exc = self.model.get_exchange(exc_name)
 
     def get_new_save_folder(self):
         """Gets new save folder path from user.
@@ -380,108 +447,195 @@ class Controller():
     def show_exchange_info(self, exc):
         """Displays selected exchange info on the screen.
 
+        Coins of exchange are displayed when its folder scan is finished.
+
         Args:
             exc (obj): target exchange
         """
         self.view.display_exc_info(exc)
         self.view.set_resolution(exc.resolution)
-        error = self.set_coins_of_exchange(exc)
-        for err in error:
-            self.view.display_msg(err, 'orange', True)
-        self.view.update_coin_tbl(exc)
+        self.scan_coins_of_exchange(exc)
 
-    def set_coins_of_exchange(self, exc):
-        """Gets coins of exchange from relevant database and add them to exc.
+    def scan_coins_of_exchange(self, exc):
+        """Reads coin files of exchange in a background thread.
+
+        Coins found are posted to the window by '-COINS_SCANNED-' event
+        not to freeze the window while large exchange folders are read.
 
         Args:
             exc (obj): target exchange
+        """
+        threading.Thread(target=self.__scan_coins,
+                         args=(exc,),
+                         daemon=True).start()
 
-        return:
-            error (list): errors occurred in setting of exchange coins
+    def __scan_coins(self, exc):
+        """Reads coin files of exchange and posts created coins.
+
+        Args:
+            exc (obj): target exchange
         """
-        exc.coins = []  # empties exchange coins list
         coin_data, error = self.model.read_coins_data(exc)
-        for coin in coin_data:
-            exc.possess_coin(Coin(exc, coin))
-        return error
-
-    @ staticmethod
-    def __time_blocks(limit, start_date, end_date, freq):
-        """Creates a list including time span for API data request.
+        coins = []
+        for data in coin_data:
+            try:
+                coins.append(Coin(exc, data))
+            except (ValueError, TypeError) as err:
+                error.append(err)
+        self.view.window.write_event_value('-COINS_SCANNED-',
+                                           (exc, coins, error))
 
-        API of some exchanges allow requesting limited number of data per time.
-        __time_blocks function creates a bunch of time periods which helps
-        application to downloads all historical data with sequencing requests.
+    def set_coins_of_exchange(self, exc, coins, error):
+        """Sets scanned coins of exchange and displays them.
 
         Args:
-            limit (int): maximum API request limit of exchange
-            start_date (obj): given start date
-            end_date (obj): given end date
-            freq (str) : given data download frequency
-
-        Returns:
-            blocks (list): time spans between start and end dates.
-        """
-        def select(freq):
-            if freq == 'minutes':
-                return timedelta(minutes=1)
-            if freq == 'hours':
-                return timedelta(hours=1)
-            if freq == 'days':
-                return timedelta(days=1)
-            if freq == 'weeks':
-                return timedelta(weeks=1)
-            if freq == 'months':
-                return timedelta(weeks=4)
-
-        interval = select(freq)*limit
-        blocks = []
-        if (start_date+interval) < end_date:
-            while start_date < end_date:
-                blocks.append(
-                    [start_date, start_date+interval])
-                start_date = start_date+interval
-            blocks[-1][1] = end_date
-        else:
-            blocks.append((start_date, end_date))
-        return blocks
+            exc (obj): target exchange
+            coins (list): coin objects read from exchange's folder
+            error (list): errors occurred in reading of exchange coins
+        """
+        exc.coins = coins
+        for err in error:
+            self.view.display_msg(err, 'orange', True)
+        if exc is self.__clicked_exc:
+            self.view.update_coin_tbl(exc)
 
-    def __download(self, exc, coin, blocks):
+    def __download(self, exc, coin, blocks, token):
         """Downloads and saves coin data.
 
+        Blocks go through a pipeline of fetch, parse and write stages, so
+        requests, parsing and saving of different blocks overlap. Fetches
+        run as many at once as the adaptive request limit of exchange
+        allows, while at most 'pipeline_window' blocks are in memory.
+        Downloaded blocks are saved in time order.
+
+        A block failed by a connection or data error is downloaded again
+        after a delay. Download is given up after a block failed
+        'max_block_attempts' times.
+
+        Token is passed down to exchange API calls, so a cancel also stops
+        waits and requests in progress.
+
         Args:
             exc (obj): given exchange
             coin (obj): given coin
             blocks (list): time blocks for download request
+            token (obj): cancel token of download
         """
-        for part, time in enumerate(blocks):
-            if self.cancel is False:
-                try:
-                    data = exc.download_hist_data(coin, time)
-                    self.model.save_downloaded_data(exc, coin, data)
-                    info = (part+1, len(blocks))
-                    self.view.window.write_event_value('-PROGRESS-', info)
-                    sleep(0.5)  # delay for request not to be banned by API
-                except (ConnectionError, OSError, ValueError) as err:
-                    self.view.window.write_event_value('-ERROR-', err)
-                    self.cancel = True
-                    break
-            else:
-                self.view.window.write_event_value('-CANCELLED-', '')
-                break
-        self.view.window.write_event_value('-FINISHED-', '')
+        status = 'failed'
+        try:
+            if coin.last_update is None:
+                blocks = self.__skip_unlisted(exc, coin, blocks, token)
+            pipeline = Pipeline(
+                [('fetch', lambda time, attempts, block_token:
+                  self.__fetch_block(exc, coin, time, block_token, attempts),
+                  exc.session.limiter.maximum),
+                 ('parse', lambda payload, block_token:
+                  self.model.parse_data(exc, payload),
+                  max(1, self.model.sys.parse_workers))],
+                window=self.pipeline_window,
+                capacity=self.queue_capacity,
+                retry_errors=(ConnectionError, OSError, ValueError),
+                max_attempts=self.max_block_attempts,
+                on_retry=lambda part, attempts, err:
+                self.view.window.write_event_value('-RETRY-',
+                                                   (part+1, attempts, err)))
+            progress = ProgressReporter(
+                lambda info: self.view.window.write_event_value(
+                    '-PROGRESS-', info),
+                len(blocks), stages=pipeline.occupancy)
+            for _, data in pipeline.run(blocks, token):
+                self.model.save_downloaded_data(exc, coin, data)
+                progress.update(rows=len(data))
+            status = 'completed'
+        except DownloadCancelled:
+            self.view.window.write_event_value('-CANCELLED-', '')
+            status = 'cancelled'
+        except (ConnectionError, OSError, ValueError) as err:
+            self.view.window.write_event_value('-ERROR-', err)
+        except Exception as err:
+            # e.g. an unexpected payload, which is not retried
+            self.view.window.write_event_value(
+                '-ERROR-', f'Download failed by an unexpected error:\n\n'
+                f'{type(err).__name__}: {err}')
+        finally:
+            # GUI leaves downloading state only by this event
+            self.view.window.write_event_value('-FINISHED-', (token, status))
+
+    def __skip_unlisted(self, exc, coin, blocks, token):
+        """Removes time blocks before the first candle of coin's pair.
+
+        Blocks are kept if the first candle can not be found.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): given coin
+            blocks (list): time blocks for download request
+            token (obj): cancel token of download
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+
+        Returns:
+            list: time blocks which may include candles
+        """
+        try:
+            listing = self.model.listing_date(exc, coin, token)
+        except (ConnectionError, OSError, ValueError, KeyError):
+            return blocks
+        if listing is None:
+            return blocks
+        listed = planner.skip_unlisted(blocks, listing)
+        if len(listed) < len(blocks):
+            info = (listing.format('DD-MM-YYYY HH:mm'),
+                    len(blocks) - len(listed))
+            self.view.window.write_event_value('-SKIPPED-', info)
+        return listed
+
+    def __fetch_block(self, exc, coin, time, token, attempts):
+        """Fetches a time block, waiting first if it is retried.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): given coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token of download
+            attempts (int): failed attempts of block so far
+
+        Raises:
+            DownloadCancelled: occurs if token is cancelled
+
+        Returns:
+            (obj): raw payload of block
+        """
+        if attempts:
+            # waits for circuit breaker of exchange if it is open
+            retry_after = exc.session.breaker.retry_after()
+            token.wait(retry_after or self.retry_delay * attempts)
+            token.raise_if_cancelled()
+        return self.model.fetch_data(exc, coin, list(time), token)
 
 
 class Model:
     """Provides model object of MVC design.
 
     class attr:
-        __exc_list (list): list of exchange objects
+        __registry (obj): registry of exchange plugins
         __sys (obj) : object that stores configuration data
+        __transform (obj): pool parsing downloaded data
+                           (Default to None, created when first used)
+        __throttled (set): names of exchanges with restored request
+                           limits and shared request budgets
     """
 
-    __exc_list = [cls() for cls in Exchange.__subclasses__()]
+    __registry = ExchangeRegistry()
     __sys = Config()
+    __transform = None
+    __throttled = set()
+
+    def __init__(self):
+        """Constructor of Model class.
+        """
+        backend.series_cache.resize(self.sys.cache_bytes)
 
     @ property
     def sys(cls):
@@ -493,13 +647,158 @@ class Model:
         return cls.__sys
 
     @ property
-    def exc_list(cls):
-        """Provides list of exchanges.
+    def exc_names(cls):
+        """Provides names of exchanges.
+
+        Returns:
+            list: names of declared exchanges
+        """
+        return cls.__registry.names
+
+    def get_exchange(self, name):
+        """Provides an exchange object, loading its plugin if needed.
+
+        Args:
+            name (str): name of exchange
+
+        Returns:
+            (obj): exchange object
+        """
+        exc = self.__registry.get(name)
+        if name not in Model.__throttled:
+            # starts with the request limit learned in previous runs
+            Model.__throttled.add(name)
+            limit = self.sys.throttle_limit(name)
+            if limit is not None:
+                exc.session.limiter.limit = limit
+            # shares request rate of exchange with other processes
+            if self.sys.rate_limit_file and exc.request_interval:
+                exc.session.bucket = SharedTokenBucket(
+                    self.sys.rate_limit_file, name, 1 / exc.request_interval)
+        return exc
+
+    def save_throttle_limits(self):
+        """Saves request limits learned for used exchanges.
+        """
+        self.sys.change_throttle_limits(
+            {name: self.__registry.get(name).session.limiter.limit
+             for name in Model.__throttled})
+
+    @ property
+    def transform(self):
+        """Provides the pool parsing downloaded data.
+
+        Returns:
+            (obj): transform pool with configured number of processes
+        """
+        if Model.__transform is None:
+            Model.__transform = TransformPool(self.sys.parse_workers)
+        return Model.__transform
+
+    @ property
+    def cache_stats(self):
+        """Provides counters of the coin data cache.
+
+        Returns:
+            dict: hits, misses, evictions and memory usage of cache
+        """
+        return backend.series_cache.stats()
+
+    def listing_date(self, exc, coin, token=None):
+        """Provides the first candle date of a coin's pair in exchange.
+
+        Dates found before are read from the exchange folder. A search
+        result is saved only if the exchange finds first candles for
+        certain and the pair was found listed after the coin start date,
+        since otherwise the pair may have older candles.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): target coin
+            token (obj): cancel token of download (Default to None)
 
         Returns:
-            list: list of exchange objects
+            (obj): date of first candle or None if pair has no candles
         """
-        return cls.__exc_list
+        pair = f'{coin.quote}_{coin.base}'.upper()
+        listings = backend.read_listing_dates(exc, self.sys.save_path)
+        if pair in listings:
+            return arrow.get(listings[pair])
+        listing = exc.find_listing_date(coin, coin.start_date, coin.end_date,
+                                        token)
+        if exc.exact_listing_date and listing is not None and \
+                listing.float_timestamp > \
+                coin.start_date.float_timestamp + exc.probe_window(coin):
+            backend.save_listing_date(exc, pair, listing,
+                                      self.sys.save_path)
+        return listing
+
+    def download_data(self, exc, coin, time, token=None):
+        """Downloads historical data of a coin for a time block.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): target coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            (obj): candle batch of downloaded data
+        """
+        return self.transform.download(exc, coin, time, token)
+
+    def download_latest(self, exc, coin, count, token=None):
+        """Downloads the newest candles of a coin and adds them to its file.
+
+        Candles are added only if they connect to the stored candles, so
+        the file never gets a gap. Otherwise the regular update has to
+        download the missing history first. The last update of coin
+        follows the added candles.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): target coin
+            count (int): number of newest candles
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            data, added (obj, int): newest candles and number of them
+                                    added to coin file
+        """
+        data = exc.download_latest(coin, count, token)
+        new = tail.new_candles(data, coin)
+        if len(new):
+            self.save_downloaded_data(exc, coin, new)
+            coin.last_update = backend.read_last_update_from_file(
+                backend.get_coin_file(exc, coin.file_name,
+                                      self.sys.save_path))
+        return data, len(new)
+
+    def fetch_data(self, exc, coin, time, token=None):
+        """Downloads raw historical data of a coin for a time block.
+
+        Args:
+            exc (obj): given exchange
+            coin (obj): target coin
+            time (list): [start date obj,end date obj]
+            token (obj): cancel token of download (Default to None)
+
+        Returns:
+            (obj): raw payload for parse_data
+        """
+        return self.transform.fetch(exc, coin, time, token)
+
+    def parse_data(self, exc, payload):
+        """Parses raw historical data given by fetch_data.
+
+        Args:
+            exc (obj): given exchange
+            payload (obj): raw payload of a time block
+
+        Returns:
+            (obj): candle batch of downloaded data
+        """
+        return self.transform.parse(exc, payload)
 
     def read_coins_data(self, exc):
         """read coin data by reading existed coin files in exchange's folder.
@@ -525,6 +824,21 @@ class Model:
                 coins.append(coin_data)
         return coins, errors
 
+    def load_coin(self, exc, file_name):
+        """Creates a coin object from a coin file of exchange.
+
+        Args:
+            exc (obj): exchange possessing coin
+            file_name (str): name of coin file
+
+        Returns:
+            (obj): coin object
+        """
+        file_path = backend.get_coin_file(exc, file_name, self.sys.save_path)
+        end_date = backend.read_last_update_from_file(file_path)
+        comment = backend.read_file_comment(file_path)
+        return Coin(exc, backend.form_new_coin_data(comment, end_date))
+
     def add_coin(self, exc, new_coin):
         """Adds a coin to the exchange and saves its csv file.
 
@@ -551,12 +865,45 @@ class Model:
     def save_downloaded_data(self, exc, coin, data):
         """Saves downloaded coin data to csv file.
 
+        Candles are validated first and bad candles are flagged or
+        quarantined as configured. If a fill policy is set, candles are
+        densified to continue the time grid of saved candles. Column files
+        and analytics of coin file are updated if they are enabled. If
+        saving fails, coin file is cut back to its size before saving.
+
         Args:
             exc (obj): given exchange
             coin (obj): target coin
-            data (list): downloaded coin data
+            data (obj): candle batch of downloaded coin data
         """
-        backend.save_data(exc, coin, data, self.sys.save_path)
+        file_path = backend.get_coin_file(exc, coin.file_name,
+                                          self.sys.save_path)
+        if self.sys.validation != 'off':
+            last_update = backend.read_last_update_from_file(file_path)
+            data = validation.screen_candles(
+                file_path, data,
+                None if last_update is None
+                else int(last_update.float_timestamp),
+                self.sys.validation)
+        if self.sys.fill_policy != 'off':
+            data = densify.densify(data, coin.frequency, self.sys.fill_policy,
+                                   backend.read_last_candle(file_path))
+        size = os.path.getsize(file_path)
+        try:
+            backend.save_data(exc, coin, data, self.sys.save_path)
+            if self.sys.column_export:
+                ColumnStore(file_path).append(data, size)
+            if self.sys.analytics_window:
+                analytics = SeriesAnalytics(file_path,
+                                            self.sys.analytics_window)
+                if analytics.state is None:
+                    analytics.rebuild()
+                else:
+                    analytics.update(data)
+        except BaseException:
+            # saving again must not append the same candles twice
+            backend.truncate_coin_file(file_path, size)
+            raise
 
 
 class View:
@@ -564,8 +911,35 @@ class View:
 
     attr:
         __displayed_msg (obj): stores displayed messages at run-time
+        page_size (int): number of coins rendered in coins table
     """
     __displayed_msg = None
+    page_size = 100
+
+    # sort keys of coins table columns
+    sort_keys = {
+        'Cryptocurrency': lambda coin: coin.name.lower(),
+        'Trade Pair': lambda coin: coin.table_row[1],
+        'Last Update': lambda coin: coin.last_update.float_timestamp
+        if coin.last_update is not None else 0,
+        'Start Date': lambda coin: coin.start_date.float_timestamp,
+        'Frequency': lambda coin: coin.frequency}
+
+    def __init__(self):
+        """Constructor of View class.
+
+        Attr:
+            visible_coins (list): coins rendered in coins table in row order
+            __coin_page (int): displayed page of coins table
+            __coin_filter (str): text filtering coins table
+            __coin_sort (str): column heading sorting coins table
+            __coins_cache (tuple): key and coins of last filter & sort
+        """
+        self.visible_coins = []
+        self.__coin_page = 0
+        self.__coin_filter = ''
+        self.__coin_sort = 'Cryptocurrency'
+        self.__coins_cache = (None, [])
 
     def start_window(self, layout):
         """Starts application window.
@@ -573,7 +947,7 @@ class View:
         Args:
             layout (obj): PysimpleGUI layout
         """
-        WINDOW_SIZE = (1000, 560)
+        WINDOW_SIZE = (1000, 600)
         self.window = sg.Window('Crypto-exchanges Data Downloader',
                                 layout,
                                 size=WINDOW_SIZE,
@@ -668,22 +1042,63 @@ class View:
     def update_coin_tbl(self, exc):
         """Updates coins table acc. to exchange' possessed coins.
 
+        Only the current page of filtered & sorted coins is rendered.
+        Order of coins is cached until coins, filter or sorting change.
+
         Args:
             exc (obj): given exchange
         """
-        def check(x): return x.format(
-            'DD-MM-YYYY HH:mm:ss') if x is not None else '-'
-
-        if not exc.coins:
+        key = (id(exc.coins), exc.coins.version,
+               self.__coin_filter, self.__coin_sort)
+        if self.__coins_cache[0] != key:
+            if self.__coins_cache[0] is None or \
+                    self.__coins_cache[0][0] != key[0]:
+                self.__coin_page = 0
+            text = self.__coin_filter.casefold()
+            coins = [coin for coin in exc.coins
+                     if text in ' '.join(coin.table_row[:2]).casefold()]
+            coins.sort(key=self.sort_keys[self.__coin_sort])
+            self.__coins_cache = (key, coins)
+        coins = self.__coins_cache[1]
+
+        pages = max(1, -(-len(coins) // self.page_size))
+        self.__coin_page = min(max(self.__coin_page, 0), pages - 1)
+        first = self.__coin_page * self.page_size
+        self.visible_coins = coins[first:first + self.page_size]
+
+        if not self.visible_coins:
             data = [['-', '-', '-', '-', '-']]
         else:
-            data = [[coin.name,
-                     f'{coin.quote}/{coin.base}',
-                     check(coin.last_update),
-                     coin.start_date.format('DD-MM-YYYY HH:mm:ss'),
-                     coin.frequency] for coin in exc.coins]
-
+            data = [coin.table_row for coin in self.visible_coins]
         self.window['-coins_table-'].update(data)
+        self.window['-coins_page-'].update(
+            f'Page {self.__coin_page + 1}/{pages} ({len(coins)} coins)')
+
+    def filter_coin_tbl(self, text):
+        """Sets text filtering coins table by name or trade pair.
+
+        Args:
+            text (str): filter text
+        """
+        self.__coin_filter = text.strip()
+        self.__coin_page = 0
+
+    def sort_coin_tbl(self, heading):
+        """Sets column sorting coins table.
+
+        Args:
+            heading (str): heading of sorting column
+        """
+        if heading in self.sort_keys:
+            self.__coin_sort = heading
+
+    def turn_coin_page(self, step):
+        """Moves coins table to next or previous page.
+
+        Args:
+            step (int): number of pages to move
+        """
+        self.__coin_page += step
 
     def __check_repeating_msg(self, msg):
         """Checks if msg is already displayed on the screen.
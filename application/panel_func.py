@@ -0,0 +1,123 @@
+"""Provides functions to build cross-exchange panels of a trade pair.
+
+A panel lines up the stored series of the same trade pair downloaded from
+several exchanges on one common time grid. Every series is sorted once and
+the alignment is done with index based merges of whole columns.
+
+"""
+import os
+
+import pandas as pd
+
+import application.filemodel_func as backend
+from application.classes.candle_cls import CandleBatch
+
+# pandas offsets used to snap candle times onto a common grid
+GRID_OFFSETS = {'minutes': 'min',
+                'hours': 'h',
+                'days': 'D'}
+
+
+def find_pair_files(save_path, quote, base, frequency, exc_names=None):
+    """Finds coin files of a trade pair in every exchange folder.
+
+    Args:
+        save_path (str): main save path in OS
+        quote (str): quote coin abbreviation
+        base (str): base coin abbreviation
+        frequency (str): data frequency of coin files
+        exc_names (list): exchange folders to search
+                          (Default to all folders in save path)
+
+    Returns:
+        (dict): exchange names and paths of their pair files
+    """
+    if exc_names is None:
+        exc_names = sorted(name for name in os.listdir(save_path)
+                           if os.path.isdir(os.path.join(save_path, name)))
+    pair_files = {}
+    for exc_name in exc_names:
+        exc_path = os.path.join(save_path, exc_name)
+        if not os.path.isdir(exc_path):
+            continue
+        for file_name in sorted(os.listdir(exc_path)):
+            try:
+                info = backend.parse_coin_file_name(file_name)
+            except ValueError:
+                continue
+            if (info['Quote'].upper() == quote.upper() and
+                    info['Base'].upper() == base.upper() and
+                    info['Frequency'] == frequency and
+                    info['Exchange'] == exc_name):
+                pair_files.setdefault(exc_name, []).append(
+                    os.path.join(exc_path, file_name))
+    return pair_files
+
+
+def read_pair_series(file_paths, frequency, columns):
+    """Reads and combines all coin files of one exchange for a pair.
+
+    Args:
+        file_paths (list): coin files of the same pair and frequency
+        frequency (str): data frequency of coin files
+        columns (list): columns to keep
+
+    Returns:
+        (obj): sorted data frame with unique grid times
+    """
+    headers = ['Time', 'HighPrice', 'LowPrice',
+               'OpenPrice', 'ClosePrice', 'Volume']
+    # candles come from the series cache if the file was read before
+    frames = [backend.read_candles(path).to_frame(headers)
+              .set_index('Time')[columns] for path in file_paths]
+    df = pd.concat(frames) if len(frames) > 1 else frames[0]
+    if frequency in GRID_OFFSETS:
+        df.index = df.index.floor(GRID_OFFSETS[frequency])
+    df = df[~df.index.duplicated(keep='last')]
+    return df.sort_index()
+
+
+def build_pair_panel(save_path, quote, base, frequency, exc_names=None,
+                     columns=None, how='outer', out_path=None):
+    """Builds a columnar panel of a trade pair across exchanges.
+
+    Each exchange contributes its columns prefixed by the exchange name,
+    e.g. 'Kraken_ClosePrice'. Series are aligned on the sorted union
+    (how='outer') or intersection (how='inner') of their grid times.
+
+    Args:
+        save_path (str): main save path in OS
+        quote (str): quote coin abbreviation
+        base (str): base coin abbreviation
+        frequency (str): data frequency of coin files
+        exc_names (list): exchanges to include
+                          (Default to all exchange folders)
+        columns (list): columns to include (Default to ['ClosePrice'])
+        how (str): 'outer' or 'inner' alignment (Default to 'outer')
+        out_path (str): optional CSV path to write the panel to
+
+    Raises:
+        FileNotFoundError: occurs if no exchange has the given pair
+
+    Returns:
+        (obj): pandas data frame indexed by time
+    """
+    if columns is None:
+        columns = ['ClosePrice']
+    pair_files = find_pair_files(save_path, quote, base, frequency,
+                                 exc_names)
+    if not pair_files:
+        raise FileNotFoundError(
+            f'No {quote}/{base} coin file with {frequency} frequency '
+            f'was found in {save_path}')
+    series = []
+    for exc_name, file_paths in pair_files.items():
+        df = read_pair_series(file_paths, frequency, columns)
+        df.columns = [f'{exc_name}_{col}' for col in columns]
+        series.append(df)
+    panel = pd.concat(series, axis=1, join=how, sort=True)
+    panel.index.name = 'Time'
+    if out_path is not None:
+        panel.to_csv(out_path, sep=';', na_rep='-',
+                     date_format=CandleBatch.time_format)
+    return panel
@@ -0,0 +1,62 @@
+"""Provides functions planning API requests of a data download.
+
+"""
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def time_blocks(limit, start_date, end_date, freq):
+    """Creates a list including time span for API data request.
+
+    API of some exchanges allow requesting limited number of data per time.
+    time_blocks function creates a bunch of time periods which helps
+    application to downloads all historical data with sequencing requests.
+
+    Blocks follow a fixed grid of 'limit' periods counted from epoch and
+    are clipped to the given dates. So coins of the same pair with
+    different start dates ask for the same blocks where they overlap, and
+    share their downloads.
+
+    Args:
+        limit (int): maximum API request limit of exchange
+        start_date (obj): given start date
+        end_date (obj): given end date
+        freq (str) : given data download frequency
+
+    Returns:
+        blocks (list): time spans between start and end dates.
+    """
+    def select(freq):
+        if freq == 'minutes':
+            return timedelta(minutes=1)
+        if freq == 'hours':
+            return timedelta(hours=1)
+        if freq == 'days':
+            return timedelta(days=1)
+        if freq == 'weeks':
+            return timedelta(weeks=1)
+        if freq == 'months':
+            return timedelta(weeks=4)
+
+    interval = select(freq)*limit
+    blocks = []
+    while start_date < end_date:
+        # end of the grid window including start date
+        block_end = start_date + interval - (start_date - EPOCH) % interval
+        blocks.append([start_date, min(block_end, end_date)])
+        start_date = block_end
+    return blocks
+
+
+def skip_unlisted(blocks, listing_date):
+    """Removes time blocks ending before the first candle of a pair.
+
+    Args:
+        blocks (list): time spans given by time_blocks
+        listing_date (obj): date of first candle of pair
+
+    Returns:
+        list: time spans which may include candles
+    """
+    return [block for block in blocks if block[1] > listing_date]
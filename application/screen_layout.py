@@ -25,12 +25,12 @@ class Layout:
     """
 
     @classmethod
-    def create(cls, exc_list, save_folder, start_date,
+    def create(cls, exc_names, save_folder, start_date,
                start_hour, end_date, end_hour):
         """Creates screen layout.
 
         Args:
-            exc_list (list): list of exchange objects
+            exc_names (list): names of exchanges
             save_folder (str): default path of save folder
             start_date (str): default start date
             start_hour (str): default start hour
@@ -43,7 +43,7 @@ class Layout:
         # TanBlue theme is selected for this project
         sg.theme('TanBlue')
 
-        return [[sg.Column(cls.__col1_layout(exc_list),
+        return [[sg.Column(cls.__col1_layout(exc_names),
                            vertical_alignment='top'),
                  sg.Column(cls.__col2_layout(save_folder,
                                              start_date,
@@ -52,11 +52,11 @@ class Layout:
                                              end_hour))]]
 
     @staticmethod
-    def __col1_layout(exc_list):
+    def __col1_layout(exc_names):
         """Creates layout of colum1.
 
         Args:
-            exc_list (list): list of exchange objects
+            exc_names (list): names of exchanges
 
         Returns:
             list: layout of column1
@@ -64,8 +64,8 @@ class Layout:
 
         # table variables
         table_headings = ['Exchange Name']
-        table_values = [[exc.name] for exc in exc_list]
-        table_rows = len(exc_list)
+        table_values = [[name] for name in exc_names]
+        table_rows = len(exc_names)
 
         return [[sg.Text('Select Crypto Exchange')],
                 [sg.Table(table_values,
@@ -103,6 +103,25 @@ class Layout:
                           enable_events=True,
                           background_color='white',
                           text_color='Black')],
+                [sg.Text('Filter:'),
+                 sg.Input('', size=(14, 1),
+                          enable_events=True,
+                          key='-coin_filter-'),
+                 sg.Text('Sort:'),
+                 sg.InputCombo(('Cryptocurrency',
+                                'Trade Pair',
+                                'Last Update',
+                                'Start Date',
+                                'Frequency'),
+                               default_value='Cryptocurrency',
+                               enable_events=True,
+                               readonly=True,
+                               key='-coin_sort-',
+                               size=(14, 1)),
+                 sg.Button('<', key='-prev_page-'),
+                 sg.Text('Page 1/1 (0 coins)', size=(22, 1),
+                         key='-coins_page-'),
+                 sg.Button('>', key='-next_page-')],
                 [sg.Column(cls.__col2_bot_left_layout(save_folder,
                                                       start_date,
                                                       start_hour,
@@ -0,0 +1,92 @@
+"""Provides functions refreshing the newest candles of many coins.
+
+A full update downloads every time block since the last update of a
+coin. The tail mode asks each exchange only for the page of the newest
+candles, so hundreds of coins are refreshed within seconds.
+
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from application.classes.cancel_cls import CancelToken
+from application.classes.candle_cls import FREQUENCY_SECONDS
+
+
+def new_candles(data, coin, now=None):
+    """Selects newest candles which continue the stored candles of a coin.
+
+    Nothing is selected if the coin was never downloaded or if the
+    newest candles do not reach its last update, since adding them would
+    leave a gap in the coin file. Candles of periods which have not
+    closed yet are left for a later refresh, as they still change.
+
+    Args:
+        data (obj): candle batch of newest candles in time order
+        coin (obj): target coin
+        now (float): epoch seconds of current time (Default to None)
+
+    Returns:
+        (obj): candle batch of closed candles after last update
+    """
+    if coin.last_update is None or not len(data):
+        return data.take(slice(0))
+    now = time.time() if now is None else now
+    seconds = FREQUENCY_SECONDS[coin.frequency]
+    last = int(coin.last_update.float_timestamp)
+    if data.time[0] > last + seconds:
+        return data.take(slice(0))
+    return data.take((data.time > last) & (data.time + seconds <= now))
+
+
+def tail_coin(model, exc, coin, count, token=None):
+    """Downloads the newest candles of a coin and adds them to its file.
+
+    Args:
+        model (obj): model of application
+        exc (obj): exchange possessing coin
+        coin (obj): target coin
+        count (int): number of newest candles
+        token (obj): cancel token of download (Default to None)
+
+    Returns:
+        (dict): 'candles' downloaded, 'added' to file and 'last' candle
+                time, or 'error' message if download failed
+    """
+    try:
+        data, added = model.download_latest(exc, coin, count, token)
+    except (ConnectionError, OSError, ValueError, KeyError) as err:
+        # requests errors are OSErrors, open breakers ConnectionErrors
+        return {'error': str(err)}
+    return {'candles': len(data), 'added': added,
+            'last': int(data.time[-1]) if len(data) else None}
+
+
+def tail_coins(model, items, count, workers=32, token=None):
+    """Refreshes the newest candles of coins concurrently.
+
+    Requests to one exchange still follow its own rate limits, so the
+    coins of different exchanges are what runs in parallel. A coin
+    failing with an unexpected error does not stop the others.
+
+    Args:
+        model (obj): model of application
+        items (list): (exchange, coin) pairs
+        count (int): number of newest candles of each coin
+        workers (int): number of threads (Default to 32)
+        token (obj): cancel token of downloads (Default to None)
+
+    Returns:
+        (dict): result of tail_coin by coin file name
+    """
+    token = token if token is not None else CancelToken()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {coin.file_name: executor.submit(tail_coin, model, exc,
+                                                   coin, count, token)
+                   for exc, coin in items}
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as err:
+                results[name] = {'error': f'{type(err).__name__}: {err}'}
+        return results
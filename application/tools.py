@@ -0,0 +1,362 @@
+"""Provides command line tools of the application.
+
+Run 'cryptoasset-data-tools --help' to see available commands.
+
+"""
+import argparse
+import os
+
+from application.classes.jobqueue_cls import JobQueue
+
+
+def enqueue(args, model):
+    """Adds jobs of coin files to a shared job queue.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.worker_func import enqueue_coin
+    queue = JobQueue(args.queue)
+    exc = model.get_exchange(args.exchange)
+    for file_name in args.coin_files:
+        coin = model.load_coin(exc, os.path.basename(file_name))
+        listing = None
+        if coin.last_update is None:
+            listing = model.listing_date(exc, coin)
+        count = enqueue_coin(queue, exc, coin, listing)
+        print(f'{coin.file_name}: {count} jobs added')
+
+
+def worker(args, model):
+    """Runs a download worker of a shared job queue.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.worker_func import run_worker
+    try:
+        run_worker(JobQueue(args.queue), model, args.id, args.lease)
+    except FileNotFoundError as err:
+        print(err)
+    finally:
+        model.save_throttle_limits()
+
+
+def queue_status(args, model):
+    """Prints number of jobs in each status of a shared job queue.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    queue = JobQueue(args.queue)
+    for status, count in sorted(queue.counts().items()):
+        print(f'{status}: {count}')
+    for coin_file, waiting in sorted(queue.stalled().items()):
+        print(f'{coin_file}: stalled by a failed job, {waiting} finished '
+              f'jobs waiting (run requeue to retry)')
+
+
+def requeue(args, model):
+    """Makes failed jobs of a shared job queue pending again.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    queue = JobQueue(args.queue)
+    for coin_file in args.coin_files or [None]:
+        count = queue.requeue(coin_file)
+        print(f'{coin_file or "all coins"}: {count} jobs requeued')
+
+
+def serve(args, model):
+    """Runs the local read API server of stored candles.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.classes.server_cls import SeriesServer
+    server = SeriesServer((args.host, args.port), model.sys.save_path)
+    print(f'Serving {model.sys.save_path} on http://{args.host}:{args.port}')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def compact(args, model):
+    """Sorts and deduplicates candles of coin files.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.compaction_func import compact_files, find_coin_files
+    file_paths = args.coin_files or find_coin_files(model.sys.save_path)
+    results = compact_files(file_paths, args.workers, args.chunk_rows)
+    for path, result in results.items():
+        name = os.path.basename(path)
+        if 'error' in result:
+            print(f'{name}: {result["error"]}')
+        elif result['rows'] is None:
+            print(f'{name}: already compact')
+        else:
+            print(f'{name}: {result["rows"]} rows, '
+                  f'{result["rows"] - result["written"]} duplicates removed')
+
+
+def export(args, model):
+    """Writes column files of coin files for local readers.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.classes.columns_cls import ColumnStore
+    from application.compaction_func import find_coin_files
+    for path in args.coin_files or find_coin_files(model.sys.save_path):
+        store = ColumnStore(path)
+        store.rebuild()
+        print(f'{os.path.basename(path)}: {store.manifest["rows"]} rows')
+
+
+def import_trades(args, model):
+    """Adds candles of a bulk trades file to a coin file.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.import_func import clip_to_coin
+    from application.import_func import import_trades as aggregate
+    exc = model.get_exchange(args.exchange)
+    coin = model.load_coin(exc, os.path.basename(args.coin_file))
+    # candles take the price format of candles downloaded by the API
+    data = clip_to_coin(aggregate(args.trades_file, coin.frequency,
+                                  args.workers,
+                                  prices=exc.candle_prices), coin)
+    model.save_downloaded_data(exc, coin, data)
+    print(f'{coin.file_name}: {len(data)} candles added')
+
+
+def tail(args, model):
+    """Adds the newest candles of coins to their files.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    import application.filemodel_func as backend
+    from application.tail_func import tail_coins
+    # given coin files belong to the exchange named in their file name
+    coin_files = {}
+    for file_name in args.coin_files:
+        file_name = os.path.basename(file_name)
+        info = backend.parse_coin_file_name(file_name)
+        coin_files.setdefault(info['Exchange'], []).append(file_name)
+    items = []
+    for name in args.exchange or list(coin_files) or model.exc_names:
+        exc = model.get_exchange(name)
+        file_names = coin_files.get(exc.name, []) if coin_files else [
+            os.path.basename(path) for path in
+            backend.get_coin_files(exc, model.sys.save_path)]
+        items += [(exc, model.load_coin(exc, os.path.basename(file_name)))
+                  for file_name in file_names]
+    results = tail_coins(model, items, args.count, args.workers)
+    for name, result in results.items():
+        if 'error' in result:
+            print(f'{name}: {result["error"]}')
+        else:
+            print(f'{name}: {result["added"]} of {result["candles"]} '
+                  f'candles added')
+
+
+def audit(args, model):
+    """Checks quality of candles of coin files and saves their reports.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.compaction_func import find_coin_files
+    from application.validation_func import audit_coin_file
+    for path in args.coin_files or find_coin_files(model.sys.save_path):
+        try:
+            report = audit_coin_file(path)
+        except (OSError, ValueError) as err:
+            print(f'{os.path.basename(path)}: {err}')
+            continue
+        issues = ', '.join(f'{rule} {count}' for rule, count
+                           in report['issues'].items() if count)
+        print(f'{os.path.basename(path)}: {report["bad"]} of '
+              f'{report["rows"]} rows bad' + (f' ({issues})' if issues
+                                              else ''))
+
+
+def densify(args, model):
+    """Fills empty periods between stored candles of coin files.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.compaction_func import find_coin_files
+    from application.densify_func import densify_coin_file
+    for path in args.coin_files or find_coin_files(model.sys.save_path):
+        try:
+            result = densify_coin_file(path, args.policy)
+        except (OSError, RuntimeError) as err:
+            print(f'{os.path.basename(path)}: {err}')
+            continue
+        added = result['written'] - result['rows']
+        print(f'{os.path.basename(path)}: {added} candles added')
+
+
+def analytics(args, model):
+    """Builds derived series of coin files and prints their latest values.
+
+    Args:
+        args (obj): parsed command line arguments
+        model (obj): model of application
+    """
+    from application.classes.analytics_cls import SeriesAnalytics
+    from application.compaction_func import find_coin_files
+    for path in args.coin_files or find_coin_files(model.sys.save_path):
+        store = SeriesAnalytics(path, args.window)
+        if store.state is None or args.rebuild:
+            store.rebuild()
+        latest = store.latest() or {}
+        print(f'{os.path.basename(path)}: ' + ', '.join(
+            f'{name} {value:.6g}' for name, value in latest.items()
+            if name != 'time'))
+
+
+def create_parser():
+    """Creates command line argument parser.
+
+    Returns:
+        (obj): argument parser
+    """
+    parser = argparse.ArgumentParser(
+        prog='cryptoasset-data-tools',
+        description='Tools of Cryptocurrency Historical Data Downloader. '
+        'Coin files are read from the save folder in config.ini.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    cmd = commands.add_parser('enqueue', help='add coin downloads to a '
+                              'shared job queue')
+    cmd.add_argument('--queue', required=True, help='job queue database')
+    cmd.add_argument('--exchange', required=True, help='exchange name')
+    cmd.add_argument('coin_files', nargs='+', help='coin file names')
+    cmd.set_defaults(func=enqueue)
+
+    cmd = commands.add_parser('worker', help='download jobs of a shared '
+                              'job queue')
+    cmd.add_argument('--queue', required=True, help='job queue database')
+    cmd.add_argument('--id', help='unique worker id')
+    cmd.add_argument('--lease', type=float, default=120,
+                     help='job lease in seconds')
+    cmd.set_defaults(func=worker)
+
+    cmd = commands.add_parser('queue-status', help='show jobs of a shared '
+                              'job queue')
+    cmd.add_argument('--queue', required=True, help='job queue database')
+    cmd.set_defaults(func=queue_status)
+
+    cmd = commands.add_parser('requeue', help='retry failed jobs of a '
+                              'shared job queue')
+    cmd.add_argument('--queue', required=True, help='job queue database')
+    cmd.add_argument('coin_files', nargs='*', help='coin file names '
+                     '(Default to all coins)')
+    cmd.set_defaults(func=requeue)
+
+    cmd = commands.add_parser('serve', help='serve stored candles over a '
+                              'local HTTP API')
+    cmd.add_argument('--host', default='127.0.0.1', help='host to listen')
+    cmd.add_argument('--port', type=int, default=8765, help='port to listen')
+    cmd.set_defaults(func=serve)
+
+    cmd = commands.add_parser('compact', help='sort and deduplicate '
+                              'candles of coin files')
+    cmd.add_argument('--workers', type=int, help='number of processes')
+    cmd.add_argument('--chunk-rows', type=int, default=500000,
+                     help='rows sorted in memory by each process')
+    cmd.add_argument('coin_files', nargs='*', help='coin file paths '
+                     '(Default to all coin files of the save folder)')
+    cmd.set_defaults(func=compact)
+
+    cmd = commands.add_parser('export', help='write column files of coin '
+                              'files for local readers')
+    cmd.add_argument('coin_files', nargs='*', help='coin file paths '
+                     '(Default to all coin files of the save folder)')
+    cmd.set_defaults(func=export)
+
+    cmd = commands.add_parser('import-trades', help='add candles of a bulk '
+                              'trade history file to a coin file')
+    cmd.add_argument('--exchange', default='Kraken', help='exchange name')
+    cmd.add_argument('--workers', type=int, help='number of processes')
+    cmd.add_argument('coin_file', help='coin file name')
+    cmd.add_argument('trades_file', help="CSV file of 'timestamp,price,"
+                     "volume' trade rows in time order")
+    cmd.set_defaults(func=import_trades)
+
+    cmd = commands.add_parser('audit', help='check quality of candles of '
+                              'coin files')
+    cmd.add_argument('coin_files', nargs='*', help='coin file paths '
+                     '(Default to all coin files of the save folder)')
+    cmd.set_defaults(func=audit)
+
+    cmd = commands.add_parser('densify', help='fill empty periods between '
+                              'candles of coin files')
+    cmd.add_argument('--policy', choices=('ffill', 'zero', 'nan'),
+                     default='ffill', help='how empty periods are filled')
+    cmd.add_argument('coin_files', nargs='*', help='coin file paths '
+                     '(Default to all coin files of the save folder)')
+    cmd.set_defaults(func=densify)
+
+    cmd = commands.add_parser('analytics', help='build returns, VWAP, '
+                              'volatility and rolling extremes of coin files')
+    cmd.add_argument('--window', type=int, help='candles of rolling series '
+                     '(Default to window of existing analytics or 20)')
+    cmd.add_argument('--rebuild', action='store_true',
+                     help='compute again from all candles')
+    cmd.add_argument('coin_files', nargs='*', help='coin file paths '
+                     '(Default to all coin files of the save folder)')
+    cmd.set_defaults(func=analytics)
+
+    cmd = commands.add_parser('tail', help='add the newest candles of '
+                              'coins to their files')
+    cmd.add_argument('--exchange', action='append', help='exchange name, '
+                     'may be repeated (Default to all exchanges)')
+    cmd.add_argument('--count', type=int, default=300,
+                     help='number of newest candles of each coin')
+    cmd.add_argument('--workers', type=int, default=32,
+                     help='number of threads')
+    cmd.add_argument('coin_files', nargs='*', help='coin file names, '
+                     'each refreshed in the exchange of its name '
+                     '(Default to all coin files of the exchanges)')
+    cmd.set_defaults(func=tail)
+    return parser
+
+
+def run(argv=None):
+    """Executes a command line tool.
+
+    Args:
+        argv (list): command line arguments (Default to sys.argv)
+    """
+    args = create_parser().parse_args(argv)
+    from application.model_view_controller import Model
+    try:
+        args.func(args, Model())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    run()
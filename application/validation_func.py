@@ -0,0 +1,218 @@
+"""Provides functions checking quality of candles.
+
+Exchanges sometimes give candles with high below low, prices which are
+not positive or times which repeat or go backwards. Candles are checked
+column by column, so batches are validated at download speed.
+
+In 'flag' mode bad candles are saved like others and only counted in the
+quality report of the coin file. In 'quarantine' mode they are moved to
+a quarantine file next to the report in the '.meta' folder of exchange.
+
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import application.filemodel_func as backend
+from application.classes.candle_cls import CandleBatch
+
+VALIDATION_MODES = ('off', 'flag', 'quarantine')
+
+
+def check_candles(data, last_time=None):
+    """Finds candles breaking each quality rule.
+
+    Missing prices (e.g. Kraken has no high, low and open prices) break
+    no rule. Downloads start again at the last saved candle, so the first
+    candle of its time replaces it and is not counted as repeated.
+
+    Args:
+        data (obj): candle batch in saved order
+        last_time (int): epoch seconds of the last candle saved before
+                         batch (Default to None)
+
+    Returns:
+        (dict): boolean numpy masks of candles by rule name
+    """
+    prices = np.vstack([data.high, data.low, data.open, data.close])
+    with np.errstate(invalid='ignore'):
+        issues = {
+            'high_below_low': data.high < data.low,
+            'price_not_positive': (prices <= 0).any(axis=0),
+            'price_outside_range': ((data.open > data.high) |
+                                    (data.close > data.high) |
+                                    (data.open < data.low) |
+                                    (data.close < data.low)),
+            'volume_negative': data.volume < 0}
+    # latest time saved before each candle
+    previous = np.maximum.accumulate(np.r_[
+        np.iinfo(np.int64).min if last_time is None else last_time,
+        data.time])[:-1]
+    issues['time_repeated'] = data.time == previous
+    overlap = np.flatnonzero(data.time == last_time)[:1]
+    issues['time_repeated'][overlap] = False
+    issues['time_backwards'] = data.time < previous
+    return issues
+
+
+def _report(issues, bad):
+    """Counts candles breaking each quality rule.
+
+    Args:
+        issues (dict): masks of candles by rule name
+        bad (obj): mask of candles breaking any rule
+
+    Returns:
+        (dict): numbers of 'rows', 'bad' rows and rows by rule
+    """
+    return {'rows': len(bad), 'bad': int(bad.sum()),
+            'issues': {rule: int(mask.sum())
+                       for rule, mask in issues.items()}}
+
+
+def validate(data, last_time=None):
+    """Splits a batch into good and bad candles.
+
+    Args:
+        data (obj): candle batch in saved order
+        last_time (int): epoch seconds of the last candle saved before
+                         batch (Default to None)
+
+    Returns:
+        good, bad, report (obj, obj, dict): candle batches of good and
+                                            bad candles, and counts of
+                                            candles by rule
+    """
+    issues = check_candles(data, last_time)
+    bad = np.logical_or.reduce(list(issues.values()))
+    return data.take(~bad), data.take(bad), _report(issues, bad)
+
+
+def merge_reports(old, new):
+    """Adds counts of a quality report to another.
+
+    Args:
+        old (dict): report so far
+        new (dict): report of new candles
+
+    Returns:
+        (dict): report of all candles
+    """
+    issues = dict(old.get('issues', {}))
+    for rule, count in new['issues'].items():
+        issues[rule] = issues.get(rule, 0) + count
+    return {'rows': old.get('rows', 0) + new['rows'],
+            'bad': old.get('bad', 0) + new['bad'],
+            'issues': issues}
+
+
+def read_report(file_path):
+    """Reads quality report of a coin file.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (dict): report, empty if coin file has none
+    """
+    try:
+        with open(backend.sidecar_path(file_path, '.quality.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_report(file_path, report):
+    """Saves quality report of a coin file.
+
+    Args:
+        file_path (str): path of coin file
+        report (dict): quality report
+    """
+    path = backend.sidecar_path(file_path, '.quality.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(report, f)
+    os.replace(path + '.tmp', path)
+
+
+def quarantine(file_path, bad, issues):
+    """Appends bad candles to quarantine file of a coin file.
+
+    Args:
+        file_path (str): path of coin file
+        bad (obj): candle batch of bad candles
+        issues (list): rule names broken by each bad candle
+    """
+    df = bad.to_frame()
+    df['issues'] = issues
+    df.to_csv(backend.sidecar_path(file_path, '.quarantine.csv'),
+              header=False, index=False, sep=';', mode='a', na_rep='-',
+              date_format=CandleBatch.time_format)
+
+
+def screen_candles(file_path, data, last_time=None, mode='flag'):
+    """Validates candles before they are saved to a coin file.
+
+    Args:
+        file_path (str): path of coin file
+        data (obj): candle batch to save
+        last_time (int): epoch seconds of the last saved candle
+                         (Default to None)
+        mode (str): one of VALIDATION_MODES (Default to 'flag')
+
+    Raises:
+        ValueError: occurs if mode is not supported
+
+    Returns:
+        (obj): candle batch to save
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f'{mode} is not a supported validation mode!')
+    if mode == 'off' or not len(data):
+        return data
+    issues = check_candles(data, last_time)
+    bad = np.logical_or.reduce(list(issues.values()))
+    save_report(file_path, merge_reports(read_report(file_path),
+                                         _report(issues, bad)))
+    if mode == 'flag' or not bad.any():
+        return data
+    quarantine(file_path, data.take(bad), [
+        ','.join(rule for rule, mask in issues.items() if mask[i])
+        for i in np.flatnonzero(bad)])
+    return data.take(~bad)
+
+
+def read_file_rows(file_path):
+    """Reads candles of a coin file in written order.
+
+    Unlike backend.read_candles, repeated and unordered candles are kept.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (obj): candle batch in written order, empty if file has no
+               candles yet
+    """
+    try:
+        df = pd.read_csv(file_path, sep=';', comment='#', header=None,
+                         na_values='-', parse_dates=[0], index_col=0)
+    except pd.errors.EmptyDataError:
+        return CandleBatch.empty()  # only info lines are written
+    return CandleBatch.from_frame(df)
+
+
+def audit_coin_file(file_path):
+    """Checks all candles of a coin file and saves its quality report.
+
+    Args:
+        file_path (str): path of coin file
+
+    Returns:
+        (dict): quality report of coin file
+    """
+    _, _, report = validate(read_file_rows(file_path))
+    save_report(file_path, report)
+    return report
@@ -0,0 +1,190 @@
+"""Provides functions of distributed download workers.
+
+Workers on several machines share one JobQueue database and download
+time blocks of coins in parallel, each with its own rate limits. Finished
+blocks are merged into the normal coin files of the save folder.
+
+"""
+import os
+import socket
+import threading
+import uuid
+
+import arrow
+
+import application.filemodel_func as backend
+import application.planner_func as planner
+from application.classes.cancel_cls import CancelToken, DownloadCancelled
+from application.classes.candle_cls import CandleBatch
+
+
+def enqueue_coin(queue, exc, coin, listing_date=None):
+    """Adds time blocks of a coin download to the job queue.
+
+    Coins which are already downloaded are updated to the present date.
+
+    Args:
+        queue (obj): shared job queue
+        exc (obj): exchange possessing coin
+        coin (obj): coin to download
+        listing_date (obj): first candle date of coin's pair, blocks
+                            before it are skipped (Default to None)
+
+    Returns:
+        int: number of jobs added
+    """
+    start_date, end_date = coin.start_date, coin.end_date
+    if coin.last_update is not None:
+        start_date, end_date = coin.last_update, arrow.utcnow()
+    blocks = planner.time_blocks(exc.max_API_requests,
+                                 start_date,
+                                 end_date,
+                                 coin.frequency)
+    if listing_date is not None:
+        blocks = planner.skip_unlisted(blocks, listing_date)
+    return queue.enqueue(exc.name, coin.file_name,
+                         [(int(block[0].float_timestamp),
+                           int(block[1].float_timestamp))
+                          for block in blocks])
+
+
+def check_coin_files(queue, model):
+    """Checks that coin files of unmerged jobs exist in the save folder.
+
+    Each worker merges finished blocks into the coin files of its own
+    save folder, so the folder must be shared by all workers.
+
+    Args:
+        queue (obj): shared job queue
+        model (obj): model of application
+
+    Raises:
+        FileNotFoundError: occurs if a coin file of the queue is missing
+    """
+    missing = [os.path.join(exc_name, coin_file)
+               for exc_name, coin_file in queue.unmerged_coins()
+               if not os.path.isfile(os.path.join(model.sys.save_path,
+                                                  exc_name, coin_file))]
+    if missing:
+        raise FileNotFoundError(
+            f'Coin files of queued jobs are missing in save folder '
+            f'{model.sys.save_path} (is it the shared save folder?): '
+            + ', '.join(missing))
+
+
+def merge_results(queue, model, coin_file):
+    """Appends finished blocks of a coin to its coin file in time order.
+
+    Args:
+        queue (obj): shared job queue
+        model (obj): model of application
+        coin_file (str): file name of coin
+
+    Returns:
+        int: number of merged blocks
+    """
+    def writer(exc_name, file_name, results):
+        exc = model.get_exchange(exc_name)
+        coin = model.load_coin(exc, file_name)
+        data = CandleBatch.concat([CandleBatch.from_bytes(result)
+                                   for result in results])
+        file_path = backend.get_coin_file(exc, file_name,
+                                          model.sys.save_path)
+        size = os.path.getsize(file_path)
+        model.save_downloaded_data(exc, coin, data)
+        return lambda: backend.truncate_coin_file(file_path, size)
+
+    return queue.merge(coin_file, writer)
+
+
+def _keep_lease(queue, job, worker_id, lease_seconds, token, done):
+    """Sends heartbeats of a job until it is done.
+
+    Job is cancelled if worker loses its lease.
+
+    Args:
+        queue (obj): shared job queue
+        job (dict): leased job
+        worker_id (str): id of worker
+        lease_seconds (float): duration of lease
+        token (obj): cancel token of job
+        done (obj): event set when job is done
+    """
+    while not done.wait(lease_seconds / 3):
+        if not queue.heartbeat(job['id'], worker_id, lease_seconds):
+            token.cancel()
+            break
+
+
+def run_job(queue, model, job, worker_id, lease_seconds, token):
+    """Downloads a leased time block and stores its candles in queue.
+
+    Args:
+        queue (obj): shared job queue
+        model (obj): model of application
+        job (dict): leased job
+        worker_id (str): id of worker
+        lease_seconds (float): duration of lease
+        token (obj): cancel token of worker
+    """
+    job_token = CancelToken()
+    unregister = token.on_cancel(job_token.cancel)
+    done = threading.Event()
+    threading.Thread(target=_keep_lease,
+                     args=(queue, job, worker_id, lease_seconds,
+                           job_token, done),
+                     daemon=True).start()
+    try:
+        exc = model.get_exchange(job['exchange'])
+        coin = model.load_coin(exc, job['coin_file'])
+        time = [arrow.get(job['start_time']), arrow.get(job['end_time'])]
+        data = model.download_data(exc, coin, time, job_token)
+    except DownloadCancelled:
+        if not token.cancelled:
+            return  # lease is lost, job belongs to another worker now
+        queue.fail(job['id'], worker_id, 'worker stopped')
+        raise
+    except (ConnectionError, OSError, ValueError, KeyError) as err:
+        queue.fail(job['id'], worker_id, err)
+    else:
+        if queue.complete(job['id'], worker_id, data.to_bytes()):
+            merge_results(queue, model, job['coin_file'])
+    finally:
+        done.set()
+        unregister()
+
+
+def run_worker(queue, model, worker_id=None, lease_seconds=120,
+               idle_wait=5, token=None):
+    """Leases and downloads jobs until the worker is cancelled.
+
+    Args:
+        queue (obj): shared job queue
+        model (obj): model of application
+        worker_id (str): unique id of worker
+                         (Default to host name and a random suffix)
+        lease_seconds (float): duration of job leases (Default to 120)
+        idle_wait (float): seconds to wait when no job is available
+                           (Default to 5)
+        token (obj): cancel token stopping the worker (Default to None)
+
+    Raises:
+        FileNotFoundError: occurs if coin files of queued jobs are not in
+                           the save folder of worker
+    """
+    check_coin_files(queue, model)
+    if worker_id is None:
+        worker_id = f'{socket.gethostname()}-{uuid.uuid4().hex[:8]}'
+    token = token if token is not None else CancelToken()
+    while not token.cancelled:
+        job = queue.lease(worker_id, lease_seconds)
+        if job is None:
+            # merges blocks finished by workers which stopped afterwards
+            for coin_file in queue.coin_files('done'):
+                merge_results(queue, model, coin_file)
+            token.wait(idle_wait)
+            continue
+        try:
+            run_job(queue, model, job, worker_id, lease_seconds, token)
+        except DownloadCancelled:
+            break
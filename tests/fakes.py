@@ -0,0 +1,49 @@
+"""Provides a fake exchange and coin shared by tests.
+"""
+import math
+from application.classes.candle_cls import CandleBatch
+from application.classes.exchange_base_cls import Exchange
+
+
+class FakeExchange(Exchange):
+    """Exchange of a pair listed at a given time, one candle per minute
+
+    Candles of a time block are given newest first, as some APIs do.
+    """
+
+    name = 'Fake'
+    website = api_website = api_key = secret_key = None
+    max_API_requests = 100
+
+    def __init__(self, listing=0):
+        super().__init__()
+        self.listing = listing
+        self.requests = 0
+
+    def provide_available_coins(self):
+        return ''
+
+    def correct_downloaded_data(self, downloaded_data):
+        return downloaded_data
+
+    def download_hist_data(self, coin, time, token=None):
+        self.requests += 1
+        start = max(time[0].float_timestamp, self.listing)
+        times = list(range(math.ceil(start / 60) * 60,
+                           math.ceil(time[1].float_timestamp / 60) * 60,
+                           60))[::-1]
+        return CandleBatch(times, *[[1] * len(times)] * 5)
+
+
+class Coin:
+    """Coin of a pair of the fake exchange
+    """
+
+    quote, base, frequency = 'XBT', 'EUR', 'minutes'
+
+    def __init__(self, last_update=None, name='XBT', start_date=None,
+                 end_date=None):
+        self.last_update = last_update
+        self.start_date = start_date
+        self.end_date = end_date
+        self.file_name = f'{name}_XBT_EUR_minutes_Fake_01-01-2021.csv'
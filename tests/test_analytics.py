@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from application.classes.analytics_cls import SeriesAnalytics
+from application.classes.candle_cls import CandleBatch
+
+
+class TestSeriesAnalytics(unittest.TestCase):
+    """Validate SeriesAnalytics class
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name,
+                                 'Bitcoin_XBT_EUR_minutes_Kraken_01-01-2020.csv')
+        rng = np.random.default_rng(1)
+        close = 100 + np.cumsum(rng.normal(size=50))
+        self.data = CandleBatch(np.arange(50) * 60, close + 1, close - 1,
+                                close, close, rng.uniform(1, 2, 50))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_incremental_equals_full(self):
+        store = SeriesAnalytics(self.path, window=5)
+        for start in range(0, 50, 7):
+            store.update(self.data.take(slice(start, start + 7)))
+        store.update(self.data.take(slice(40, 45)))  # already added
+        res = SeriesAnalytics(self.path).frame()
+        close = pd.Series(self.data.close)
+        returns = close.pct_change()
+        typical = (self.data.high + self.data.low + self.data.close) / 3
+        np.testing.assert_allclose(res['return'].values[1:],
+                                   returns.values[1:])
+        np.testing.assert_allclose(
+            res['vwap'].values,
+            np.cumsum(typical * self.data.volume) /
+            np.cumsum(self.data.volume))
+        np.testing.assert_allclose(res['volatility'].values[5:],
+                                   returns.rolling(5).std().values[5:])
+        np.testing.assert_allclose(
+            res['high'].values,
+            pd.Series(self.data.high).rolling(5, min_periods=1).max())
+        np.testing.assert_allclose(
+            res['low'].values,
+            pd.Series(self.data.low).rolling(5, min_periods=1).min())
+        self.assertEqual(store.latest()['time'], 49 * 60)
+
+    def test_other_window_needs_rebuild(self):
+        SeriesAnalytics(self.path, window=5).update(self.data)
+        self.assertIsNone(SeriesAnalytics(self.path, window=10).state)
+        self.assertIsNotNone(SeriesAnalytics(self.path).state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from application.classes.bucket_cls import SharedTokenBucket
+
+
+class TestSharedTokenBucket(unittest.TestCase):
+    """Validate methods of SharedTokenBucket class
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'rates.db')
+        self.now = 1000.0
+        clock = lambda: self.now
+        # two buckets of the same name act like two processes
+        self.first = SharedTokenBucket(self.path, 'Kraken', 0.5, clock=clock)
+        self.second = SharedTokenBucket(self.path, 'Kraken', 0.5,
+                                        clock=clock)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_budget_is_shared(self):
+        self.assertEqual(self.first.try_take(), 0)
+        self.assertAlmostEqual(self.second.try_take(), 2)
+        self.now += 2
+        self.assertEqual(self.second.try_take(), 0)
+
+    def test_buckets_are_separate_by_name(self):
+        other = SharedTokenBucket(self.path, 'Exmo', 0.5)
+        self.assertEqual(self.first.try_take(), 0)
+        self.assertEqual(other.try_take(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from application.classes.cache_cls import SeriesCache
+
+
+class TestSeriesCache(unittest.TestCase):
+    """Validate methods of SeriesCache class
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.folder.name, f'coin{i}.csv')
+            with open(path, 'w') as f:
+                f.write(f'row{i}\n')
+            self.paths.append(path)
+        self.loads = 0
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def load(self, path):
+        self.loads += 1
+        with open(path) as f:
+            return f.read()
+
+    def test_hit_and_miss(self):
+        cache = SeriesCache()
+        self.assertEqual(cache.get(self.paths[0], 'text', self.load), 'row0\n')
+        self.assertEqual(cache.get(self.paths[0], 'text', self.load), 'row0\n')
+        self.assertEqual(self.loads, 1)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_changed_file_is_reloaded(self):
+        cache = SeriesCache()
+        cache.get(self.paths[0], 'text', self.load)
+        with open(self.paths[0], 'a') as f:
+            f.write('row3\n')
+        res = cache.get(self.paths[0], 'text', self.load)
+        self.assertEqual(res, 'row0\nrow3\n')
+        self.assertEqual(self.loads, 2)
+
+    def test_invalidate(self):
+        cache = SeriesCache()
+        cache.get(self.paths[0], 'text', self.load)
+        cache.invalidate(self.paths[0])
+        cache.get(self.paths[0], 'text', self.load)
+        self.assertEqual(self.loads, 2)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = SeriesCache(max_bytes=20)
+        size = lambda data: 10
+        cache.get(self.paths[0], 'text', self.load, size)
+        cache.get(self.paths[1], 'text', self.load, size)
+        cache.get(self.paths[0], 'text', self.load, size)
+        cache.get(self.paths[2], 'text', self.load, size)
+        cache.get(self.paths[0], 'text', self.load, size)
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['bytes'], 20)
+        cache.get(self.paths[1], 'text', self.load, size)
+        self.assertEqual(self.loads, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
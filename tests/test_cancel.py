@@ -0,0 +1,45 @@
+import threading
+import time
+import unittest
+from application.classes.cancel_cls import CancelToken, DownloadCancelled
+
+
+class TestCancelToken(unittest.TestCase):
+    """Validate methods of CancelToken class
+    """
+
+    def test_not_cancelled(self):
+        token = CancelToken()
+        self.assertFalse(token.cancelled)
+        self.assertFalse(token.wait(0))
+        token.raise_if_cancelled()
+
+    def test_cancel(self):
+        token = CancelToken()
+        token.cancel()
+        self.assertTrue(token.cancelled)
+        with self.assertRaises(DownloadCancelled):
+            token.raise_if_cancelled()
+
+    def test_sleep_is_interrupted(self):
+        token = CancelToken()
+        threading.Timer(0.05, token.cancel).start()
+        start = time.monotonic()
+        with self.assertRaises(DownloadCancelled):
+            token.sleep(10)
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_callbacks(self):
+        token = CancelToken()
+        closed = []
+        token.on_cancel(lambda: closed.append(1))
+        unregister = token.on_cancel(lambda: closed.append(2))
+        unregister()
+        token.cancel()
+        self.assertEqual(closed, [1])
+        token.on_cancel(lambda: closed.append(3))
+        self.assertEqual(closed, [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
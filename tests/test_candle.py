@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+import numpy as np
+import application.filemodel_func as backend
+from application.classes.candle_cls import CandleBatch, epoch_seconds, \
+    iso_seconds
+
+
+class TestCandleBatch(unittest.TestCase):
+    """Validate methods of CandleBatch class
+    """
+
+    def setUp(self):
+        self.data = CandleBatch([60, 120, 180], [2, 3, 4], [1, 2, 3],
+                                [1, 2, 3], [2, 3, np.nan], [5, 6, 7])
+
+    def assertBatchEqual(self, first, second):
+        for col in CandleBatch.columns:
+            np.testing.assert_array_equal(getattr(first, col),
+                                          getattr(second, col))
+
+    def test_columns(self):
+        self.assertEqual(len(self.data), 3)
+        self.assertEqual(self.data.time.dtype, np.int64)
+        self.assertEqual(self.data.close.dtype, np.float64)
+        self.assertEqual(self.data.nbytes, 6 * 3 * 8)
+
+    def test_take(self):
+        self.assertEqual(self.data.take([2, 0]).time.tolist(), [180, 60])
+        mask = self.data.time > 60
+        self.assertEqual(self.data.take(mask).high.tolist(), [3, 4])
+        self.assertEqual(self.data.reversed().time.tolist(), [180, 120, 60])
+
+    def test_concat(self):
+        joined = CandleBatch.concat([self.data.take(slice(0, 1)),
+                                     CandleBatch.empty(),
+                                     self.data.take(slice(1, None))])
+        self.assertBatchEqual(joined, self.data)
+        self.assertEqual(len(CandleBatch.concat([])), 0)
+
+    def test_from_rows(self):
+        data = CandleBatch.from_rows([[1609459260000, '1', '2', '3', '4', '5']],
+                                     order=(0, 4, 3, 1, 2, 5))
+        self.assertEqual(data.time.tolist(), [1609459260])
+        self.assertEqual(data.high.tolist(), [4])
+        self.assertEqual(data.open.tolist(), [1])
+
+    def test_frame_round_trip(self):
+        df = self.data.to_frame(['Time', 'High', 'Low', 'Open', 'Close',
+                                 'Volume'])
+        self.assertEqual(df.columns[0], 'Time')
+        self.assertBatchEqual(CandleBatch.from_frame(df.set_index('Time')),
+                              self.data)
+
+    def test_bytes_round_trip(self):
+        self.assertBatchEqual(CandleBatch.from_bytes(self.data.to_bytes()),
+                              self.data)
+
+
+class TestTimes(unittest.TestCase):
+    """Validate time conversions of candles
+    """
+
+    def test_epoch_seconds(self):
+        self.assertEqual(epoch_seconds([1609459200]).tolist(), [1609459200])
+        self.assertEqual(epoch_seconds(['1609459200500']).tolist(),
+                         [1609459200])
+        self.assertEqual(epoch_seconds([1609459200123456]).tolist(),
+                         [1609459200])
+        self.assertEqual(epoch_seconds([1609459200123456789]).tolist(),
+                         [1609459200])
+        self.assertEqual(epoch_seconds([1609459200.7]).tolist(),
+                         [1609459200])
+
+    def test_iso_seconds(self):
+        self.assertEqual(iso_seconds(['2021-01-01T00:00:00Z',
+                                      '2021-01-01T01:00:00+01:00']).tolist(),
+                         [1609459200, 1609459200])
+
+
+class TestSaveData(unittest.TestCase):
+    """Validate CSV format of saved candles
+    """
+
+    def test_save_data(self):
+        with tempfile.TemporaryDirectory() as path:
+            os.makedirs(os.path.join(path, 'Kraken'))
+            exc = SimpleNamespace(name='Kraken')
+            coin = SimpleNamespace(
+                file_name='XBT_XBT_USD_minutes_Kraken_01-01-2021.csv')
+            data = CandleBatch([1609459200, 1609459260], [np.nan] * 2,
+                               [np.nan] * 2, [np.nan] * 2, [10, 10.5],
+                               [0.25, 1])
+            backend.save_data(exc, coin, data, path)
+            with open(os.path.join(path, 'Kraken', coin.file_name)) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines, ['2021-01-01 00:00:00;-;-;-;10.0;0.25',
+                                     '2021-01-01 00:01:00;-;-;-;10.5;1.0'])
+            read = backend.read_candles(os.path.join(path, 'Kraken',
+                                                     coin.file_name))
+            self.assertEqual(read.time.tolist(), data.time.tolist())
+            self.assertTrue(np.isnan(read.high).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
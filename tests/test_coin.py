@@ -0,0 +1,138 @@
+import unittest
+from types import SimpleNamespace
+import arrow
+from application.classes.coin_cls import Coin, CoinCollection
+
+try:
+    from application.model_view_controller import View
+except ImportError:  # GUI framework is not installed
+    View = None
+
+EXCHANGE = SimpleNamespace(name='Kraken')
+
+
+def make_coin(name, quote='XBT', base='EUR', start='01-01-2021'):
+    return Coin(EXCHANGE, {'Name': name, 'Quote': quote, 'Base': base,
+                           'StartDate': start, 'StartHour': '00:00:00',
+                           'EndDate': '02-01-2021', 'EndHour': '00:00:00',
+                           'Frequency': 'minutes', 'LastUpdate': None})
+
+
+class TestCoin(unittest.TestCase):
+    """Validate methods of Coin class
+    """
+
+    def test_table_row(self):
+        coin = make_coin('bitcoin')
+        self.assertEqual(coin.file_name,
+                         'bitcoin_XBT_EUR_minutes_Kraken_01-01-2021.csv')
+        self.assertEqual(coin.table_row, ['bitcoin', 'XBT/EUR', '-',
+                                          '01-01-2021 00:00:00', 'minutes'])
+        coin.last_update = arrow.get('2021-01-01T12:00:00')
+        self.assertEqual(coin.table_row[2], '01-01-2021 12:00:00')
+
+
+class TestCoinCollection(unittest.TestCase):
+    """Validate methods of CoinCollection class
+    """
+
+    def test_add_and_remove(self):
+        first, second = make_coin('bitcoin'), make_coin('ether', 'ETH')
+        coins = CoinCollection([first, second])
+        self.assertEqual(len(coins), 2)
+        self.assertIn(first, coins)
+        version = coins.version
+        coins.remove(first)
+        self.assertNotIn(first, coins)
+        self.assertEqual(list(coins), [second])
+        self.assertGreater(coins.version, version)
+
+    def test_same_file_name(self):
+        coins = CoinCollection([make_coin('bitcoin')])
+        again = make_coin('bitcoin')
+        coins.add(again)
+        self.assertEqual(list(coins), [again])
+        # same name with another start date is another coin
+        coins.add(make_coin('bitcoin', start='01-02-2021'))
+        self.assertEqual(len(coins), 2)
+
+    def test_remove_missing(self):
+        coins = CoinCollection()
+        version = coins.version
+        coins.remove(make_coin('bitcoin'))
+        self.assertEqual(coins.version, version)
+
+    def test_remove_while_iterating(self):
+        coins = CoinCollection([make_coin(f'coin{i}') for i in range(5)])
+        for coin in coins:
+            coins.remove(coin)
+        self.assertEqual(len(coins), 0)
+
+
+class FakeElement:
+    """Records the last value given to a window element
+    """
+
+    def update(self, value):
+        self.value = value
+
+
+@unittest.skipIf(View is None, 'PySimpleGUI is not installed')
+class TestCoinTable(unittest.TestCase):
+    """Validate paging, filtering and sorting of the coins table
+    """
+
+    def setUp(self):
+        self.view = View()
+        self.view.page_size = 2
+        self.view.window = {'-coins_table-': FakeElement(),
+                            '-coins_page-': FakeElement()}
+        self.exc = SimpleNamespace(coins=CoinCollection(
+            [make_coin(name) for name in ('dog', 'cat', 'bat', 'ant', 'eel')]))
+
+    def names(self):
+        return [coin.name for coin in self.view.visible_coins]
+
+    def test_pages(self):
+        self.view.update_coin_tbl(self.exc)
+        self.assertEqual(self.names(), ['ant', 'bat'])
+        self.assertEqual(self.view.window['-coins_page-'].value,
+                         'Page 1/3 (5 coins)')
+        self.view.turn_coin_page(2)
+        self.view.update_coin_tbl(self.exc)
+        self.assertEqual(self.names(), ['eel'])
+        # pages past the last one show the last page
+        self.view.turn_coin_page(1)
+        self.view.update_coin_tbl(self.exc)
+        self.assertEqual(self.names(), ['eel'])
+
+    def test_filter_and_sort(self):
+        self.view.filter_coin_tbl(' A ')
+        self.view.update_coin_tbl(self.exc)
+        self.assertEqual(self.names(), ['ant', 'bat'])
+        self.view.filter_coin_tbl('AT')
+        self.view.update_coin_tbl(self.exc)
+        self.assertEqual(self.names(), ['bat', 'cat'])
+        self.exc.coins.add(make_coin('cow', start='01-01-2020'))
+        self.view.sort_coin_tbl('Start Date')
+        self.view.filter_coin_tbl('')
+        self.view.update_coin_tbl(self.exc)
+        self.assertEqual(self.names(), ['cow', 'dog'])
+
+    def test_empty_table(self):
+        self.exc.coins = CoinCollection()
+        self.view.update_coin_tbl(self.exc)
+        self.assertEqual(self.view.visible_coins, [])
+        self.assertEqual(self.view.window['-coins_table-'].value,
+                         [['-', '-', '-', '-', '-']])
+
+    def test_state_per_view(self):
+        self.view.turn_coin_page(1)
+        self.view.update_coin_tbl(self.exc)
+        other = View()
+        self.assertEqual(other.visible_coins, [])
+        self.assertIsNot(other.visible_coins, self.view.visible_coins)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from application.classes.candle_cls import CandleBatch
+from application.classes.columns_cls import ColumnStore, pa
+
+
+class TestColumnStore(unittest.TestCase):
+    """Validate methods of ColumnStore class
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name,
+                                 'Bitcoin_XBT_EUR_minutes_Kraken_01-01-2020.csv')
+        with open(self.path, 'w') as f:
+            f.write('#Bitcoin XBT EUR\n#-----Time;HighPrice\n'
+                    '2020-01-01 00:00:00;2;1;1;2;5\n')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def save(self, data):
+        size = os.path.getsize(self.path)
+        data.to_frame().to_csv(self.path, header=False, index=False,
+                               sep=';', mode='a', na_rep='-',
+                               date_format=CandleBatch.time_format)
+        ColumnStore(self.path).append(data, size)
+
+    def test_append(self):
+        self.save(CandleBatch([1577836860], [3], [2], [2], [3], [float('nan')]))
+        self.save(CandleBatch([1577836920], [4], [3], [3], [4], [1]))
+        data = ColumnStore(self.path).candles()
+        self.assertEqual(list(data.time),
+                         [1577836800, 1577836860, 1577836920])
+        self.assertEqual(list(data.close), [2, 3, 4])
+
+    def test_overlapping_saves(self):
+        # each save downloads the last saved candle again
+        self.save(CandleBatch([1577836800, 1577836860], [2, 3], [1, 2],
+                              [1, 2], [2, 3], [5, 1]))
+        self.save(CandleBatch([1577836800, 1577836860, 1577836920],
+                              [2, 4, 4], [1, 2, 3], [1, 2, 3], [2, 3.5, 4],
+                              [5, 2, 1]))
+        store = ColumnStore(self.path)
+        # mapped files are read before rebuild writes them again
+        appended = store.candles().to_frame()
+        table = store.arrow_table().to_pydict() if pa is not None else None
+        store.rebuild()
+        rebuilt = store.candles().to_frame()
+        self.assertEqual(list(appended.close), [2, 3.5, 4])
+        self.assertTrue(appended.equals(rebuilt))
+        if table is not None:
+            self.assertEqual(table, store.arrow_table().to_pydict())
+
+    def test_rebuild_after_outside_change(self):
+        store = ColumnStore(self.path)
+        store.rebuild()
+        with open(self.path, 'a') as f:
+            f.write('2020-01-01 00:01:00;3;2;2;3;1\n')
+        self.save(CandleBatch([1577836920], [4], [3], [3], [4], [1]))
+        self.assertEqual(store.manifest['rows'], 3)
+
+    @unittest.skipIf(pa is None, 'pyarrow is not installed')
+    def test_arrow_table(self):
+        self.save(CandleBatch([1577836860], [3], [2], [2], [3], [1]))
+        table = ColumnStore(self.path).arrow_table()
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column('close').to_pylist(), [2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
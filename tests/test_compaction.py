@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from application.compaction_func import compact_coin_file, is_compact
+
+
+class TestCompaction(unittest.TestCase):
+    """Validate functions of compaction module
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name,
+                                 'Bitcoin_XBT_EUR_minutes_Kraken_01-01-2020.csv')
+        self.header = '#Bitcoin XBT EUR\n#-----Time;HighPrice\n'
+        rows = ['2020-01-01 00:03:00;3\n', '2020-01-01 00:01:00;1\n',
+                '2020-01-01 00:02:00;2\n', '2020-01-01 00:01:00;10\n',
+                '2020-01-01 00:04:00;4\n', '2020-01-01 00:03:00;30\n',
+                '2020-01-01 00:00:00;0']
+        with open(self.path, 'w') as f:
+            f.write(self.header + ''.join(rows))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_compact_coin_file(self):
+        self.assertFalse(is_compact(self.path))
+        res = compact_coin_file(self.path, chunk_rows=2)
+        self.assertEqual(res, {'rows': 7, 'written': 5})
+        with open(self.path) as f:
+            content = f.read()
+        self.assertEqual(content, self.header +
+                         '2020-01-01 00:00:00;0\n2020-01-01 00:01:00;10\n'
+                         '2020-01-01 00:02:00;2\n2020-01-01 00:03:00;30\n'
+                         '2020-01-01 00:04:00;4\n')
+        self.assertTrue(is_compact(self.path))
+
+    def test_compact_file_is_skipped(self):
+        compact_coin_file(self.path)
+        res = compact_coin_file(self.path)
+        self.assertIsNone(res['rows'])
+
+
+if __name__ == "__main__":
+    unittest.main()
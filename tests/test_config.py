@@ -31,6 +31,36 @@ class TestConfig(unittest.TestCase):
         res = con.start_hour
         self.assertEqual(res, start_hour)
 
+    def test_parse_workers(self):
+        con = Config()
+        res = con.parse_workers
+        self.assertEqual(res, 0)
+
+    def test_cache_bytes(self):
+        con = Config()
+        res = con.cache_bytes
+        self.assertEqual(res, 64 * 2**20)
+
+    def test_column_export(self):
+        con = Config()
+        res = con.column_export
+        self.assertFalse(res)
+
+    def test_validation(self):
+        con = Config()
+        res = con.validation
+        self.assertEqual(res, 'flag')
+
+    def test_fill_policy(self):
+        con = Config()
+        res = con.fill_policy
+        self.assertEqual(res, 'off')
+
+    def test_analytics_window(self):
+        con = Config()
+        res = con.analytics_window
+        self.assertEqual(res, 0)
+
     def test_check_config_file(self):
         con = Config()
         import os
@@ -0,0 +1,26 @@
+import unittest
+from application.decode_func import kraken_cursor, loads
+
+
+class TestDecode(unittest.TestCase):
+    """Validate decoding of exchange responses
+    """
+
+    def test_loads(self):
+        self.assertEqual(loads(b'[[1, "2.5"]]'), [[1, '2.5']])
+        with self.assertRaises(ValueError):
+            loads(b'<html>')
+
+    def test_kraken_cursor(self):
+        page = b'{"error":[],"result":{"XXBTZEUR":[["1.5","0.1",' \
+               b'1616663618.1,"b","l",""]],"last":"1616663618100000000"}}'
+        self.assertEqual(kraken_cursor(page), '1616663618100000000')
+
+    def test_kraken_error(self):
+        page = b'{"error":["EGeneral:Too many requests"]}'
+        self.assertIsNone(kraken_cursor(page))
+        self.assertIsNone(kraken_cursor(b'{"error":[],"result":{}}'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from application.classes.candle_cls import CandleBatch
+from application.densify_func import (densify, densify_coin_file, is_dense,
+                                      offset)
+
+
+class TestDensify(unittest.TestCase):
+    """Validate functions of densify module
+    """
+
+    def setUp(self):
+        self.data = CandleBatch([60, 130, 300], [2, 3, 4], [1, 2, 3],
+                                [1, 2, 3], [2, 3, 4], [5, 6, 7])
+
+    def test_ffill(self):
+        res = densify(self.data, 'minutes', 'ffill')
+        self.assertEqual(res.time.tolist(), [60, 120, 180, 240, 300])
+        self.assertEqual(res.close.tolist(), [2, 3, 3, 3, 4])
+        self.assertEqual(res.high.tolist(), [2, 3, 3, 3, 4])
+        self.assertEqual(res.volume.tolist(), [5, 6, 0, 0, 7])
+        self.assertTrue(is_dense(res, 'minutes'))
+        self.assertEqual(offset(res, 240, 'minutes'), 3)
+
+    def test_zero_and_nan(self):
+        res = densify(self.data, 'minutes', 'zero')
+        self.assertTrue(np.isnan(res.close[2]))
+        self.assertEqual(res.volume[2], 0)
+        res = densify(self.data, 'minutes', 'nan')
+        self.assertTrue(np.isnan(res.volume[2]))
+
+    def test_continues_last_candle(self):
+        last = CandleBatch([0], [1], [1], [1], [1.5], [1])
+        res = densify(self.data.take(slice(1, None)), 'minutes', 'ffill',
+                      last)
+        self.assertEqual(res.time.tolist(), [60, 120, 180, 240, 300])
+        self.assertEqual(res.close.tolist(), [1.5, 3, 3, 3, 4])
+
+    def test_epoch_grid(self):
+        data = CandleBatch([90, 200], [2, 3], [1, 2], [1, 2], [2, 3], [1, 1])
+        res = densify(data, 'minutes', 'ffill')
+        self.assertEqual(res.time.tolist(), [60, 120, 180])
+        self.assertEqual(res.close.tolist(), [2, 2, 3])
+        last = CandleBatch([30], [1], [1], [1], [1.5], [1])
+        res = densify(data.take(slice(1, None)), 'minutes', 'ffill', last)
+        self.assertEqual(res.time.tolist(), [60, 120, 180])
+        self.assertEqual(res.close.tolist(), [1.5, 1.5, 3])
+
+    def test_ffill_missing_prices(self):
+        # Kraken candles only have close prices
+        nan = float('nan')
+        data = CandleBatch([0, 180], [nan, nan], [nan, nan], [nan, nan],
+                           [10, 20], [1, 2])
+        res = densify(data, 'minutes', 'ffill')
+        self.assertEqual(res.close.tolist(), [10, 10, 10, 20])
+        self.assertEqual(res.volume.tolist(), [1, 0, 0, 2])
+        for col in ('high', 'low', 'open'):
+            self.assertTrue(np.isnan(getattr(res, col)).all(), col)
+        last = CandleBatch([0], [nan], [nan], [nan], [10], [1])
+        res = densify(data.take(slice(1, None)), 'minutes', 'ffill', last)
+        self.assertEqual(res.close.tolist(), [10, 10, 20])
+        self.assertTrue(np.isnan(res.high).all())
+
+    def test_densify_coin_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,
+                                'Bitcoin_XBT_EUR_minutes_Kraken_01-01-2020.csv')
+            with open(path, 'w') as f:
+                f.write('#Bitcoin XBT EUR\n#-----Time;HighPrice;LowPrice;'
+                        'OpenPrice;ClosePrice;Volume\n'
+                        '2020-01-01 00:00:00;2;1;1;2;1\n'
+                        '2020-01-01 00:03:00;3;1;1;3;1\n')
+            res = densify_coin_file(path)
+            self.assertEqual(res, {'rows': 2, 'written': 4})
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[2:], [
+                '2020-01-01 00:00:00;2.0;1.0;1.0;2.0;1.0',
+                '2020-01-01 00:01:00;2.0;2.0;2.0;2.0;0.0',
+                '2020-01-01 00:02:00;2.0;2.0;2.0;2.0;0.0',
+                '2020-01-01 00:03:00;3.0;1.0;1.0;3.0;1.0'])
+
+
+if __name__ == "__main__":
+    unittest.main()
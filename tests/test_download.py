@@ -0,0 +1,129 @@
+import threading
+import unittest
+from types import SimpleNamespace
+import arrow
+from application.classes.cancel_cls import CancelToken
+from application.classes.throttle_cls import AdaptiveLimiter
+
+try:
+    from application.model_view_controller import Controller
+except ImportError:  # GUI framework is not installed
+    Controller = None
+
+
+class FakeWindow:
+    """Records events written to the GUI window
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def write_event_value(self, key, value):
+        self.events.append((key, value))
+
+
+class FakeModel:
+    """Downloads blocks numbered by their start, failing the first once
+    """
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.first_downloaded = threading.Event()
+        self.failed = False
+        self.saved = []
+        self.sys = SimpleNamespace(parse_workers=1)
+
+    def fetch_data(self, exc, coin, time, token=None):
+        part = time[0]
+        if part == 0 and not self.failed:
+            self.failed = True
+            # the next block is downloaded before the limit is cut
+            self.first_downloaded.wait(5)
+            self.limiter.limit = 1
+            raise ConnectionError('connection reset')
+        if part == 1:
+            self.first_downloaded.set()
+        return [part]
+
+    def parse_data(self, exc, payload):
+        return payload
+
+    def save_downloaded_data(self, exc, coin, data):
+        self.saved += data
+
+
+@unittest.skipIf(Controller is None, 'PySimpleGUI is not installed')
+class TestDownload(unittest.TestCase):
+    """Validate block scheduling of Controller downloads
+    """
+
+    def setUp(self):
+        limiter = AdaptiveLimiter(limit=2, maximum=4)
+        self.exc = SimpleNamespace(session=SimpleNamespace(
+            limiter=limiter,
+            breaker=SimpleNamespace(retry_after=lambda: 0)))
+        self.coin = SimpleNamespace(last_update=1)
+        self.model = FakeModel(limiter)
+        self.window = FakeWindow()
+        self.controller = Controller(self.model,
+                                     SimpleNamespace(window=self.window))
+        self.controller.retry_delay = 0
+
+    def test_limit_cut_during_download(self):
+        blocks = [(0, 1), (1, 2), (2, 3)]
+        worker = threading.Thread(
+            target=self.controller._Controller__download,
+            args=(self.exc, self.coin, blocks, CancelToken()), daemon=True)
+        worker.start()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(self.model.saved, [0, 1, 2])
+        self.assertEqual(self.window.events[-1][1][1], 'completed')
+        self.assertIn('-RETRY-', [key for key, _ in self.window.events])
+
+    def test_unexpected_error(self):
+        def parse_data(exc, payload):
+            raise KeyError('result')
+        self.model.parse_data = parse_data
+        self.model.failed = True
+        token = CancelToken()
+        self.controller._Controller__download(self.exc, self.coin,
+                                              [(1, 2)], token)
+        keys = [key for key, _ in self.window.events]
+        self.assertIn('-ERROR-', keys)
+        self.assertEqual(self.window.events[-1], ('-FINISHED-',
+                                                  (token, 'failed')))
+
+
+@unittest.skipIf(Controller is None, 'PySimpleGUI is not installed')
+class TestSkipUnlisted(unittest.TestCase):
+    """Validate removal of blocks before listing date by Controller
+    """
+
+    def skip(self, listing):
+        def listing_date(exc, coin, token=None):
+            if isinstance(listing, Exception):
+                raise listing
+            return listing
+        self.window = FakeWindow()
+        controller = Controller(SimpleNamespace(listing_date=listing_date),
+                                SimpleNamespace(window=self.window))
+        self.blocks = [(arrow.get(i * 100), arrow.get((i + 1) * 100))
+                       for i in range(4)]
+        return controller._Controller__skip_unlisted(
+            None, None, self.blocks, CancelToken())
+
+    def test_blocks_are_skipped(self):
+        self.assertEqual(self.skip(arrow.get(250)), self.blocks[2:])
+        self.assertEqual(self.window.events,
+                         [('-SKIPPED-', ('01-01-1970 00:04', 2))])
+
+    def test_blocks_are_kept(self):
+        for listing in (None, arrow.get(0), ConnectionError('timeout'),
+                        ValueError('bad page')):
+            self.assertEqual(self.skip(listing), self.blocks)
+            self.assertEqual(self.window.events, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
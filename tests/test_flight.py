@@ -0,0 +1,89 @@
+import threading
+import unittest
+from application.classes.cancel_cls import CancelToken, DownloadCancelled
+from application.classes.flight_cls import SingleFlight
+
+
+class WaitingToken(CancelToken):
+    """Signals once its caller waits for another caller's call
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = threading.Event()
+
+    def raise_if_cancelled(self):
+        self.waiting.set()
+        super().raise_if_cancelled()
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Validate methods of SingleFlight class
+    """
+
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow_call(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return self.calls
+
+    def run_leader(self, results, token=None, call=None):
+        call = call if call is not None else self.slow_call
+
+        def leader():
+            try:
+                results.append(self.flights.do('key', call, token))
+            except DownloadCancelled as err:
+                results.append(err)
+        thread = threading.Thread(target=leader)
+        thread.start()
+        self.started.wait(5)
+        return thread
+
+    def test_identical_calls_are_shared(self):
+        results = []
+        thread = self.run_leader(results)
+        waiting = WaitingToken()
+        follower = threading.Thread(
+            target=lambda: results.append(
+                self.flights.do('key', self.slow_call, waiting)))
+        follower.start()
+        self.assertTrue(waiting.waiting.wait(5))
+        self.release.set()
+        thread.join()
+        follower.join()
+        self.assertEqual(results, [1, 1])
+        self.assertEqual(self.calls, 1)
+
+    def test_cancelled_leader_is_not_shared(self):
+        results = []
+        token = CancelToken()
+
+        def cancelled_call():
+            self.started.set()
+            self.release.wait(5)
+            token.raise_if_cancelled()
+        leader_results = []
+        thread = self.run_leader(leader_results, token, cancelled_call)
+        waiting = WaitingToken()
+        follower = threading.Thread(
+            target=lambda: results.append(
+                self.flights.do('key', lambda: 'own result', waiting)))
+        follower.start()
+        self.assertTrue(waiting.waiting.wait(5))
+        token.cancel()
+        self.release.set()
+        thread.join()
+        follower.join()
+        self.assertIsInstance(leader_results[0], DownloadCancelled)
+        self.assertEqual(results, ['own result'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+import arrow
+import numpy as np
+import application.filemodel_func as backend
+import application.tools as tools
+from application.classes.candle_cls import CandleBatch
+from application.classes.exchange_classes import Kraken
+from application.import_func import clip_to_coin, import_trades
+
+
+class TestImportTrades(unittest.TestCase):
+    """Validate functions of trades import module
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'XBTEUR.csv')
+        trades = [(0, 10, 1), (30, 12, 1), (59, 11, 2),
+                  (60, 9, 1), (61, 13, 1), (185, 14, 3)]
+        with open(self.path, 'w') as f:
+            f.writelines(f'{t},{p},{v}\n' for t, p, v in trades)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_import_trades(self):
+        # tiny chunks split minutes between several processes
+        data = import_trades(self.path, 'minutes', workers=2, chunk_bytes=8)
+        self.assertEqual(list(data.time), [0, 60, 120, 180])
+        self.assertEqual(list(data.open), [10, 9, 13, 14])
+        self.assertEqual(list(data.high), [12, 13, 13, 14])
+        self.assertEqual(list(data.low), [10, 9, 13, 14])
+        self.assertEqual(list(data.close), [11, 13, 13, 14])
+        self.assertEqual(list(data.volume), [4, 2, 0, 3])
+
+    def test_import_mean_prices(self):
+        # like Kraken API candles, split minutes count each trade once
+        data = import_trades(self.path, 'minutes', workers=2, chunk_bytes=8,
+                             prices='mean')
+        self.assertEqual(list(data.time), [0, 60, 120, 180])
+        self.assertEqual(list(data.close), [11, 11, 11, 14])
+        self.assertEqual(list(data.volume), [4, 2, 0, 3])
+        for col in ('high', 'low', 'open'):
+            self.assertTrue(np.isnan(getattr(data, col)).all(), col)
+
+    def test_mean_prices_are_rounded(self):
+        with open(self.path, 'w') as f:
+            f.write('0,10,1\n1,10.01,1\n2,10.01,1\n')
+        data = import_trades(self.path, 'minutes', workers=1, prices='mean')
+        self.assertEqual(list(data.close), [10.01])
+
+    def test_unsupported_frequency(self):
+        with self.assertRaises(ValueError):
+            import_trades(self.path, 'seconds')
+        with self.assertRaises(ValueError):
+            import_trades(self.path, 'minutes', prices='vwap')
+
+
+class TestClipToCoin(unittest.TestCase):
+    """Validate selection of imported candles a coin file lacks
+    """
+
+    def setUp(self):
+        self.data = CandleBatch(list(range(0, 600, 60)), *[[1] * 10] * 5)
+
+    def test_new_coin(self):
+        coin = SimpleNamespace(start_date=arrow.get(120),
+                               end_date=arrow.get(360), last_update=None)
+        self.assertEqual(clip_to_coin(self.data, coin).time.tolist(),
+                         [120, 180, 240, 300])
+
+    def test_updated_coin(self):
+        coin = SimpleNamespace(start_date=arrow.get(0),
+                               end_date=arrow.get(600),
+                               last_update=arrow.get(420))
+        self.assertEqual(clip_to_coin(self.data, coin).time.tolist(),
+                         [480, 540])
+
+
+class FakeModel:
+    """Model loading one coin and saving candles to its file
+    """
+
+    def __init__(self, save_path, coin):
+        self.save_path = save_path
+        self.coin = coin
+
+    def get_exchange(self, name):
+        return Kraken()
+
+    def load_coin(self, exc, file_name):
+        return self.coin
+
+    def save_downloaded_data(self, exc, coin, data):
+        backend.save_data(exc, coin, data, self.save_path)
+
+
+class TestImportCommand(unittest.TestCase):
+    """Validate import-trades command from trades file to coin file
+    """
+
+    def test_import_command(self):
+        with tempfile.TemporaryDirectory() as path:
+            os.makedirs(os.path.join(path, 'Kraken'))
+            trades_path = os.path.join(path, 'XBTEUR.csv')
+            with open(trades_path, 'w') as f:
+                f.writelines(f'{60 * i + 5},{10 + i},1\n{60 * i + 6},'
+                             f'{11 + i},1\n' for i in range(6))
+            coin = SimpleNamespace(
+                file_name='Bitcoin_XBT_EUR_minutes_Kraken_01-01-1970.csv',
+                frequency='minutes', start_date=arrow.get(0),
+                end_date=arrow.get(240), last_update=arrow.get(60))
+            args = SimpleNamespace(exchange='Kraken',
+                                   coin_file=coin.file_name,
+                                   trades_file=trades_path, workers=1)
+            tools.import_trades(args, FakeModel(path, coin))
+            data = backend.read_candles(
+                os.path.join(path, 'Kraken', coin.file_name))
+            self.assertEqual(data.time.tolist(), [120, 180])
+            # candles match the format of Kraken API candles
+            self.assertEqual(data.close.tolist(), [12.5, 13.5])
+            self.assertTrue(np.isnan(data.high).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from application.classes.index_cls import SeriesIndex
+
+
+class TestSeriesIndex(unittest.TestCase):
+    """Validate methods of SeriesIndex class
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, 'coin.csv')
+        self.index_path = self.file_path + '.idx'
+        with open(self.file_path, 'w') as f:
+            f.write('#Bitcoin XBT EUR\n#-----Time;HighPrice\n')
+            for day in range(1, 21):
+                f.write(f'2020-01-{day:02d} 00:00:00;{day}\n')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_read_range(self):
+        index = SeriesIndex(self.file_path, self.index_path, step=3)
+        rows = list(index.read_range('2020-01-05', '2020-01-07 00:00:00'))
+        self.assertEqual([row.split(';')[1] for row in rows],
+                         ['5', '6', '7'])
+        self.assertEqual(index.rows, 20)
+
+    def test_incremental_refresh(self):
+        index = SeriesIndex(self.file_path, self.index_path, step=3)
+        index.refresh()
+        with open(self.file_path, 'a') as f:
+            f.write('2020-01-21 00:00:00;21\n2020-01-22 00:0')
+        index = SeriesIndex(self.file_path, self.index_path, step=3)
+        rows = list(index.read_range('2020-01-20'))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(index.rows, 21)
+
+    def test_unsorted_file(self):
+        with open(self.file_path, 'a') as f:
+            f.write('2020-01-03 12:00:00;3.5\n')
+        index = SeriesIndex(self.file_path, self.index_path, step=3)
+        rows = list(index.read_range('2020-01-03', '2020-01-04'))
+        self.assertEqual(len(rows), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from application.classes.jobqueue_cls import JobQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJobQueue(unittest.TestCase):
+    """Validate methods of JobQueue class
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.queue = JobQueue(os.path.join(self.folder.name, 'jobs.db'),
+                              max_attempts=2, clock=self.clock)
+        self.queue.enqueue('Kraken', 'coin.csv', [(0, 10), (10, 20)])
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_lease_in_order(self):
+        first = self.queue.lease('a')
+        second = self.queue.lease('b')
+        self.assertEqual((first['seq'], second['seq']), (0, 1))
+        self.assertIsNone(self.queue.lease('c'))
+
+    def test_expired_lease_is_retried(self):
+        job = self.queue.lease('a', lease_seconds=10)
+        self.clock.now += 11
+        self.assertFalse(self.queue.heartbeat(job['id'], 'b'))
+        retried = self.queue.lease('b')
+        self.assertEqual(retried['id'], job['id'])
+        self.assertEqual(retried['attempts'], 2)
+        self.assertFalse(self.queue.complete(job['id'], 'a', b'x'))
+
+    def test_failed_job_after_max_attempts(self):
+        for _ in range(2):
+            job = self.queue.lease('a')
+            self.queue.fail(job['id'], 'a', 'error')
+        self.assertEqual(self.queue.counts(), {'failed': 1, 'pending': 1})
+
+    def test_merge_keeps_time_order(self):
+        merged = []
+        first = self.queue.lease('a')
+        second = self.queue.lease('a')
+        self.queue.complete(second['id'], 'a', b'second')
+        self.assertEqual(self.queue.merge(
+            'coin.csv', lambda *args: merged.append(args)), 0)
+        self.queue.complete(first['id'], 'a', b'first')
+        self.assertEqual(self.queue.merge(
+            'coin.csv', lambda *args: merged.append(args)), 2)
+        self.assertEqual(merged, [('Kraken', 'coin.csv',
+                                   [b'first', b'second'])])
+        self.assertEqual(self.queue.counts(), {'merged': 2})
+
+    def test_failed_job_stalls_coin(self):
+        merged = []
+        first = self.queue.lease('a')
+        second = self.queue.lease('a')
+        self.queue.complete(second['id'], 'a', b'second')
+        self.queue.fail(first['id'], 'a', 'error')
+        self.queue.fail(self.queue.lease('a')['id'], 'a', 'error')
+        self.assertEqual(self.queue.merge(
+            'coin.csv', lambda *args: merged.append(args)), 0)
+        self.assertEqual(self.queue.stalled(), {'coin.csv': 1})
+        self.assertEqual(self.queue.requeue('other.csv'), 0)
+        self.assertEqual(self.queue.requeue(), 1)
+        self.assertEqual(self.queue.stalled(), {})
+        job = self.queue.lease('b')
+        self.assertEqual((job['id'], job['attempts']), (first['id'], 1))
+        self.queue.complete(job['id'], 'b', b'first')
+        self.assertEqual(self.queue.merge(
+            'coin.csv', lambda *args: merged.append(args)), 2)
+        self.assertEqual(merged, [('Kraken', 'coin.csv',
+                                   [b'first', b'second'])])
+
+    def test_failed_writer(self):
+        for _ in range(2):
+            job = self.queue.lease('a')
+            self.queue.complete(job['id'], 'a', b'x')
+
+        def writer(*args):
+            raise OSError('disk full')
+
+        with self.assertRaises(OSError):
+            self.queue.merge('coin.csv', writer)
+        self.assertEqual(self.queue.counts(), {'done': 2})
+        merged = []
+        self.assertEqual(self.queue.merge(
+            'coin.csv', lambda *args: merged.append(args)), 2)
+        self.assertEqual(len(merged), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
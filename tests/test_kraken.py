@@ -0,0 +1,146 @@
+import json
+import threading
+import unittest
+from urllib.parse import parse_qs, urlparse
+import arrow
+import numpy as np
+import requests
+from application.classes.exchange_classes import Kraken
+from application.classes.session_cls import ApiSession
+from tests.test_session import FakeAdapter
+
+START = 1609459200  # 2021-01-01 00:00:00
+
+
+class TradesAdapter(FakeAdapter):
+    """Answers Trades requests with pages of canned trades
+    """
+
+    def __init__(self, trades, page_size=2, error=None):
+        super().__init__([])
+        # trade times are kept in nanoseconds like Kraken's cursors
+        self.trades = sorted((int(time * 10**9), price, vol)
+                             for price, vol, time in trades)
+        self.page_size = page_size
+        self.error = error
+        self.cursors = []
+        self.lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        since = int(parse_qs(urlparse(request.url).query)['since'][0])
+        if self.error is not None:
+            body = {'error': [self.error]}
+        else:
+            page = [trade for trade in self.trades
+                    if trade[0] > since][:self.page_size]
+            body = {'error': [], 'result': {
+                'XXBTZEUR': [[str(price), str(vol), time / 10**9, 'b', 'l',
+                              ''] for time, price, vol in page],
+                'last': str(page[-1][0] if page else since)}}
+        # sub-ranges are paged by several threads
+        with self.lock:
+            self.cursors.append(since)
+            self.outcomes.append((200, json.dumps(body).encode(), {}))
+            return super().send(request, stream, timeout, **kwargs)
+
+
+class Coin:
+    quote, base, frequency = 'XBT', 'EUR', 'minutes'
+
+
+class TestKraken(unittest.TestCase):
+    """Validate trade paging and granulation of Kraken class
+    """
+
+    def exchange(self, trades, **kwargs):
+        self.adapter = TradesAdapter(trades, **kwargs)
+        transport = requests.Session()
+        transport.mount('https://', self.adapter)
+        exc = Kraken()
+        exc._Exchange__session = ApiSession('Kraken', retries=0,
+                                            transport=transport)
+        return exc
+
+    def download(self, exc, start, end):
+        payload = exc.fetch_hist_data(Coin(), [arrow.get(start),
+                                               arrow.get(end)])
+        return exc.parse_hist_data(payload)
+
+    def test_sub_range_seams(self):
+        end = START + 4 * 1800
+        # trades on and around each seam of the four sub-ranges
+        times = [START, START + 30.5] + \
+            [START + i * 1800 + offset for i in (1, 2, 3)
+             for offset in (-0.5, 0, 0.5)] + [end - 1, end, end + 60]
+        exc = self.exchange([(100 + i, 1, time)
+                             for i, time in enumerate(times)])
+        data = self.download(exc, START, end)
+        # every trade of the range is counted once
+        self.assertEqual(np.nansum(data.volume), len(times) - 2)
+        self.assertEqual(data.time[0], START)
+        self.assertEqual(data.time[-1], end - 60)
+        self.assertTrue((np.diff(data.time) == 60).all())
+        # each sub-range starts paging from its own start
+        for i in range(4):
+            self.assertIn((START + i * 1800) * 10**9 - 1,
+                          self.adapter.cursors)
+
+    def test_stops_at_range_end(self):
+        trades = [(1, 1, START + i * 10) for i in range(100)]
+        exc = self.exchange(trades, page_size=5)
+        self.download(exc, START, START + 120)
+        # paging stops with the first page reaching the end
+        self.assertEqual(len(self.adapter.cursors), 3)
+        self.assertLessEqual(max(self.adapter.cursors),
+                             (START + 120) * 10**9)
+
+    def test_stops_without_new_trades(self):
+        exc = self.exchange([(1, 1, START + 5), (2, 1, START + 65)])
+        data = self.download(exc, START, START + 600)
+        self.assertEqual(len(self.adapter.cursors), 2)
+        self.assertEqual(self.adapter.cursors[-1], (START + 65) * 10**9)
+        self.assertEqual(data.time.tolist(), [START, START + 60])
+
+    def test_error_page(self):
+        exc = self.exchange([], error='EQuery:Unknown asset pair')
+        with self.assertRaises(ConnectionError) as err:
+            self.download(exc, START, START + 600)
+        self.assertIn('Unknown asset pair', str(err.exception))
+
+    def test_minute_volumes(self):
+        exc = self.exchange([(10, 0.5, START + 1), (20, 1.5, START + 59),
+                             (30, 2, START + 180.5)], page_size=10)
+        data = self.download(exc, START, START + 600)
+        self.assertEqual(data.time.tolist(),
+                         [START + i * 60 for i in range(4)])
+        self.assertEqual(data.volume.tolist(), [2, 0, 0, 2])
+        # prices of minutes without trades are carried forward
+        self.assertEqual(data.close.tolist(), [15, 15, 15, 30])
+        self.assertTrue(np.isnan(data.high).all())
+
+    def test_empty_range(self):
+        exc = self.exchange([])
+        self.assertEqual(len(self.download(exc, START, START + 600)), 0)
+        self.assertEqual(exc.fetch_hist_data(
+            Coin(), [arrow.get(START), arrow.get(START)]), [])
+
+    def test_find_listing_date(self):
+        exc = self.exchange([(1, 1, START + 5000.5), (1, 1, START + 6000)])
+        self.assertTrue(exc.exact_listing_date)
+        listing = exc.find_listing_date(Coin(), arrow.get(START),
+                                        arrow.get(START + 10000))
+        self.assertEqual(listing, arrow.get(START + 5000))
+        self.assertEqual(self.adapter.cursors, [START * 10**9 - 1])
+        # first trade after the range is not a listing in range
+        self.assertIsNone(exc.find_listing_date(
+            Coin(), arrow.get(START), arrow.get(START + 5000)))
+
+    def test_find_listing_date_error(self):
+        exc = self.exchange([], error='EGeneral:Too many requests')
+        with self.assertRaises(ConnectionError):
+            exc.find_listing_date(Coin(), arrow.get(START),
+                                  arrow.get(START + 600))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import arrow
+import application.planner_func as planner
+from tests.fakes import Coin, FakeExchange
+
+
+class TestListingDate(unittest.TestCase):
+    """Validate listing date search of Exchange class
+    """
+
+    def test_listing_after_start(self):
+        start, end = arrow.get(0), arrow.get(3 * 10**7)
+        exc = FakeExchange(listing=12345660)
+        res = exc.find_listing_date(Coin(), start, end)
+        self.assertEqual(res, arrow.get(12345660))
+        self.assertLess(exc.requests, 25)
+
+    def test_listing_before_start(self):
+        exc = FakeExchange(listing=0)
+        res = exc.find_listing_date(Coin(), arrow.get(600), arrow.get(10**7))
+        self.assertEqual(res, arrow.get(600))
+        self.assertEqual(exc.requests, 1)
+
+    def test_no_candles(self):
+        exc = FakeExchange(listing=10**8)
+        res = exc.find_listing_date(Coin(), arrow.get(0), arrow.get(10**7))
+        self.assertIsNone(res)
+
+    def test_search_is_not_exact(self):
+        self.assertFalse(FakeExchange(listing=0).exact_listing_date)
+
+
+class TestSkipUnlisted(unittest.TestCase):
+    """Validate removal of time blocks before a listing date
+    """
+
+    def test_skip_unlisted(self):
+        blocks = [(arrow.get(i * 100), arrow.get((i + 1) * 100))
+                  for i in range(4)]
+        self.assertEqual(planner.skip_unlisted(blocks, arrow.get(150)),
+                         blocks[1:])
+        # block ending at the listing date has no candles
+        self.assertEqual(planner.skip_unlisted(blocks, arrow.get(200)),
+                         blocks[2:])
+        self.assertEqual(planner.skip_unlisted(blocks, arrow.get(0)), blocks)
+        self.assertEqual(planner.skip_unlisted(blocks, arrow.get(500)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import arrow
+import numpy as np
+from application.classes.candle_cls import CandleBatch
+from tests.fakes import Coin, FakeExchange
+
+try:
+    from application.model_view_controller import Model
+except ImportError:  # GUI framework is not installed
+    Model = None
+
+
+@unittest.skipIf(Model is None, 'PySimpleGUI is not installed')
+class TestModel(unittest.TestCase):
+    """Validate methods of Model class
+    """
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        config = SimpleNamespace(save_path=self.temp.name, validation='off',
+                                 fill_policy='off', column_export=False,
+                                 analytics_window=0, cache_bytes=2**20)
+        patcher = mock.patch.object(Model, '_Model__sys', config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = Model()
+        self.exc = SimpleNamespace(name='Fake')
+        self.coin = SimpleNamespace(
+            file_name='XBT_XBT_EUR_minutes_Fake_01-01-2021.csv',
+            frequency='minutes')
+        os.makedirs(os.path.join(self.temp.name, 'Fake'))
+        self.file_path = os.path.join(self.temp.name, 'Fake',
+                                      self.coin.file_name)
+        with open(self.file_path, 'w') as f:
+            f.write('#coin info\n')
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def candles(self, start, count):
+        times = np.arange(start, start + 60 * count, 60)
+        return CandleBatch(times, *[np.ones(count)] * 5)
+
+    def test_failed_save_is_undone(self):
+        self.model.save_downloaded_data(self.exc, self.coin,
+                                        self.candles(0, 3))
+        size = os.path.getsize(self.file_path)
+        self.model.sys.analytics_window = 5
+        with mock.patch('application.model_view_controller.SeriesAnalytics',
+                        side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.model.save_downloaded_data(self.exc, self.coin,
+                                                self.candles(180, 3))
+        self.assertEqual(os.path.getsize(self.file_path), size)
+
+    def test_download_latest(self):
+        exc = FakeExchange()
+        newest = exc.download_latest(Coin(), 5)
+        coin = Coin(arrow.get(int(newest.time[1])))
+        data, added = self.model.download_latest(exc, coin, 5)
+        with open(self.file_path) as f:
+            rows = f.read().splitlines()[1:]
+        self.assertEqual(len(rows), added)
+        # a new minute may start between the two downloads
+        self.assertGreaterEqual(added, 2)
+        last = arrow.get(rows[-1].split(';')[0])
+        # the candle of the current minute is not closed yet
+        self.assertLess(last.float_timestamp, data.time[-1])
+        self.assertEqual(coin.last_update, last)
+        # candles not reaching the last update would leave a gap
+        coin = Coin(arrow.get(int(newest.time[0]) - 3600))
+        self.assertEqual(self.model.download_latest(exc, coin, 5)[1], 0)
+        with open(self.file_path) as f:
+            self.assertEqual(len(f.read().splitlines()), added + 1)
+
+
+class ListingExchange:
+    """Exchange finding a listing date with a search
+    """
+
+    name = 'Fake'
+
+    def __init__(self, listing, exact):
+        self.listing = listing
+        self.exact_listing_date = exact
+        self.searches = 0
+
+    def probe_window(self, coin):
+        return 6000
+
+    def find_listing_date(self, coin, start, end, token=None):
+        self.searches += 1
+        return self.listing
+
+
+@unittest.skipIf(Model is None, 'PySimpleGUI is not installed')
+class TestListingDate(unittest.TestCase):
+    """Validate caching of listing dates by Model class
+    """
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        config = SimpleNamespace(save_path=self.temp.name, cache_bytes=2**20)
+        patcher = mock.patch.object(Model, '_Model__sys', config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = Model()
+        self.coin = SimpleNamespace(quote='xbt', base='eur',
+                                    start_date=arrow.get(0),
+                                    end_date=arrow.get(10**7))
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_exact_date_is_saved(self):
+        exc = ListingExchange(arrow.get(10**6), exact=True)
+        self.assertEqual(self.model.listing_date(exc, self.coin),
+                         arrow.get(10**6))
+        self.assertEqual(self.model.listing_date(exc, self.coin),
+                         arrow.get(10**6))
+        self.assertEqual(exc.searches, 1)
+
+    def test_search_result_is_not_saved(self):
+        exc = ListingExchange(arrow.get(10**6), exact=False)
+        self.model.listing_date(exc, self.coin)
+        self.model.listing_date(exc, self.coin)
+        self.assertEqual(exc.searches, 2)
+
+    def test_listing_at_start_is_not_saved(self):
+        # pair may have candles before start of coin
+        for listing in (arrow.get(6000), None):
+            exc = ListingExchange(listing, exact=True)
+            self.assertEqual(self.model.listing_date(exc, self.coin),
+                             listing)
+            self.model.listing_date(exc, self.coin)
+            self.assertEqual(exc.searches, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
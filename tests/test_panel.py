@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import application.filemodel_func as backend
+from application.panel_func import build_pair_panel
+
+
+def write_coin_file(save_path, exc_name, file_name, rows):
+    exc_path = os.path.join(save_path, exc_name)
+    os.makedirs(exc_path, exist_ok=True)
+    file_path = os.path.join(exc_path, file_name)
+    with open(file_path, 'w') as f:
+        f.write('#coin info\n')
+        f.writelines(f'{row}\n' for row in rows)
+    return file_path
+
+
+class TestPanel(unittest.TestCase):
+    """Validate functions building cross-exchange panels
+    """
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.path = self.temp.name
+        self.binance = write_coin_file(
+            self.path, 'Binance', 'BTC_BTC_USDT_minutes_Binance_01-01-2021.csv',
+            ['2021-01-01 10:00:00;2;1;1;2;5',
+             '2021-01-01 10:01:00;3;2;2;3;5'])
+        self.kraken = write_coin_file(
+            self.path, 'Kraken', 'XBT_BTC_USDT_minutes_Kraken_01-01-2021.csv',
+            ['2021-01-01 10:02:10;-;-;-;30;1',
+             '2021-01-01 10:00:30;-;-;-;10;1',
+             '2021-01-01 10:00:30;-;-;-;20;1'])
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_parse_coin_file_name(self):
+        info = backend.parse_coin_file_name(self.kraken)
+        self.assertEqual(info['Quote'], 'BTC')
+        self.assertEqual(info['Frequency'], 'minutes')
+        self.assertEqual(info['Exchange'], 'Kraken')
+        with self.assertRaises(ValueError):
+            backend.parse_coin_file_name('BTC_USDT.csv')
+
+    def test_read_coin_data(self):
+        df = backend.read_coin_data(self.kraken)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(df['ClosePrice'].tolist(), [20, 30])
+        self.assertTrue(df['HighPrice'].isna().all())
+
+    def test_aligned_panel(self):
+        panel = build_pair_panel(self.path, 'btc', 'usdt', 'minutes')
+        times = pd.to_datetime(['2021-01-01 10:00', '2021-01-01 10:01',
+                                '2021-01-01 10:02'])
+        self.assertEqual(panel.index.tolist(), times.tolist())
+        self.assertEqual(panel['Binance_ClosePrice'].tolist()[:2], [2, 3])
+        self.assertTrue(pd.isna(panel['Binance_ClosePrice'].iloc[2]))
+        self.assertEqual(panel['Kraken_ClosePrice'].iloc[0], 20)
+        self.assertTrue(pd.isna(panel['Kraken_ClosePrice'].iloc[1]))
+
+    def test_inner_panel(self):
+        panel = build_pair_panel(self.path, 'BTC', 'USDT', 'minutes',
+                                 how='inner')
+        self.assertEqual(len(panel), 1)
+        self.assertEqual(panel.iloc[0].tolist(), [2, 20])
+
+    def test_hours_panel(self):
+        write_coin_file(self.path, 'Binance',
+                        'BTC_BTC_USDT_hours_Binance_01-01-2021.csv',
+                        ['2021-01-01 10:00:00;2;1;1;2;5',
+                         '2021-01-01 11:00:00;3;2;2;3;5'])
+        write_coin_file(self.path, 'Kraken',
+                        'XBT_BTC_USDT_hours_Kraken_01-01-2021.csv',
+                        ['2021-01-01 11:00:20;-;-;-;30;1'])
+        panel = build_pair_panel(self.path, 'BTC', 'USDT', 'hours')
+        times = pd.to_datetime(['2021-01-01 10:00', '2021-01-01 11:00'])
+        self.assertEqual(panel.index.tolist(), times.tolist())
+        self.assertEqual(panel['Kraken_ClosePrice'].iloc[1], 30)
+
+    def test_missing_pair(self):
+        with self.assertRaises(FileNotFoundError):
+            build_pair_panel(self.path, 'ETH', 'USDT', 'minutes')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import threading
+import time
+import unittest
+from application.classes.cancel_cls import CancelToken, DownloadCancelled
+from application.classes.pipeline_cls import Pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    """Validate Pipeline class
+    """
+
+    def test_results_in_order(self):
+        def fetch(item, attempts, token):
+            time.sleep(random.uniform(0, 0.01))
+            return item
+        pipeline = Pipeline([('fetch', fetch, 4),
+                             ('parse', lambda value, token: value * 2, 2)])
+        res = [value for _, value in pipeline.run(list(range(30)))]
+        self.assertEqual(res, [i * 2 for i in range(30)])
+
+    def test_retry(self):
+        retries = []
+
+        def fetch(item, attempts, token):
+            if item == 3 and attempts < 2:
+                raise ConnectionError('failed')
+            return item
+        pipeline = Pipeline([('fetch', fetch, 2)],
+                            retry_errors=(ConnectionError,), max_attempts=3,
+                            on_retry=lambda *args: retries.append(args[:2]))
+        res = [value for _, value in pipeline.run(list(range(6)))]
+        self.assertEqual(res, list(range(6)))
+        self.assertEqual(retries, [(3, 1), (3, 2)])
+
+    def test_failure(self):
+        def parse(value, token):
+            raise ValueError('bad data')
+        pipeline = Pipeline([('fetch', lambda item, attempts, token: item, 1),
+                             ('parse', parse, 1)],
+                            retry_errors=(ValueError,), max_attempts=2)
+        with self.assertRaises(ValueError):
+            list(pipeline.run([1, 2]))
+
+    def test_backpressure(self):
+        fetched = []
+        pipeline = Pipeline([('fetch', lambda item, attempts, token:
+                              fetched.append(item) or item, 4)],
+                            window=3, capacity=1)
+        run = pipeline.run(list(range(20)))
+        next(run)
+        time.sleep(0.2)  # caller is slow, fetching has to wait
+        self.assertLessEqual(len(fetched), 3)
+        self.assertLessEqual(pipeline.occupancy()['in_flight'], 3)
+        self.assertEqual(len(list(run)), 19)
+
+    def test_cancel(self):
+        token = CancelToken()
+        started = threading.Event()
+
+        def fetch(item, attempts, run_token):
+            started.set()
+            run_token.sleep(10)
+        pipeline = Pipeline([('fetch', fetch, 2)])
+        threading.Timer(0.1, token.cancel).start()
+        with self.assertRaises(DownloadCancelled):
+            list(pipeline.run([1, 2, 3], token))
+        self.assertTrue(started.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import threading
+import unittest
+import arrow
+import application.planner_func as planner
+from application.classes.cancel_cls import CancelToken
+from application.classes.candle_cls import CandleBatch
+from application.classes.exchange_base_cls import Exchange
+
+WINDOW = 100 * 60  # seconds of a block of minutes
+
+
+class SharedExchange(Exchange):
+    """Exchange counting fetches, each held until released
+    """
+
+    name = 'Shared'
+    website = api_website = api_key = secret_key = None
+    max_API_requests = 100
+
+    def __init__(self):
+        super().__init__()
+        self.fetches = []
+        self.release = threading.Event()
+
+    def provide_available_coins(self):
+        return ''
+
+    def correct_downloaded_data(self, downloaded_data):
+        return downloaded_data
+
+    def fetch_hist_data(self, coin, time, token=None):
+        self.fetches.append(int(time[0].float_timestamp))
+        self.release.wait(5)
+        return int(time[0].float_timestamp)
+
+    def parse_hist_data(self, payload):
+        return CandleBatch([payload], [1], [1], [1], [1], [1])
+
+
+class WaitingToken(CancelToken):
+    """Signals once its caller waits for another caller's download
+    """
+
+    def __init__(self, waiting):
+        super().__init__()
+        self.waiting = waiting
+
+    def raise_if_cancelled(self):
+        self.waiting.set()
+        super().raise_if_cancelled()
+
+
+class Coin:
+    quote, base, frequency = 'XBT', 'EUR', 'minutes'
+
+
+class TestTimeBlocks(unittest.TestCase):
+    """Validate time blocks of downloads
+    """
+
+    def test_blocks_follow_grid(self):
+        start = arrow.get(10 * WINDOW + 90)
+        blocks = planner.time_blocks(100, start, arrow.get(13 * WINDOW + 30),
+                                     'minutes')
+        self.assertEqual([[int(time.float_timestamp) for time in block]
+                          for block in blocks],
+                         [[10 * WINDOW + 90, 11 * WINDOW],
+                          [11 * WINDOW, 12 * WINDOW],
+                          [12 * WINDOW, 13 * WINDOW],
+                          [13 * WINDOW, 13 * WINDOW + 30]])
+
+    def test_short_and_empty_ranges(self):
+        start = arrow.get(WINDOW + 60)
+        self.assertEqual(planner.time_blocks(100, start, start.shift(
+            minutes=5), 'minutes'), [[start, start.shift(minutes=5)]])
+        self.assertEqual(planner.time_blocks(100, start, start, 'minutes'),
+                         [])
+
+    def test_overlapping_coins_share_downloads(self):
+        exc = SharedExchange()
+        first = planner.time_blocks(100, arrow.get(2 * WINDOW + 600),
+                                    arrow.get(6 * WINDOW), 'minutes')
+        second = planner.time_blocks(100, arrow.get(3 * WINDOW + 120),
+                                     arrow.get(6 * WINDOW), 'minutes')
+        shared = [block for block in first if block in second]
+        self.assertEqual(len(shared), 2)
+        for block in shared:
+            exc.release.clear()
+            waiting = threading.Event()
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(
+                exc.download_hist_data(Coin(), block,
+                                       WaitingToken(waiting))))
+                       for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            # the later download waits for the earlier one
+            self.assertTrue(waiting.wait(5))
+            exc.release.set()
+            for thread in threads:
+                thread.join()
+            start = int(block[0].float_timestamp)
+            self.assertEqual([data.time.tolist() for data in results],
+                             [[start]] * 2)
+        # one fetch per shared window
+        self.assertEqual(exc.fetches, [4 * WINDOW, 5 * WINDOW])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from application.classes.progress_cls import ProgressReporter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressReporter(unittest.TestCase):
+    """Validate methods of ProgressReporter class
+    """
+
+    def setUp(self):
+        self.posts = []
+        self.clock = FakeClock()
+        self.progress = ProgressReporter(self.posts.append, 100,
+                                         interval=0.25, clock=self.clock)
+
+    def test_first_update_is_posted(self):
+        self.progress.update(rows=10)
+        self.assertEqual(len(self.posts), 1)
+        self.assertEqual(self.posts[0]['part'], 1)
+
+    def test_updates_are_coalesced(self):
+        for _ in range(50):
+            self.progress.update(rows=10)
+            self.clock.now += 0.01
+        self.assertEqual(len(self.posts), 2)
+        self.assertEqual(self.progress.rows, 500)
+
+    def test_last_part_is_always_posted(self):
+        progress = ProgressReporter(self.posts.append, 2, clock=self.clock)
+        progress.update()
+        progress.update()
+        self.assertEqual(self.posts[-1]['part'], 2)
+        self.assertEqual(len(self.posts), 2)
+
+    def test_rows_per_sec(self):
+        self.clock.now = 2.0
+        self.progress.update(rows=100)
+        self.assertEqual(self.posts[-1]['rows_per_sec'], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from application.classes.registry_cls import ExchangeRegistry, \
+    find_entry_points
+
+PLUGIN = textwrap.dedent('''
+    from application.classes.exchange_base_cls import Exchange
+
+
+    class PluginExchange(Exchange):
+        name = 'Plugin'
+        website = api_website = api_key = secret_key = None
+        max_API_requests = 100
+
+        def provide_available_coins(self):
+            return ''
+
+        def download_hist_data(self, coin, time, token=None):
+            return []
+
+        def correct_downloaded_data(self, downloaded_data):
+            return downloaded_data
+
+
+    class NotExchange:
+        pass
+    ''')
+
+GROUP = 'test_registry.exchanges'
+
+
+class TestExchangeRegistry(unittest.TestCase):
+    """Validate methods of ExchangeRegistry class
+    """
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.temp.name, 'plugin_exchange.py'),
+                  'w') as f:
+            f.write(PLUGIN)
+        # installed package declaring the plugin as an entry point
+        dist_info = os.path.join(self.temp.name,
+                                 'plugin_exchange-1.0.dist-info')
+        os.makedirs(dist_info)
+        with open(os.path.join(dist_info, 'METADATA'), 'w') as f:
+            f.write('Metadata-Version: 2.1\nName: plugin-exchange\n'
+                    'Version: 1.0\n')
+        with open(os.path.join(dist_info, 'entry_points.txt'), 'w') as f:
+            f.write(f'[{GROUP}]\nPlugin = plugin_exchange:PluginExchange\n'
+                    'Kraken = plugin_exchange:PluginExchange\n')
+        sys.path.insert(0, self.temp.name)
+
+    def tearDown(self):
+        sys.path.remove(self.temp.name)
+        sys.modules.pop('plugin_exchange', None)
+        self.temp.cleanup()
+
+    def test_find_entry_points(self):
+        found = find_entry_points(GROUP)
+        self.assertEqual(sorted(found), ['Kraken', 'Plugin'])
+        self.assertNotIn('plugin_exchange', sys.modules)
+        self.assertEqual(find_entry_points('unknown.group'), {})
+
+    def test_plugin_discovery(self):
+        registry = ExchangeRegistry(GROUP)
+        self.assertIn('Plugin', registry.names)
+        self.assertNotIn('plugin_exchange', sys.modules)
+        exc = registry.get('Plugin')
+        self.assertEqual(exc.name, 'Plugin')
+        self.assertIs(registry.get('Plugin'), exc)
+        # builtin exchanges are not replaced by plugins
+        self.assertEqual(type(registry.get('Kraken')).__name__, 'Kraken')
+
+    def test_lazy_loading(self):
+        registry = ExchangeRegistry('unknown.group')
+        registry.register('Lazy', 'plugin_exchange:PluginExchange')
+        self.assertNotIn('plugin_exchange', sys.modules)
+        self.assertEqual(registry.get('Lazy').name, 'Plugin')
+        self.assertIn('plugin_exchange', sys.modules)
+
+    def test_invalid_exchanges(self):
+        registry = ExchangeRegistry('unknown.group')
+        registry.register('Wrong', 'plugin_exchange:NotExchange')
+        with self.assertRaises(TypeError):
+            registry.get('Wrong')
+        with self.assertRaises(KeyError):
+            registry.get('Unknown')
+
+
+if __name__ == "__main__":
+    unittest.main()
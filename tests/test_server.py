@@ -0,0 +1,113 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from application.classes.server_cls import SeriesServer
+
+
+class TestSeriesServer(unittest.TestCase):
+    """Validate endpoints of SeriesServer class
+    """
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        exc_path = os.path.join(self.temp.name, 'Kraken')
+        os.makedirs(exc_path)
+        self.file_path = os.path.join(
+            exc_path, 'XBT_XBT_EUR_minutes_Kraken_01-01-2021.csv')
+        with open(self.file_path, 'w') as f:
+            f.write('#coin info\n'
+                    '2021-01-01 00:00:00;-;-;-;10;1\n'
+                    '2021-01-01 00:01:00;-;-;-;11;2\n')
+        self.server = SeriesServer(('127.0.0.1', 0), self.temp.name)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.temp.cleanup()
+
+    def get(self, path):
+        conn = http.client.HTTPConnection(*self.server.server_address,
+                                          timeout=5)
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            return response.status, response.read().decode()
+        finally:
+            conn.close()
+
+    def test_coins(self):
+        status, body = self.get('/coins?exchange=Kraken')
+        self.assertEqual(status, 200)
+        self.assertEqual([info['Quote'] for info in json.loads(body)],
+                         ['XBT'])
+
+    def test_series(self):
+        status, body = self.get(
+            '/series?exchange=Kraken&quote=xbt&base=eur&frequency=minutes'
+            '&start=2021-01-01T00:01:00&columns=Time,ClosePrice')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, 'Time;ClosePrice\n2021-01-01 00:01:00;11\n')
+
+    def test_series_keeps_latest_rows(self):
+        # a later file and a row written again replace earlier rows
+        with open(self.file_path, 'a') as f:
+            f.write('2021-01-01 00:01:00;-;-;-;12;3\n')
+        with open(self.file_path.replace('01-01-2021', '01-02-2021'),
+                  'w') as f:
+            f.write('#coin info\n'
+                    '2021-01-01 00:00:00;-;-;-;9;4\n'
+                    '2021-01-01 00:02:00;-;-;-;13;5\n')
+        status, body = self.get(
+            '/series?exchange=Kraken&quote=XBT&base=EUR&frequency=minutes'
+            '&columns=Time,ClosePrice')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, 'Time;ClosePrice\n'
+                               '2021-01-01 00:00:00;9\n'
+                               '2021-01-01 00:01:00;12\n'
+                               '2021-01-01 00:02:00;13\n')
+
+    def test_interrupted_series(self):
+        # a row failing after headers were sent closes the connection
+        with open(self.file_path, 'ab') as f:
+            f.write(b'2021-01-01 00:02:00;-;-;-;\xff;1\n')
+        with socket.create_connection(self.server.server_address,
+                                      timeout=5) as sock:
+            sock.sendall(b'GET /series?exchange=Kraken&quote=XBT&base=EUR'
+                         b'&frequency=minutes HTTP/1.1\r\n'
+                         b'Host: localhost\r\n\r\n')
+            response = b''
+            while True:
+                data = sock.recv(4096)
+                if not data:
+                    break
+                response += data
+        self.assertTrue(response.startswith(b'HTTP/1.1 200'))
+        self.assertNotIn(b'error', response)
+        self.assertFalse(response.endswith(b'0\r\n\r\n'))
+
+    def test_unsafe_exchange(self):
+        for exchange in ('..', '.meta', '../Kraken', self.temp.name,
+                         'Binance'):
+            status, body = self.get(f'/coins?exchange={exchange}')
+            self.assertEqual(status, 400, exchange)
+            self.assertIn('Unknown exchange', json.loads(body)['error'])
+
+    def test_unreadable_file(self):
+        # a coin file replaced by a folder fails while its rows are read
+        os.remove(self.file_path)
+        os.makedirs(self.file_path)
+        status, body = self.get(
+            '/series?exchange=Kraken&quote=XBT&base=EUR&frequency=minutes')
+        self.assertEqual(status, 500)
+        self.assertIn('error', json.loads(body))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import io
+import threading
+import unittest
+import requests
+from requests.adapters import BaseAdapter
+from application.classes.cancel_cls import CancelToken
+from application.classes.session_cls import ApiSession, CircuitBreaker, \
+    CircuitOpenError
+
+
+class FakeAdapter(BaseAdapter):
+    """Answers requests with queued responses or errors
+    """
+
+    def __init__(self, outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        status, body, headers = outcome
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordingToken(CancelToken):
+    """Records waits instead of sleeping
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        # pacing waits are zero without a minimum interval
+        if seconds > 0:
+            self.sleeps.append(seconds)
+
+
+class TestApiSession(unittest.TestCase):
+    """Validate methods of ApiSession class
+    """
+
+    def session(self, outcomes, **kwargs):
+        self.adapter = FakeAdapter(outcomes)
+        transport = requests.Session()
+        transport.mount('https://', self.adapter)
+        self.breaker = kwargs.pop('breaker', CircuitBreaker(threshold=3))
+        return ApiSession('test', breaker=self.breaker,
+                          transport=transport, **kwargs)
+
+    def test_body_and_timeout(self):
+        session = self.session([(200, b'{"a": 1}', {})], timeout=(1, 2))
+        response = session.get('https://api.test/candles')
+        self.assertEqual(response.json(), {'a': 1})
+        self.assertEqual(response.content, b'{"a": 1}')
+        self.assertEqual(response.text, '{"a": 1}')
+        self.assertEqual(self.adapter.timeouts, [(1, 2)])
+
+    def test_retries_with_backoff(self):
+        session = self.session([requests.ConnectionError('reset'),
+                                (502, b'', {}), (200, b'[]', {})],
+                               backoff=2, max_backoff=3)
+        token = RecordingToken()
+        response = session.get('https://api.test/candles', token=token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(token.sleeps), 2)
+        # full jitter below the capped exponential delay
+        self.assertTrue(0 <= token.sleeps[0] <= 2)
+        self.assertTrue(0 <= token.sleeps[1] <= 3)
+        self.assertFalse(self.breaker.is_open)
+
+    def test_retry_after(self):
+        session = self.session([(429, b'', {'Retry-After': '7'}),
+                                (429, b'', {'Retry-After': '120'}),
+                                (200, b'[]', {})], max_backoff=60)
+        token = RecordingToken()
+        session.get('https://api.test/candles', token=token)
+        self.assertEqual(token.sleeps, [7, 60])
+
+    def test_retries_exhausted(self):
+        session = self.session([requests.Timeout('slow')] * 2, retries=1)
+        with self.assertRaises(ConnectionError):
+            session.get('https://api.test/candles', token=RecordingToken())
+        session = self.session([(503, b'', {})] * 2, retries=1)
+        response = session.get('https://api.test/candles',
+                               token=RecordingToken())
+        self.assertEqual(response.status_code, 503)
+
+    def test_breaker_opens(self):
+        session = self.session([(500, b'', {})] * 3, retries=2)
+        session.get('https://api.test/candles', token=RecordingToken())
+        self.assertTrue(self.breaker.is_open)
+        with self.assertRaises(CircuitOpenError) as err:
+            session.get('https://api.test/candles')
+        self.assertGreater(err.exception.retry_after, 0)
+
+    def test_ban_opens_breaker(self):
+        session = self.session([(418, b'', {})] * 3)
+        for _ in range(3):
+            response = session.get('https://api.test/candles')
+            self.assertEqual(response.status_code, 418)
+        self.assertTrue(self.breaker.is_open)
+
+    def test_client_error_is_neutral(self):
+        session = self.session([(500, b'', {}), (500, b'', {}),
+                                (400, b'', {}), (500, b'', {})], retries=0)
+        for _ in range(4):
+            session.get('https://api.test/candles')
+        # a rejected request neither counts as a failure nor closes breaker
+        self.assertTrue(self.breaker.is_open)
+        session = self.session([(400, b'', {})] * 5, retries=0)
+        for _ in range(5):
+            session.get('https://api.test/candles')
+        self.assertFalse(self.breaker.is_open)
+
+    def test_pacing(self):
+        session = self.session([(200, b'[]', {})] * 3, min_interval=10)
+        token = RecordingToken()
+        for _ in range(3):
+            session.get('https://api.test/candles', token=token)
+        # send times are reserved before waiting for them
+        self.assertEqual([round(wait) for wait in token.sleeps], [10, 20])
+
+    def test_pacing_outside_lock(self):
+        session = self.session([(200, b'[]', {})] * 3, min_interval=10)
+        session.get('https://api.test/candles', token=RecordingToken())
+        sleeping, release = threading.Event(), threading.Event()
+
+        class BlockingToken(CancelToken):
+            def sleep(self, seconds):
+                sleeping.set()
+                release.wait(5)
+        thread = threading.Thread(target=session.get, args=(
+            'https://api.test/candles', None, None, BlockingToken()))
+        thread.start()
+        self.assertTrue(sleeping.wait(5))
+        # another request is paced while the first one waits
+        token = RecordingToken()
+        session.get('https://api.test/candles', token=token)
+        release.set()
+        thread.join()
+        self.assertEqual([round(wait) for wait in token.sleeps], [20])
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Validate methods of CircuitBreaker class
+    """
+
+    def setUp(self):
+        self.now = 0
+        self.breaker = CircuitBreaker(threshold=2, reset_timeout=10,
+                                      clock=lambda: self.now)
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open)
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+        self.now = 4
+        self.assertEqual(self.breaker.retry_after(), 6)
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open)
+
+    def test_trial_call(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now = 10
+        self.assertFalse(self.breaker.is_open)
+        # failed trial re-opens breaker at once
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+        self.now = 20
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from types import SimpleNamespace
+import arrow
+import requests
+from application.classes.candle_cls import CandleBatch
+from application.classes.session_cls import CircuitOpenError
+from application.tail_func import new_candles, tail_coins
+from tests.fakes import Coin, FakeExchange
+
+
+class TestTail(unittest.TestCase):
+    """Validate tail mode of Exchange class and tail functions
+    """
+
+    def test_download_latest(self):
+        exc = FakeExchange()
+        data = exc.download_latest(Coin(), 500)
+        self.assertEqual(exc.requests, 1)
+        self.assertEqual(len(data), 100)
+        self.assertTrue((data.time[1:] - data.time[:-1] == 60).all())
+
+    def test_new_candles(self):
+        data = CandleBatch(list(range(600, 1200, 60)), *[[1] * 10] * 5)
+        res = new_candles(data, Coin(arrow.get(840)))
+        self.assertEqual(list(res.time), list(range(900, 1200, 60)))
+
+    def test_new_candles_unclosed(self):
+        data = CandleBatch(list(range(600, 1200, 60)), *[[1] * 10] * 5)
+        res = new_candles(data, Coin(arrow.get(840)), now=1150)
+        self.assertEqual(list(res.time), list(range(900, 1140, 60)))
+        res = new_candles(data, Coin(arrow.get(840)), now=1200)
+        self.assertEqual(list(res.time), list(range(900, 1200, 60)))
+
+    def test_new_candles_gap(self):
+        data = CandleBatch(list(range(600, 1200, 60)), *[[1] * 10] * 5)
+        self.assertEqual(len(new_candles(data, Coin(arrow.get(480)))), 0)
+        self.assertEqual(len(new_candles(data, Coin(arrow.get(540)))), 10)
+        self.assertEqual(len(new_candles(data, Coin(None))), 0)
+
+
+class TestTailCoins(unittest.TestCase):
+    """Validate concurrent refresh of coins
+    """
+
+    def test_errors_are_reported_per_coin(self):
+        errors = {'disk': OSError('disk full'),
+                  'breaker': CircuitOpenError('paused', 60),
+                  'reset': requests.ConnectionError('reset'),
+                  'bug': RuntimeError('unexpected')}
+
+        def download_latest(exc, coin, count, token=None):
+            name = coin.file_name.split('_')[0]
+            if name in errors:
+                raise errors[name]
+            data = exc.download_latest(coin, count, token)
+            return data, len(data)
+        model = SimpleNamespace(download_latest=download_latest)
+        exc = FakeExchange()
+        coins = [Coin(name=name) for name in list(errors) + ['ok']]
+        results = tail_coins(model, [(exc, coin) for coin in coins], 5,
+                             workers=2)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[coins[0].file_name], {'error': 'disk full'})
+        self.assertEqual(results[coins[1].file_name], {'error': 'paused'})
+        self.assertEqual(results[coins[2].file_name], {'error': 'reset'})
+        self.assertEqual(results[coins[3].file_name],
+                         {'error': 'RuntimeError: unexpected'})
+        result = results[coins[4].file_name]
+        self.assertEqual((result['candles'], result['added']), (5, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from application.classes.throttle_cls import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    """Validate methods of AdaptiveLimiter class
+    """
+
+    def setUp(self):
+        self.now = 0
+        self.limiter = AdaptiveLimiter(limit=1, maximum=4,
+                                       clock=lambda: self.now)
+
+    def request(self, latency, throttled=False):
+        self.limiter.acquire()
+        self.limiter.release(latency, throttled)
+
+    def test_limit_grows_while_healthy(self):
+        for _ in range(5):
+            self.request(0.2)
+        self.assertGreaterEqual(self.limiter.window, 3)
+
+    def test_limit_stays_in_bounds(self):
+        for _ in range(100):
+            self.request(0.2)
+        self.assertEqual(self.limiter.limit, 4)
+        for _ in range(10):
+            self.now += 10
+            self.request(0.2, throttled=True)
+        self.assertEqual(self.limiter.limit, 1)
+
+    def test_one_cut_per_round_trip(self):
+        self.limiter.limit = 4
+        self.request(0.2)
+        self.request(0.2, throttled=True)
+        self.request(0.2, throttled=True)
+        self.assertEqual(self.limiter.cuts, 1)
+        self.assertEqual(self.limiter.limit, 2)
+
+    def test_latency_spike_cuts_limit(self):
+        self.limiter.limit = 4
+        self.request(0.2)
+        self.request(2)
+        self.assertEqual(self.limiter.cuts, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
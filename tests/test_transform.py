@@ -0,0 +1,130 @@
+import json
+import os
+import unittest
+import arrow
+from application.classes.candle_cls import CandleBatch
+from application.classes.exchange_base_cls import Exchange
+from application.classes.transform_cls import TransformPool, \
+    parse_in_process
+
+
+class SplitExchange(Exchange):
+    """Exchange downloading in fetch and parse steps
+    """
+
+    name = 'Split'
+    website = api_website = api_key = secret_key = None
+    max_API_requests = 100
+    parsed_in = []
+
+    def provide_available_coins(self):
+        return ''
+
+    def correct_downloaded_data(self, downloaded_data):
+        return downloaded_data
+
+    def fetch_hist_data(self, coin, time, token=None):
+        start = int(time[0].float_timestamp)
+        rows = [[t, 2, 1, 1, 2, 5] for t in range(start, start + 180, 60)]
+        return json.dumps(rows).encode()
+
+    def parse_hist_data(self, payload):
+        SplitExchange.parsed_in.append(os.getpid())
+        return CandleBatch.from_rows(json.loads(payload))
+
+
+class WholeExchange(Exchange):
+    """Exchange downloading parsed candles at once
+    """
+
+    name = 'Whole'
+    website = api_website = api_key = secret_key = None
+    max_API_requests = 100
+
+    def provide_available_coins(self):
+        return ''
+
+    def correct_downloaded_data(self, downloaded_data):
+        return downloaded_data
+
+    def download_hist_data(self, coin, time, token=None):
+        return CandleBatch.from_rows([[0, 1, 1, 1, 1, 1]])
+
+
+class Coin:
+    quote, base, frequency = 'XBT', 'EUR', 'minutes'
+
+
+TIME = [arrow.get(600), arrow.get(780)]
+
+
+class TestExchangeContract(unittest.TestCase):
+    """Validate download methods of Exchange subclasses
+    """
+
+    def test_split_download(self):
+        exc = SplitExchange()
+        self.assertTrue(exc.splits_download)
+        self.assertEqual(exc.download_hist_data(Coin(), TIME).time.tolist(),
+                         [600, 660, 720])
+
+    def test_missing_download(self):
+        class NoDownload(Exchange):
+            name = 'None'
+            website = api_website = api_key = secret_key = None
+            max_API_requests = 100
+
+            def provide_available_coins(self):
+                return ''
+
+            def correct_downloaded_data(self, downloaded_data):
+                return downloaded_data
+
+        with self.assertRaises(TypeError):
+            NoDownload()
+
+
+class TestTransformPool(unittest.TestCase):
+    """Validate methods of TransformPool class
+    """
+
+    def setUp(self):
+        SplitExchange.parsed_in.clear()
+
+    def test_parse_in_process(self):
+        payload = SplitExchange().fetch_hist_data(Coin(), TIME)
+        data = parse_in_process(__name__, 'SplitExchange', payload)
+        self.assertEqual(data.time.tolist(), [600, 660, 720])
+        self.assertEqual(data.volume.tolist(), [5, 5, 5])
+
+    def test_without_workers(self):
+        pool = TransformPool(workers=0)
+        data = pool.download(SplitExchange(), Coin(), TIME)
+        self.assertEqual(data.time.tolist(), [600, 660, 720])
+        self.assertEqual(SplitExchange.parsed_in, [os.getpid()])
+
+    def test_process_pool(self):
+        pool = TransformPool(workers=2)
+        self.addCleanup(pool.shutdown)
+        exc = SplitExchange()
+        payload = pool.fetch(exc, Coin(), TIME)
+        self.assertIsInstance(payload, bytes)
+        data = pool.parse(exc, payload)
+        self.assertEqual(data.time.tolist(), [600, 660, 720])
+        self.assertEqual(pool.download(exc, Coin(), TIME).close.tolist(),
+                         [2, 2, 2])
+        # parsing happened in worker processes only
+        self.assertEqual(SplitExchange.parsed_in, [])
+
+    def test_whole_download(self):
+        pool = TransformPool(workers=2)
+        self.addCleanup(pool.shutdown)
+        exc = WholeExchange()
+        self.assertFalse(exc.splits_download)
+        payload = pool.fetch(exc, Coin(), TIME)
+        self.assertIs(pool.parse(exc, payload), payload)
+        self.assertEqual(len(pool.download(exc, Coin(), TIME)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
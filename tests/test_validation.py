@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from application.classes.candle_cls import CandleBatch
+from application.validation_func import (audit_coin_file, check_candles,
+                                         screen_candles, validate)
+
+
+class TestValidation(unittest.TestCase):
+    """Validate functions of validation module
+    """
+
+    def setUp(self):
+        self.data = CandleBatch([60, 120, 120, 60, 180, 240],
+                                [2, 1, 2, 2, 2, 2],
+                                [1, 2, 1, 1, 1, np.nan],
+                                [1, 1, 1, 1, 0, np.nan],
+                                [2, 1, 2, 2, 2, 1.5],
+                                [1, 1, 1, 1, 1, -1])
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name,
+                                 'Bitcoin_XBT_EUR_minutes_Kraken_01-01-2020.csv')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_check_candles(self):
+        issues = check_candles(self.data)
+        self.assertEqual(np.flatnonzero(issues['high_below_low']).tolist(),
+                         [1])
+        self.assertEqual(np.flatnonzero(issues['time_repeated']).tolist(),
+                         [2])
+        self.assertEqual(np.flatnonzero(issues['time_backwards']).tolist(),
+                         [3])
+        self.assertEqual(
+            np.flatnonzero(issues['price_not_positive']).tolist(), [4])
+        self.assertEqual(np.flatnonzero(issues['volume_negative']).tolist(),
+                         [5])
+        self.assertEqual(
+            np.flatnonzero(issues['price_outside_range']).tolist(), [1, 4])
+
+    def test_validate_after_last_time(self):
+        # the candle downloaded again at the last saved time is expected
+        good, bad, report = validate(self.data.take(slice(0, 1)), 60)
+        self.assertEqual((len(good), len(bad)), (1, 0))
+        self.assertEqual(report['issues']['time_repeated'], 0)
+        good, bad, report = validate(self.data.take([0, 0]), 60)
+        self.assertEqual((len(good), len(bad)), (1, 1))
+        self.assertEqual(report['issues']['time_repeated'], 1)
+        good, bad, report = validate(self.data.take(slice(0, 1)), 120)
+        self.assertEqual(report['issues']['time_backwards'], 1)
+
+    def test_screen_candles(self):
+        res = screen_candles(self.path, self.data, mode='flag')
+        self.assertEqual(len(res), 6)
+        res = screen_candles(self.path, self.data, mode='quarantine')
+        self.assertEqual(res.time.tolist(), [60])
+        quarantine = os.path.join(self.folder.name, '.meta',
+                                  os.path.basename(self.path) +
+                                  '.quarantine.csv')
+        with open(quarantine) as f:
+            self.assertEqual(len(f.readlines()), 5)
+
+    def test_audit_coin_file(self):
+        with open(self.path, 'w') as f:
+            f.write('#Bitcoin XBT EUR\n#-----Time;HighPrice;LowPrice;'
+                    'OpenPrice;ClosePrice;Volume\n'
+                    '2020-01-01 00:01:00;2;1;1;2;1\n'
+                    '2020-01-01 00:01:00;2;1;1;2;1\n'
+                    '2020-01-01 00:02:00;-;-;-;3;1\n')
+        report = audit_coin_file(self.path)
+        self.assertEqual(report['rows'], 3)
+        self.assertEqual(report['bad'], 1)
+
+    def test_audit_file_without_candles(self):
+        with open(self.path, 'w') as f:
+            f.write('#Bitcoin XBT EUR\n')
+        report = audit_coin_file(self.path)
+        self.assertEqual((report['rows'], report['bad']), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
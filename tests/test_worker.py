@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+import arrow
+import numpy as np
+import application.filemodel_func as backend
+from application.classes.cancel_cls import CancelToken
+from application.classes.jobqueue_cls import JobQueue
+from application.worker_func import enqueue_coin, merge_results, run_job, \
+    run_worker
+from tests.fakes import Coin, FakeExchange
+
+WINDOW = 100 * 60  # seconds of a block of minutes
+
+
+class WorkerModel:
+    """Model downloading from a fake exchange into a save folder
+    """
+
+    def __init__(self, save_path, exc):
+        self.sys = SimpleNamespace(save_path=save_path)
+        self.exc = exc
+        self.coin = Coin(start_date=arrow.get(0),
+                         end_date=arrow.get(2 * WINDOW))
+
+    def get_exchange(self, name):
+        return self.exc
+
+    def load_coin(self, exc, file_name):
+        backend.get_coin_file(exc, file_name, self.sys.save_path)
+        return self.coin
+
+    def download_data(self, exc, coin, time, token=None):
+        data = exc.download_hist_data(coin, time, token)
+        return data.take(np.argsort(data.time))
+
+    def save_downloaded_data(self, exc, coin, data):
+        backend.save_data(exc, coin, data, self.sys.save_path)
+
+
+class FailingExchange(FakeExchange):
+    """Fake exchange whose API is down
+    """
+
+    def download_hist_data(self, coin, time, token=None):
+        raise ConnectionError('API is down')
+
+
+class TestWorker(unittest.TestCase):
+    """Validate functions of distributed download workers
+    """
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(os.path.join(self.temp.name, 'jobs.db'),
+                              max_attempts=1)
+        self.model = WorkerModel(self.temp.name, FakeExchange())
+        os.makedirs(os.path.join(self.temp.name, 'Fake'))
+        self.file_path = os.path.join(self.temp.name, 'Fake',
+                                      self.model.coin.file_name)
+        with open(self.file_path, 'w') as f:
+            f.write('#coin info\n')
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_enqueue_coin(self):
+        coin = self.model.coin
+        count = enqueue_coin(self.queue, self.model.exc, coin)
+        self.assertEqual(count, 2)
+        job = self.queue.lease('a')
+        self.assertEqual((job['start_time'], job['end_time']), (0, WINDOW))
+        self.assertIsInstance(job['start_time'], int)
+        # blocks before the listing are skipped
+        coin.file_name = 'other.csv'
+        count = enqueue_coin(self.queue, self.model.exc, coin,
+                             arrow.get(WINDOW + 60))
+        self.assertEqual(count, 1)
+
+    def test_enqueue_updated_coin(self):
+        coin = Coin(last_update=arrow.utcnow().shift(minutes=-30))
+        self.assertEqual(enqueue_coin(self.queue, self.model.exc, coin), 1)
+        job = self.queue.lease('a')
+        self.assertEqual(job['start_time'],
+                         int(coin.last_update.float_timestamp))
+
+    def test_run_jobs_and_merge(self):
+        enqueue_coin(self.queue, self.model.exc, self.model.coin)
+        token = CancelToken()
+        # blocks finished out of order are merged in time order
+        first, second = self.queue.lease('a'), self.queue.lease('b')
+        run_job(self.queue, self.model, second, 'b', 60, token)
+        self.assertEqual(self.queue.counts(), {'leased': 1, 'done': 1})
+        run_job(self.queue, self.model, first, 'a', 60, token)
+        self.assertEqual(self.queue.counts(), {'merged': 2})
+        with open(self.file_path) as f:
+            times = [line.split(';')[0] for line in f.read().splitlines()[1:]]
+        self.assertEqual(len(times), 200)
+        self.assertEqual(times, sorted(times))
+
+    def test_failed_job(self):
+        self.model.exc = FailingExchange()
+        enqueue_coin(self.queue, self.model.exc, self.model.coin)
+        job = self.queue.lease('a')
+        run_job(self.queue, self.model, job, 'a', 60, CancelToken())
+        self.assertEqual(self.queue.counts(), {'failed': 1, 'pending': 1})
+        self.assertEqual(self.queue.stalled(),
+                         {self.model.coin.file_name: 0})
+        self.assertEqual(merge_results(self.queue, self.model,
+                                       self.model.coin.file_name), 0)
+
+    def test_missing_coin_file(self):
+        enqueue_coin(self.queue, self.model.exc, self.model.coin)
+        os.remove(self.file_path)
+        token = CancelToken()
+        token.cancel()
+        with self.assertRaises(FileNotFoundError) as err:
+            run_worker(self.queue, self.model, 'a', token=token)
+        self.assertIn(os.path.join('Fake', self.model.coin.file_name),
+                      str(err.exception))
+
+    def test_worker_stops(self):
+        token = CancelToken()
+        token.cancel()
+        run_worker(self.queue, self.model, 'a', token=token)
+        self.assertEqual(self.queue.counts(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()